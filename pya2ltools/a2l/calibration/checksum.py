@@ -0,0 +1,214 @@
+import binascii
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Iterable
+import zlib
+
+import numpy as np
+
+from ..model.model import A2LMemorySegment, ByteOrder
+from ..model.project_model import A2LModule
+from .readout import Segments
+
+# checksum types of XCP BUILD_CHECKSUM: ADD_xy adds elements of x bytes into a
+# result of y bytes
+ADDITIVE = {
+    "ADD_11": (1, 1),
+    "ADD_12": (1, 2),
+    "ADD_14": (1, 4),
+    "ADD_22": (2, 2),
+    "ADD_24": (2, 4),
+    "ADD_44": (4, 4),
+}
+CRC_16 = "CRC_16"
+CRC_16_CITT = "CRC_16_CITT"
+CRC_32 = "CRC_32"
+ALGORITHMS = [*ADDITIVE, CRC_16, CRC_16_CITT, CRC_32]
+
+
+def checksum_size(algorithm: str) -> int:
+    """Returns the number of bytes of a checksum."""
+    if algorithm in ADDITIVE:
+        return ADDITIVE[algorithm][1]
+    if algorithm in (CRC_16, CRC_16_CITT):
+        return 2
+    if algorithm == CRC_32:
+        return 4
+    raise ValueError(f"Unknown checksum algorithm {algorithm}")
+
+
+def _crc16_table() -> list[int]:
+    # CRC-16/ARC, reflected polynomial 0x8005
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC16_TABLE = _crc16_table()
+
+
+def crc16(data, crc: int = 0) -> int:
+    """CRC-16/ARC, table driven as there is no C implementation in the stdlib."""
+    table = _CRC16_TABLE
+    for byte in memoryview(data).cast("B"):
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def checksum(
+    pieces: Iterable, algorithm: str, byte_order: ByteOrder | None = None
+) -> int:
+    """Computes a checksum over consecutive pieces of memory without copying them.
+
+    Elements of additive checksums are read in byte_order, every piece must hold
+    a whole number of elements.
+    """
+    if algorithm in ADDITIVE:
+        element_size, result_size = ADDITIVE[algorithm]
+        prefix = ">" if byte_order == ByteOrder.MSB_FIRST else "<"
+        dtype = np.dtype(f"{prefix}u{element_size}")
+        total = 0
+        for piece in pieces:
+            if memoryview(piece).nbytes % element_size:
+                raise ValueError(
+                    f"{algorithm} needs a multiple of {element_size} bytes"
+                )
+            total += int(np.frombuffer(piece, dtype=dtype).sum(dtype=np.uint64))
+        return total & ((1 << 8 * result_size) - 1)
+    if algorithm == CRC_16:
+        crc = 0
+        for piece in pieces:
+            crc = crc16(piece, crc)
+        return crc
+    if algorithm == CRC_16_CITT:
+        crc = 0xFFFF
+        for piece in pieces:
+            crc = binascii.crc_hqx(piece, crc)
+        return crc
+    if algorithm == CRC_32:
+        crc = 0
+        for piece in pieces:
+            crc = zlib.crc32(piece, crc)
+        return crc
+    raise ValueError(f"Unknown checksum algorithm {algorithm}")
+
+
+def memory_slices(segments: Segments, address: int, size: int) -> list[memoryview]:
+    """Returns views of the buffers covering address to address + size.
+
+    Raises ValueError if a part of the range is not in segments.
+    """
+    starts = [start for start, _ in segments]
+    slices = []
+    end = address + size
+    while address < end:
+        index = bisect_right(starts, address) - 1
+        if index < 0:
+            raise ValueError(f"Address {address:#x} not in image")
+        start, buffer = segments[index]
+        view = memoryview(buffer).cast("B")
+        if address >= start + view.nbytes:
+            raise ValueError(f"Address {address:#x} not in image")
+        stop = min(end, start + view.nbytes)
+        slices.append(view[address - start : stop - start])
+        address = stop
+    return slices
+
+
+@dataclass
+class ChecksumLocation:
+    """A checksum over a memory range, stored at address.
+
+    The stored checksum itself is left out of the range.
+    """
+
+    address: int
+    algorithm: str
+    start: int
+    size: int
+
+    def pieces(self, segments: Segments) -> list[memoryview]:
+        end = self.start + self.size
+        stored_end = self.address + checksum_size(self.algorithm)
+        if stored_end <= self.start or self.address >= end:
+            return memory_slices(segments, self.start, self.size)
+        return memory_slices(
+            segments, self.start, max(self.address - self.start, 0)
+        ) + memory_slices(segments, stored_end, max(end - stored_end, 0))
+
+
+def segment_checksums(
+    module: A2LModule,
+    segments: Segments,
+    algorithm: str,
+    program_types: Iterable[str] | None = None,
+) -> dict[str, int | None]:
+    """Computes the checksum of every MEMORY_SEGMENT of module.
+
+    program_types limits the memory segments, e.g. to CALIBRATION_VARIABLES.
+    Memory segments not completely in the image get None.
+    """
+    byte_order = module.mod_common[0].byte_order if module.mod_common else None
+    checksums = {}
+    for memory_segment in get_memory_segments(module, program_types):
+        try:
+            pieces = memory_slices(
+                segments, memory_segment.address, memory_segment.size
+            )
+        except ValueError:
+            checksums[memory_segment.name] = None
+            continue
+        checksums[memory_segment.name] = checksum(pieces, algorithm, byte_order)
+    return checksums
+
+
+def get_memory_segments(
+    module: A2LModule, program_types: Iterable[str] | None = None
+) -> list[A2LMemorySegment]:
+    memory_segments = [
+        memory_segment
+        for mod_par in module.mod_par
+        for memory_segment in mod_par.memory_segments
+    ]
+    if program_types is None:
+        return memory_segments
+    program_types = set(program_types)
+    return [m for m in memory_segments if m.program_type in program_types]
+
+
+def find_checksum_location(
+    module: A2LModule, address: int, algorithm: str
+) -> ChecksumLocation:
+    """Returns the location of a checksum over the MEMORY_SEGMENT containing it."""
+    for memory_segment in get_memory_segments(module):
+        offset = address - memory_segment.address
+        if 0 <= offset < memory_segment.size:
+            return ChecksumLocation(
+                address, algorithm, memory_segment.address, memory_segment.size
+            )
+    raise ValueError(f"Checksum address {address:#x} not in a MEMORY_SEGMENT")
+
+
+def patch_checksums(
+    segments: Segments,
+    locations: Iterable[ChecksumLocation],
+    byte_order: ByteOrder | None = None,
+) -> dict[int, int]:
+    """Computes the checksums and writes them in place into the segments.
+
+    Call after all values are written, e.g. after CalibrationWriter.write. Returns
+    the checksums by address.
+    """
+    order = "big" if byte_order == ByteOrder.MSB_FIRST else "little"
+    checksums = {}
+    for location in locations:
+        value = checksum(location.pieces(segments), location.algorithm, byte_order)
+        size = checksum_size(location.algorithm)
+        (target,) = memory_slices(segments, location.address, size)
+        target[:] = value.to_bytes(size, order)
+        checksums[location.address] = value
+    return checksums
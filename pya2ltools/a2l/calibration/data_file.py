@@ -0,0 +1,284 @@
+import csv
+import json
+from pathlib import Path
+import shlex
+from typing import Container, Iterable, Iterator, TextIO
+
+import numpy as np
+
+from .readout import CalibrationValue, to_json, write_calibration_data
+
+DCM = "dcm"
+JSON_LINES = "jsonl"
+CSV = "csv"
+
+SUFFIXES = {".dcm": DCM, ".csv": CSV, ".jsonl": JSON_LINES, ".json": JSON_LINES}
+
+# values per WERT and ST/X line, as written by calibration tools
+DCM_LINE_LENGTH = 6
+
+DCM_CURVES = {"KENNLINIE", "GRUPPENKENNLINIE", "FESTKENNLINIE"}
+DCM_MAPS = {"KENNFELD", "GRUPPENKENNFELD", "FESTKENNFELD"}
+DCM_BLOCKS = (
+    {"FESTWERT", "FESTWERTEBLOCK", "STUETZSTELLENVERTEILUNG", "TEXTSTRING"}
+    | DCM_CURVES
+    | DCM_MAPS
+)
+# blocks without calibration values
+DCM_SKIPPED = {"FUNKTIONEN", "VARIANTENKODIERUNG"}
+# single lines without calibration values
+DCM_HEADERS = {"KONSERVIERUNG_FORMAT", "MODULKOPF"}
+
+
+def from_json(data: dict) -> CalibrationValue:
+    """Creates a value from a line written by write_calibration_data."""
+    physical = np.array(data["physical"])
+    return CalibrationValue(
+        data["name"],
+        np.array(data.get("raw", data["physical"])),
+        physical,
+        [None if axis is None else np.array(axis) for axis in data.get("axes", [])],
+    )
+
+
+def _is_text(values) -> bool:
+    return np.asarray(values).dtype.kind in "OUS"
+
+
+def _format(values) -> str:
+    if _is_text(values):
+        return " ".join(_text(v) for v in np.ravel(values))
+    return " ".join(repr(float(v)) for v in np.ravel(values))
+
+
+def _lines(keyword: str, values) -> Iterator[str]:
+    values = np.ravel(values)
+    for i in range(0, len(values), DCM_LINE_LENGTH):
+        yield f"   {keyword} {_format(values[i : i + DCM_LINE_LENGTH])}\n"
+
+
+def _values(values) -> Iterator[str]:
+    """WERT lines of numbers, TEXT lines of verbal values."""
+    return _lines("TEXT" if _is_text(values) else "WERT", values)
+
+
+def _text(text) -> str:
+    return '"' + str(text).replace('"', '\\"') + '"'
+
+
+def dcm_block(value: CalibrationValue, axis_pts: bool = False) -> str:
+    """Formats one value as DCM block.
+
+    Curves and maps with an axis without points, e.g. a CURVE_AXIS, are written
+    as FESTWERTEBLOCK.
+    Raises ValueError for values a DCM block cannot hold, e.g. raw values without
+    an entry in their verbal table.
+    """
+    physical = value.physical
+    if physical.dtype.kind == "O" and any(v is None for v in physical.flat):
+        raise ValueError(f"{value.name}: raw value without verbal table entry")
+    lines = []
+    axes = len(value.axes) if all(axis is not None for axis in value.axes) else 0
+    if axis_pts:
+        lines.append(f"STUETZSTELLENVERTEILUNG {value.name} {len(physical)}\n")
+        lines += _lines("ST/X", physical)
+    elif physical.ndim == 0:
+        lines.append(f"FESTWERT {value.name}\n")
+        lines += _values(physical)
+    elif physical.ndim == 1 and axes == 1:
+        lines.append(f"KENNLINIE {value.name} {len(physical)}\n")
+        lines += _lines("ST/X", value.axes[0])
+        lines += _values(physical)
+    elif physical.ndim == 2 and axes == 2:
+        lines.append(f"KENNFELD {value.name} {physical.shape[0]} {physical.shape[1]}\n")
+        lines += _lines("ST/X", value.axes[0])
+        for y, column in zip(value.axes[1], physical.T):
+            lines.append(f"   ST/Y {_format(y)}\n")
+            lines += _values(column)
+    elif physical.ndim == 1:
+        lines.append(f"FESTWERTEBLOCK {value.name} {len(physical)}\n")
+        lines += _values(physical)
+    elif physical.ndim == 2:
+        nx, ny = physical.shape
+        lines.append(f"FESTWERTEBLOCK {value.name} {nx} @ {ny}\n")
+        for row in physical.T:
+            lines += _values(row)
+    else:
+        raise ValueError(f"{value.name}: {physical.ndim} dimensions not supported")
+    lines.append("END\n\n")
+    return "".join(lines)
+
+
+def write_dcm(
+    values: Iterable[CalibrationValue],
+    f: TextIO,
+    axis_pts: Container[str] = (),
+    skipped: list[str] | None = None,
+) -> int:
+    """Writes values as DCM blocks while they are produced, returns their number.
+
+    axis_pts holds the names of AXIS_PTS, which are written as
+    STUETZSTELLENVERTEILUNG. Values that cannot be written as DCM block are left
+    out, their names are appended to skipped.
+    """
+    f.write("KONSERVIERUNG_FORMAT 2.0\n\n")
+    count = 0
+    for value in values:
+        try:
+            block = dcm_block(value, value.name in axis_pts)
+        except ValueError:
+            if skipped is not None:
+                skipped.append(value.name)
+            continue
+        f.write(block)
+        count += 1
+    return count
+
+
+class _DcmBlock:
+    def __init__(self, keyword: str, name: str, sizes: list[str]):
+        self.keyword = keyword
+        self.name = name
+        self.sizes = [int(size) for size in sizes if size != "@"]
+        # numbers of WERT and strings of TEXT lines
+        self.values: list = []
+        self.x: list[float] = []
+        self.y: list[float] = []
+        self.columns: list[list] = []
+
+    def add(self, keyword: str, arguments: list[str]):
+        if keyword in ("WERT", "TEXT"):
+            target = self.columns[-1] if self.columns else self.values
+            target += map(float, arguments) if keyword == "WERT" else arguments
+        elif keyword == "ST/X":
+            self.x += map(float, arguments)
+        elif keyword == "ST/Y":
+            self.y += map(float, arguments)
+            self.columns.append([])
+
+    def value(self) -> CalibrationValue:
+        axes = []
+        if self.keyword == "STUETZSTELLENVERTEILUNG":
+            physical = np.array(self.x)
+        elif self.keyword in DCM_MAPS:
+            physical = np.array(self.columns).T
+            axes = [np.array(self.x), np.array(self.y)]
+        elif self.keyword in DCM_CURVES:
+            physical = np.array(self.values)
+            axes = [np.array(self.x)]
+        elif self.keyword == "FESTWERTEBLOCK" and len(self.sizes) == 2:
+            nx, ny = self.sizes
+            physical = np.array(self.values).reshape(ny, nx).T
+        elif self.keyword == "FESTWERT":
+            physical = np.array(self.values[0])
+        else:
+            physical = np.array(self.values)
+        return CalibrationValue(self.name, physical, physical, axes)
+
+
+def read_dcm(f: TextIO) -> Iterator[CalibrationValue]:
+    """Parses DCM blocks line by line and yields each value when its block ends.
+
+    Comments, descriptive keywords and blocks without values are skipped.
+    """
+    block = None
+    skipping = False
+    for number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line or line[0] in "*!":
+            continue
+        try:
+            tokens = shlex.split(line) if '"' in line else line.split()
+        except ValueError as e:
+            raise ValueError(f"Line {number}: {e}") from e
+        keyword, arguments = tokens[0], tokens[1:]
+        if keyword == "END":
+            if block is not None:
+                yield block.value()
+            block = None
+            skipping = False
+        elif skipping or keyword in DCM_HEADERS:
+            continue
+        elif keyword in DCM_SKIPPED:
+            skipping = True
+        elif block is not None:
+            block.add(keyword, arguments)
+        elif keyword in DCM_BLOCKS:
+            if not arguments:
+                raise ValueError(f"Line {number}: {keyword} without name")
+            block = _DcmBlock(keyword, arguments[0], arguments[1:])
+        else:
+            raise ValueError(f"Line {number}: unknown block {keyword}")
+
+
+def write_csv(values: Iterable[CalibrationValue], f: TextIO) -> int:
+    """Writes one row per value, arrays are stored as JSON in their cells."""
+    writer = csv.writer(f)
+    writer.writerow(["name", "raw", "physical", "axes"])
+    count = 0
+    for value in values:
+        data = to_json(value)
+        writer.writerow(
+            [
+                data["name"],
+                json.dumps(data["raw"]),
+                json.dumps(data["physical"]),
+                json.dumps(data.get("axes", [])),
+            ]
+        )
+        count += 1
+    return count
+
+
+def read_csv(f: TextIO) -> Iterator[CalibrationValue]:
+    for row in csv.DictReader(f):
+        yield from_json(
+            {
+                "name": row["name"],
+                "raw": json.loads(row["raw"]),
+                "physical": json.loads(row["physical"]),
+                "axes": json.loads(row.get("axes") or "[]"),
+            }
+        )
+
+
+def read_json_lines(f: TextIO) -> Iterator[CalibrationValue]:
+    for line in f:
+        if line.strip():
+            yield from_json(json.loads(line))
+
+
+def write_values(
+    values: Iterable[CalibrationValue],
+    path: Path,
+    data_format: str | None = None,
+    axis_pts: Container[str] = (),
+    skipped: list[str] | None = None,
+) -> int:
+    """Streams values into a DCM, CSV or JSON Lines file, by default by suffix.
+
+    Returns the number of values written. Names of values a DCM file cannot hold
+    are appended to skipped.
+    """
+    data_format = data_format or SUFFIXES.get(Path(path).suffix.lower(), JSON_LINES)
+    if data_format == JSON_LINES:
+        return write_calibration_data(values, path)
+    if data_format == DCM:
+        with open(path, "w") as f:
+            return write_dcm(values, f, axis_pts, skipped)
+    if data_format == CSV:
+        with open(path, "w", newline="") as f:
+            return write_csv(values, f)
+    raise ValueError(f"Unknown calibration data format {data_format}")
+
+
+def read_values(
+    path: Path, data_format: str | None = None
+) -> Iterator[CalibrationValue]:
+    """Yields the values of a DCM, CSV or JSON Lines file one by one."""
+    data_format = data_format or SUFFIXES.get(Path(path).suffix.lower(), JSON_LINES)
+    readers = {DCM: read_dcm, CSV: read_csv, JSON_LINES: read_json_lines}
+    if data_format not in readers:
+        raise ValueError(f"Unknown calibration data format {data_format}")
+    with open(path, "r", newline="" if data_format == CSV else None) as f:
+        yield from readers[data_format](f)
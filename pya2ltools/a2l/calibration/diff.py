@@ -0,0 +1,189 @@
+from dataclasses import dataclass
+import json
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from ..model.project_model import A2LModule
+from .readout import CalibrationReader, CalibrationValue, Segments, _in_memory
+from .record_layout import AXES, FNC_VALUES, DecodingPlan
+
+
+@dataclass
+class CalibrationDifference:
+    """Values of a characteristic or AXIS_PTS that differ between images."""
+
+    name: str
+    # one value per image
+    values: list[CalibrationValue]
+
+    @property
+    def deltas(self) -> list[np.ndarray | None]:
+        """Physical differences to the value of the first image.
+
+        None for text values and values whose number of points changed.
+        """
+        first = self.values[0].physical
+        deltas = []
+        for value in self.values:
+            if first.dtype.kind not in "iuf" or value.physical.shape != first.shape:
+                deltas.append(None)
+            else:
+                deltas.append(value.physical.astype(float) - first)
+        return deltas
+
+
+def gather_records(
+    plan: DecodingPlan, addresses: np.ndarray, segments: Segments
+) -> tuple[np.ndarray, np.ndarray]:
+    """Gathers the records at addresses with one gather per segment.
+
+    Returns the records and a mask of the addresses whose record lies in a segment,
+    the other records are zero.
+    """
+    records = np.zeros(len(addresses), dtype=plan.dtype)
+    if not segments:
+        return records, np.zeros(len(addresses), dtype=bool)
+    starts = np.array([start for start, _ in segments], dtype=np.int64)
+    ends = starts + [memoryview(buffer).nbytes for _, buffer in segments]
+    index = np.searchsorted(starts, addresses, side="right") - 1
+    present = (index >= 0) & (
+        addresses + plan.dtype.itemsize <= ends[np.maximum(index, 0)]
+    )
+    for i in np.unique(index[present]):
+        selection = present & (index == i)
+        start, buffer = segments[i]
+        records[selection] = plan.gather(buffer, addresses[selection] - start)
+    return records, present
+
+
+def valid_points(fields: list[dict], name: str) -> np.ndarray | None:
+    """Masks the points of a field beyond NO_AXIS_PTS in all images."""
+    shape = fields[0][name].shape
+    if name == FNC_VALUES:
+        axes = [(dimension, AXES[dimension]) for dimension in range(len(shape) - 1)]
+    elif name.startswith("AXIS_PTS_"):
+        axes = [(0, name[len("AXIS_PTS_") :])]
+    else:
+        return None
+    mask = None
+    for dimension, axis in axes:
+        if f"NO_AXIS_PTS_{axis}" not in fields[0] or dimension >= len(shape) - 1:
+            continue
+        counts = np.maximum.reduce([f[f"NO_AXIS_PTS_{axis}"] for f in fields])
+        points = np.arange(shape[dimension + 1]) < counts[:, np.newaxis]
+        points = points.reshape(
+            (len(counts),)
+            + tuple(-1 if d == dimension else 1 for d in range(len(shape) - 1))
+        )
+        mask = points if mask is None else mask & points
+    return mask
+
+
+def _differs(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    differs = a != b
+    if a.dtype.kind == "f":
+        differs &= ~(np.isnan(a) & np.isnan(b))
+    return differs
+
+
+def changed_records(plan: DecodingPlan, records: list[np.ndarray]) -> np.ndarray:
+    """Returns a mask of the records that differ from the first in any image.
+
+    Reserved bytes and points beyond the number of axis points are ignored.
+    """
+    fields = [plan.fields(r) for r in records]
+    changed = np.zeros(len(records[0]), dtype=bool)
+    for name in plan.dtype.names:
+        if name.startswith("RESERVED"):
+            continue
+        valid = valid_points(fields, name)
+        for other in fields[1:]:
+            differs = _differs(fields[0][name], other[name])
+            if valid is not None:
+                differs &= valid
+            changed |= differs.reshape(len(changed), -1).any(axis=1)
+    return changed
+
+
+class CalibrationComparator:
+    """Compares the characteristics and AXIS_PTS of a module between images.
+
+    Objects sharing a decoding plan are gathered from every image and compared
+    field by field with numpy. Only changed objects are converted to physical
+    values.
+    """
+
+    def __init__(self, module: A2LModule, reader: CalibrationReader | None = None):
+        self.module = module
+        self.reader = reader if reader is not None else CalibrationReader(module)
+        self.missing: list[str] = []
+        self.unsupported: list[str] = []
+
+    def changed(self, images: Sequence[Segments], elements: Iterable | None = None):
+        """Returns the elements whose stored value differs between images.
+
+        Elements not contained in every image are collected in missing.
+        """
+        if elements is None:
+            elements = self.module.characteristics + self.module.axis_pts
+        self.missing = []
+        self.unsupported = []
+        groups: dict[int, list] = {}
+        for element in elements:
+            if not _in_memory(element):
+                continue
+            try:
+                plan = self.reader.get_plan(element)
+            except NotImplementedError:
+                self.unsupported.append(element.name)
+                continue
+            groups.setdefault(id(plan), []).append(element)
+
+        changed = []
+        for group in groups.values():
+            plan = self.reader.get_plan(group[0])
+            addresses = np.array([e.ecu_address for e in group], dtype=np.int64)
+            gathered = [gather_records(plan, addresses, image) for image in images]
+            present = np.logical_and.reduce([p for _, p in gathered])
+            mask = changed_records(plan, [r for r, _ in gathered]) & present
+            self.missing += [group[i].name for i in np.flatnonzero(~present)]
+            changed += [group[i] for i in np.flatnonzero(mask)]
+        return changed
+
+    def compare(
+        self, images: Sequence[Segments], elements: Iterable | None = None
+    ) -> list[CalibrationDifference]:
+        """Returns the values of the changed elements in every image."""
+        changed = self.changed(images, elements)
+        missing, unsupported = self.missing, self.unsupported
+        values = [
+            {value.name: value for value in self.reader.read(image, changed)}
+            for image in images
+        ]
+        self.missing, self.unsupported = missing, unsupported
+        return [
+            CalibrationDifference(
+                element.name, [image[element.name] for image in values]
+            )
+            for element in changed
+        ]
+
+
+def write_differences(differences: Iterable[CalibrationDifference], path: Path) -> int:
+    """Writes differences as JSON Lines while they are produced, returns their number."""
+    count = 0
+    with open(path, "w") as f:
+        for difference in differences:
+            data = {
+                "name": difference.name,
+                "physical": [value.physical.tolist() for value in difference.values],
+                "delta": [
+                    None if delta is None else delta.tolist()
+                    for delta in difference.deltas
+                ],
+            }
+            f.write(json.dumps(data) + "\n")
+            count += 1
+    return count
@@ -0,0 +1,140 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from ..model.model import A2LCharacteristic
+from ..model.project_model import A2LModule
+from .checksum import memory_slices
+from .read_plan import create_read_plan
+from .readout import (
+    CalibrationReader,
+    Segments,
+    _compu_method,
+    _in_memory,
+    _std_axes,
+)
+from .record_layout import get_shapes
+from .writeback import CalibrationWriter
+
+
+@dataclass
+class MigrationReport:
+    """Outcome of a migration, objects are listed by name."""
+
+    copied: list[str] = field(default_factory=list)
+    # only in the old or only in the new module
+    removed: list[str] = field(default_factory=list)
+    added: list[str] = field(default_factory=list)
+    # kind or dimensions changed so that the old value does not fit
+    incompatible: list[str] = field(default_factory=list)
+    # not in the old or new image
+    missing: list[str] = field(default_factory=list)
+    unsupported: list[str] = field(default_factory=list)
+    # values without a raw representation in the new module
+    unconvertible: list[str] = field(default_factory=list)
+
+
+def _calibration_objects(module: A2LModule) -> list:
+    # TYPEDEF_CHARACTERISTIC are kept with the characteristics but have no memory
+    return [
+        element
+        for element in module.characteristics + module.axis_pts
+        if _in_memory(element)
+    ]
+
+
+def _fits(old, new) -> bool:
+    """Checks that the value and axes of old can be written into new."""
+    if type(old) is not type(new):
+        return False
+    if isinstance(old, A2LCharacteristic) and type(old.typedef) is not type(
+        new.typedef
+    ):
+        return False
+    return all(
+        len(old_shape) == len(new_shape)
+        and all(o <= n for o, n in zip(old_shape, new_shape))
+        for old_shape, new_shape in zip(get_shapes(old), get_shapes(new))
+    )
+
+
+def _conversions(element) -> list:
+    return [_compu_method(element)] + [
+        description.compu_method for _, description in _std_axes(element)
+    ]
+
+
+def _same_encoding(
+    old, new, old_reader: CalibrationReader, new_reader: CalibrationReader
+) -> bool:
+    """Checks that the stored bytes of old mean the same in new."""
+    try:
+        old_plan, new_plan = old_reader.get_plan(old), new_reader.get_plan(new)
+    except NotImplementedError:
+        return False
+    return old_plan.dtype == new_plan.dtype and _conversions(old) == _conversions(new)
+
+
+def migrate_calibration(
+    old_module: A2LModule,
+    read_memory: Callable[[int, int], Any],
+    new_module: A2LModule,
+    new_segments: Segments,
+    max_gap: int = 16,
+) -> MigrationReport:
+    """Copies the old calibration into the memory of a new software version.
+
+    Characteristics and AXIS_PTS are matched by name. Objects with an unchanged
+    record layout and compu method are copied byte by byte, the others are decoded
+    with the old record layouts and conversions and encoded with the new ones, so
+    changed addresses, datatypes, byte orders and compu methods are handled. The old
+    memory is read in coalesced blocks with read_memory(address, size), e.g.
+    MemoryImage.read, the new memory is written in place. Values without a raw
+    representation in the new module are reported as unconvertible.
+    """
+    report = MigrationReport()
+    new_objects = {
+        element.name: element for element in _calibration_objects(new_module)
+    }
+    reader = CalibrationReader(old_module)
+    writer = CalibrationWriter(new_module)
+    matched, converted = [], []
+    for element in _calibration_objects(old_module):
+        new_element = new_objects.pop(element.name, None)
+        if new_element is None:
+            report.removed.append(element.name)
+        elif not _fits(element, new_element):
+            report.incompatible.append(element.name)
+        else:
+            matched.append((element, new_element))
+            if not _same_encoding(element, new_element, reader, writer.reader):
+                converted.append(element)
+    report.added = list(new_objects)
+
+    plan = create_read_plan(reader, [old for old, _ in matched], max_gap=max_gap)
+    old_segments = plan.read(read_memory)
+
+    values = {value.name: value for value in reader.read(old_segments, converted)}
+    report.missing += reader.missing
+    report.unsupported += dict.fromkeys(plan.unsupported + reader.unsupported)
+    report.copied = writer.write(new_segments, values, skip_unconvertible=True)
+    report.missing += writer.missing
+    report.unsupported += writer.unsupported
+    report.unconvertible = writer.unconvertible
+
+    converted = {element.name for element in converted}
+    for old, new in matched:
+        if old.name in converted:
+            continue
+        size = reader.get_plan(old).dtype.itemsize
+        try:
+            source = b"".join(memory_slices(old_segments, old.ecu_address, size))
+            targets = memory_slices(new_segments, new.ecu_address, size)
+        except ValueError:
+            report.missing.append(old.name)
+            continue
+        position = 0
+        for target in targets:
+            target[:] = source[position : position + target.nbytes]
+            position += target.nbytes
+        report.copied.append(old.name)
+    return report
@@ -0,0 +1,103 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+from .readout import CalibrationReader, _in_memory
+
+
+@dataclass
+class ReadBlock:
+    address: int
+    size: int
+    elements: list[Any] = field(default_factory=list)
+    sizes: list[int] = field(default_factory=list)
+
+    @property
+    def end(self) -> int:
+        return self.address + self.size
+
+
+@dataclass
+class ReadPlan:
+    """Contiguous memory blocks covering a set of addressable objects.
+
+    The plan only depends on the A2L file, it can be reused for any image or
+    target of the same software.
+    """
+
+    blocks: list[ReadBlock] = field(default_factory=list)
+    unsupported: list[str] = field(default_factory=list)
+
+    @property
+    def element_count(self) -> int:
+        return sum(len(block.elements) for block in self.blocks)
+
+    @property
+    def size(self) -> int:
+        return sum(block.size for block in self.blocks)
+
+    def read(self, read_memory: Callable[[int, int], Any]) -> list[tuple[int, Any]]:
+        """Reads every block with read_memory(address, size).
+
+        If read_memory raises a ValueError for a block, its objects are read one by
+        one and unreadable objects are left out. The result is meant to be passed as
+        segments to CalibrationReader.read.
+        """
+        segments = []
+        for block in self.blocks:
+            try:
+                segments.append((block.address, read_memory(block.address, block.size)))
+                continue
+            except ValueError:
+                pass
+            for element, size in zip(block.elements, block.sizes):
+                try:
+                    segments.append(
+                        (element.ecu_address, read_memory(element.ecu_address, size))
+                    )
+                except ValueError:
+                    continue
+        return segments
+
+
+def create_read_plan(
+    reader: CalibrationReader,
+    elements: Iterable | None = None,
+    max_gap: int = 16,
+    max_block_size: int = 4096,
+) -> ReadPlan:
+    """Merges the memory of elements into as few blocks as possible.
+
+    Objects are joined into a block if at most max_gap unused bytes lie between
+    them and the block stays within max_block_size. Larger objects get a block of
+    their own.
+    """
+    if elements is None:
+        elements = reader.module.get_addressable_objects()
+    plan = ReadPlan()
+    ranges = []
+    for element in elements:
+        if not _in_memory(element):
+            continue
+        address = element.ecu_address
+        try:
+            size = reader.get_plan(element).dtype.itemsize
+        except NotImplementedError:
+            plan.unsupported.append(element.name)
+            continue
+        ranges.append((address, size, element))
+
+    block = None
+    for address, size, element in sorted(ranges, key=lambda r: r[0]):
+        end = address + size
+        if (
+            block is not None
+            and address - block.end <= max_gap
+            and max(end, block.end) - block.address <= max_block_size
+        ):
+            block.size = max(end, block.end) - block.address
+        else:
+            block = ReadBlock(address, size)
+            plan.blocks.append(block)
+        block.elements.append(element)
+        block.sizes.append(size)
+    return plan
@@ -0,0 +1,293 @@
+from bisect import bisect_right
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+
+from ..conversion.compu import to_physical
+from ..conversion.lookup import fix_axis
+from ..model.model import (
+    A2LAxisDescription,
+    A2LAxisDescriptionComAxis,
+    A2LAxisDescriptionCurveAxis,
+    A2LAxisDescriptionFixAxis,
+    A2LAxisPts,
+    A2LCharacteristic,
+    A2LCharacteristicAscii,
+    A2LCharacteristicCurve,
+    A2LMeasurement,
+)
+from ..model.project_model import A2LModule
+from .record_layout import (
+    AXES,
+    FNC_VALUES,
+    DecodingPlan,
+    RecordLayoutDecoder,
+    to_dtype,
+)
+
+# memory as (start address, buffer) pairs sorted by address
+Segments = Sequence[tuple[int, Any]]
+
+
+@dataclass
+class CalibrationValue:
+    """Decoded value of a characteristic, AXIS_PTS or measurement.
+
+    axes holds the physical axis points of every dimension of a curve or map: the
+    STD_AXIS points stored with it, the values of the AXIS_PTS of a COM_AXIS or
+    RES_AXIS and the points of a FIX_AXIS. It is None for a CURVE_AXIS and for
+    AXIS_PTS outside of the memory read.
+    """
+
+    name: str
+    raw: np.ndarray
+    physical: np.ndarray
+    axes: list[np.ndarray] = field(default_factory=list)
+
+
+def _std_axes(element) -> list[tuple[int, A2LAxisDescription]]:
+    """Returns the dimensions whose axis points are stored with element."""
+    if not isinstance(element, A2LCharacteristic) or not isinstance(
+        element.typedef, A2LCharacteristicCurve
+    ):
+        return []
+    return [
+        (dimension, description)
+        for dimension, description in enumerate(element.typedef.axis_descriptions)
+        if not isinstance(
+            description,
+            (
+                A2LAxisDescriptionComAxis,
+                A2LAxisDescriptionCurveAxis,
+                A2LAxisDescriptionFixAxis,
+            ),
+        )
+    ]
+
+
+class CalibrationReader:
+    """Decodes all addressable objects of a module from memory in bulk.
+
+    Objects sharing a decoding plan, memory segment and compu method are decoded and
+    converted with one numpy call each. Decoding plans are kept between reads, so
+    one reader serves any number of images of the same module.
+    """
+
+    def __init__(self, module: A2LModule):
+        self.module = module
+        self.decoder = RecordLayoutDecoder(
+            module.mod_common[0] if module.mod_common else None
+        )
+        self._measurement_plans: dict[tuple, DecodingPlan] = {}
+        self.missing: list[str] = []
+        self.unsupported: list[str] = []
+
+    def get_plan(self, element) -> DecodingPlan:
+        if not isinstance(element, A2LMeasurement):
+            return self.decoder.get_plan(element)
+        shape = tuple(element.matrix_dim or ())
+        key = (element.datatype, shape)
+        plan = self._measurement_plans.get(key)
+        if plan is None:
+            dtype = to_dtype(element.datatype, self.decoder.byte_order)
+            plan = DecodingPlan(np.dtype([(FNC_VALUES, dtype, shape)]))
+            self._measurement_plans[key] = plan
+        return plan
+
+    def read(self, segments: Segments, elements: Iterable | None = None):
+        """Yields a CalibrationValue per element readable from segments.
+
+        By default all addressable objects of the module are read. Names of elements
+        outside of the segments are collected in missing, those with record layouts
+        that cannot be decoded in unsupported.
+        """
+        if elements is None:
+            elements = self.module.get_addressable_objects()
+        starts = [start for start, _ in segments]
+        # physical values of the AXIS_PTS of shared axes by name
+        shared_axes = {}
+        for group in self.group(segments, elements).values():
+            yield from self._read_group(group, segments, starts, shared_axes)
+
+    def group(self, segments: Segments, elements: Iterable) -> dict[tuple, list]:
+        """Groups elements by decoding plan, segment and compu method.
+
+        Resets missing and unsupported to the elements left out.
+        """
+        starts = [start for start, _ in segments]
+        self.missing = []
+        self.unsupported = []
+
+        groups: dict[tuple, list] = {}
+        for element in elements:
+            if not _in_memory(element):
+                continue
+            address = element.ecu_address
+            try:
+                plan = self.get_plan(element)
+            except NotImplementedError:
+                self.unsupported.append(element.name)
+                continue
+            index = _segment_index(segments, starts, address, plan.dtype.itemsize)
+            if index is None:
+                self.missing.append(element.name)
+                continue
+            key = (id(plan), index, id(_compu_method(element)))
+            groups.setdefault(key, []).append(element)
+        return groups
+
+    def _shared_axis(
+        self, axis_pts: A2LAxisPts, segments: Segments, starts: list[int], cache: dict
+    ) -> np.ndarray | None:
+        if axis_pts.name not in cache:
+            cache[axis_pts.name] = None
+            try:
+                size = self.get_plan(axis_pts).dtype.itemsize
+            except NotImplementedError:
+                return None
+            if _segment_index(segments, starts, axis_pts.ecu_address, size) is None:
+                return None
+            (value,) = self._read_group([axis_pts], segments, starts, cache)
+            cache[axis_pts.name] = value.physical
+        return cache[axis_pts.name]
+
+    def _axes(
+        self, element, records: dict, i: int, segments: Segments, starts, cache: dict
+    ) -> list[np.ndarray | None]:
+        axes = []
+        for dimension, description in enumerate(element.typedef.axis_descriptions):
+            if isinstance(description, A2LAxisDescriptionComAxis):
+                axes.append(
+                    self._shared_axis(description.axis_pts_ref, segments, starts, cache)
+                )
+            elif isinstance(description, A2LAxisDescriptionFixAxis):
+                axes.append(fix_axis(description))
+            elif isinstance(description, A2LAxisDescriptionCurveAxis):
+                axes.append(None)
+            else:
+                axis = AXES[dimension]
+                raw = records[f"AXIS_PTS_{axis}"][i][: _count(records, axis, i)]
+                axes.append(
+                    to_physical(
+                        description.compu_method,
+                        raw,
+                        (description.min, description.max),
+                    )
+                )
+        return axes
+
+    def _read_group(
+        self,
+        group: list,
+        segments: Segments,
+        starts: list[int],
+        shared_axes: dict,
+    ):
+        plan = self.get_plan(group[0])
+        index = bisect_right(starts, group[0].ecu_address) - 1
+        start, buffer = segments[index]
+        records = plan.decode_many(
+            buffer, [element.ecu_address - start for element in group]
+        )
+        values = records[FNC_VALUES] if FNC_VALUES in records else None
+        if values is not None and not isinstance(
+            getattr(group[0], "typedef", None), A2LCharacteristicAscii
+        ):
+            # limits of every element, broadcast over its values
+            limits = np.array([_limits(element) for element in group], dtype=float)
+            limits = limits.T.reshape((2, len(group)) + (1,) * (values.ndim - 1))
+            physical = to_physical(_compu_method(group[0]), values, limits)
+        for i, element in enumerate(group):
+            if isinstance(element, A2LAxisPts):
+                raw = records["AXIS_PTS_X"][i][: _count(records, "X", i)]
+                yield CalibrationValue(
+                    element.name,
+                    raw,
+                    to_physical(element.compu_method, raw, _limits(element)),
+                )
+            elif isinstance(getattr(element, "typedef", None), A2LCharacteristicAscii):
+                raw = values[i]
+                text = raw.tobytes().split(b"\0", 1)[0].decode("ascii", "replace")
+                yield CalibrationValue(element.name, raw, np.array(text))
+            else:
+                # only the first NO_AXIS_PTS points of the stored axes are valid
+                selection = [slice(None)] * (values.ndim - 1)
+                axes = []
+                for dimension, _ in _std_axes(element):
+                    selection[dimension] = slice(_count(records, AXES[dimension], i))
+                if isinstance(
+                    getattr(element, "typedef", None), A2LCharacteristicCurve
+                ):
+                    axes = self._axes(
+                        element, records, i, segments, starts, shared_axes
+                    )
+                selection = (i, *selection)
+                yield CalibrationValue(
+                    element.name,
+                    np.asarray(values[selection]),
+                    np.asarray(physical[selection]),
+                    axes,
+                )
+
+
+def _in_memory(element) -> bool:
+    """Checks that element is stored at its ECU address.
+
+    TYPEDEF_CHARACTERISTIC have no address, VIRTUAL measurements and characteristics
+    with VIRTUAL_CHARACTERISTIC are computed and their address is meaningless.
+    """
+    if getattr(element, "ecu_address", None) is None:
+        return False
+    if isinstance(element, A2LMeasurement):
+        return element.virtual is None
+    return getattr(element, "virtual_characteristic", None) is None
+
+
+def _compu_method(element):
+    if isinstance(element, A2LCharacteristic):
+        return element.typedef.compu_method
+    return element.compu_method
+
+
+def _limits(element) -> tuple[float, float]:
+    if isinstance(element, A2LCharacteristic):
+        return element.typedef.min, element.typedef.max
+    return element.min, element.max
+
+
+def _segment_index(
+    segments: Segments, starts: list[int], address: int, size: int
+) -> int | None:
+    """Returns the index of the segment holding size bytes at address."""
+    index = bisect_right(starts, address) - 1
+    if index < 0 or address + size > starts[index] + (
+        memoryview(segments[index][1]).nbytes
+    ):
+        return None
+    return index
+
+
+def _count(records: dict, axis: str, i: int) -> int | None:
+    counts = records.get(f"NO_AXIS_PTS_{axis}")
+    return None if counts is None else int(counts[i])
+
+
+def to_json(value: CalibrationValue) -> dict:
+    data = {"name": value.name, "raw": value.raw.tolist()}
+    data["physical"] = value.physical.tolist()
+    if value.axes:
+        data["axes"] = [None if axis is None else axis.tolist() for axis in value.axes]
+    return data
+
+
+def write_calibration_data(values: Iterable[CalibrationValue], path: Path) -> int:
+    """Writes values as JSON Lines while they are produced, returns their number."""
+    count = 0
+    with open(path, "w") as f:
+        for value in values:
+            f.write(json.dumps(to_json(value)) + "\n")
+            count += 1
+    return count
@@ -0,0 +1,278 @@
+from dataclasses import dataclass
+import math
+
+import numpy as np
+
+from ..model.model import (
+    A2LAxisPts,
+    A2LCharacteristic,
+    A2LCharacteristicArray,
+    A2LCharacteristicAscii,
+    A2LCharacteristicCurve,
+    A2LModCommon,
+    A2LRecordLayout,
+    A2LRecordLayoutAxisPts,
+    A2LRecordLayoutNoAxisPts,
+    A2lFncValues,
+    A2lLRescaleAxis,
+    ByteOrder,
+)
+
+DTYPES = {
+    "UBYTE": "u1",
+    "SBYTE": "i1",
+    "UWORD": "u2",
+    "SWORD": "i2",
+    "ULONG": "u4",
+    "SLONG": "i4",
+    "A_UINT64": "u8",
+    "A_INT64": "i8",
+    "FLOAT16_IEEE": "f2",
+    "FLOAT32_IEEE": "f4",
+    "FLOAT64_IEEE": "f8",
+}
+
+# datasizes of RESERVED fields
+RESERVED_DTYPES = {"BYTE": "u1", "WORD": "u2", "LONG": "u4"}
+
+# ASAM defaults if MOD_COMMON does not define an alignment
+DEFAULT_ALIGNMENTS = {"u1": 1, "u2": 2, "u4": 4, "u8": 8, "f2": 2, "f4": 4, "f8": 8}
+
+AXES = ("X", "Y", "Z", "4", "5")
+
+FNC_VALUES = "FNC_VALUES"
+
+
+def to_dtype(datatype: str, byte_order: ByteOrder | None = None) -> np.dtype:
+    if datatype not in DTYPES:
+        raise ValueError(f"{datatype} not a valid base type")
+    prefix = ">" if byte_order == ByteOrder.MSB_FIRST else "<"
+    return np.dtype(prefix + DTYPES[datatype])
+
+
+def get_alignments(mod_common: A2LModCommon | None) -> dict[str, int]:
+    """Returns the alignment per unsigned dtype code of the element size."""
+    alignments = dict(DEFAULT_ALIGNMENTS)
+    if mod_common is None:
+        return alignments
+    for code, value in [
+        ("u1", mod_common.alignment_byte),
+        ("u2", mod_common.alignment_word),
+        ("u4", mod_common.alignment_long),
+        ("u8", mod_common.alignment_int64),
+        ("f4", mod_common.alignment_float32_ieee),
+        ("f8", mod_common.alignment_float64_ieee),
+    ]:
+        if value is not None:
+            alignments[code] = value
+    return alignments
+
+
+def _alignment(dtype: np.dtype, alignments: dict[str, int]) -> int:
+    code = (
+        f"{dtype.kind}{dtype.itemsize}" if dtype.kind == "f" else f"u{dtype.itemsize}"
+    )
+    return alignments.get(code, dtype.itemsize)
+
+
+def _field_name(layout_field) -> str:
+    if isinstance(layout_field, A2lFncValues):
+        return FNC_VALUES
+    if layout_field.axis == "RESERVED":
+        return f"RESERVED_{layout_field.position}"
+    return layout_field.axis
+
+
+@dataclass
+class DecodingPlan:
+    """A record layout compiled for one shape of a characteristic.
+
+    dtype is a structured dtype with one field per layout entry at its aligned
+    offset. Fields stored in ROW_DIR are listed in transposed, they are returned
+    transposed back so that values[x, y] belongs to axis points x and y.
+    """
+
+    dtype: np.dtype
+    transposed: frozenset[str] = frozenset()
+
+    def fields(self, records: np.ndarray) -> dict[str, np.ndarray]:
+        """Returns views of the fields of a record or an array of records."""
+        fields = {}
+        for name in self.dtype.names:
+            value = records[name]
+            if name in self.transposed:
+                lead = records.ndim
+                value = value.transpose(
+                    *range(lead), *reversed(range(lead, value.ndim))
+                )
+            fields[name] = value
+        return fields
+
+    def decode(self, buffer, offset: int = 0) -> dict[str, np.ndarray]:
+        """Decodes one record at offset of buffer without copying."""
+        record = np.frombuffer(buffer, dtype=self.dtype, count=1, offset=offset)[0]
+        return self.fields(record)
+
+    def _indices(self, offsets) -> np.ndarray:
+        offsets = np.asarray(offsets, dtype=np.intp)
+        return offsets[:, np.newaxis] + np.arange(self.dtype.itemsize)
+
+    def gather(self, buffer, offsets) -> np.ndarray:
+        """Copies the records at all offsets into one array with a single gather."""
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        return np.ascontiguousarray(data[self._indices(offsets)]).view(self.dtype)[:, 0]
+
+    def scatter(self, buffer, offsets, records: np.ndarray):
+        """Writes records back to their offsets, buffer must be writable."""
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        data[self._indices(offsets)] = records.view(np.uint8).reshape(
+            len(records), self.dtype.itemsize
+        )
+
+    def decode_many(self, buffer, offsets) -> dict[str, np.ndarray]:
+        """Decodes records at all offsets, the fields have the record index first."""
+        return self.fields(self.gather(buffer, offsets))
+
+
+def _check_static(record_layout: A2LRecordLayout, layout_fields: list, dimensions: int):
+    """Raises NotImplementedError if layout_fields are stored compactly.
+
+    Without STATIC_RECORD_LAYOUT, fields behind axis points whose number is stored
+    in the record move with that number, as do the values of maps.
+    """
+    # axes whose number of points is stored in the record
+    counted = set()
+    rescaled = False
+    for layout_field in layout_fields:
+        if isinstance(layout_field, A2LRecordLayoutNoAxisPts):
+            if layout_field.axis.startswith("NO_AXIS_PTS_"):
+                counted.add(layout_field.axis.rsplit("_", 1)[-1])
+            elif layout_field.axis == "NO_RESCALE_X":
+                rescaled = True
+
+    variable = False
+    for layout_field in layout_fields:
+        if variable:
+            raise NotImplementedError(
+                f"{record_layout.name}: fields behind a variable number of axis "
+                "points (no STATIC_RECORD_LAYOUT) not supported"
+            )
+        if isinstance(layout_field, A2lFncValues):
+            varying = counted & set(AXES[:dimensions])
+            if varying and dimensions > 1:
+                raise NotImplementedError(
+                    f"{record_layout.name}: maps with a variable number of axis "
+                    "points (no STATIC_RECORD_LAYOUT) not supported"
+                )
+            variable = bool(varying)
+        elif isinstance(layout_field, A2LRecordLayoutAxisPts):
+            variable = layout_field.axis.rsplit("_", 1)[-1] in counted
+        elif isinstance(layout_field, A2lLRescaleAxis):
+            variable = rescaled
+
+
+def compile_record_layout(
+    record_layout: A2LRecordLayout,
+    fnc_shape: tuple[int, ...],
+    axis_sizes: tuple[int, ...] = (),
+    byte_order: ByteOrder | None = None,
+    alignments: dict[str, int] | None = None,
+) -> DecodingPlan:
+    """Computes the offset of every field of record_layout.
+
+    fnc_shape is the shape of FNC_VALUES, axis_sizes the maximum number of axis
+    points per axis X, Y, ... which determine the size of AXIS_PTS fields. Records
+    whose fields move with the stored number of axis points are only supported with
+    STATIC_RECORD_LAYOUT.
+    """
+    if alignments is None:
+        alignments = get_alignments(None)
+    layout_fields = sorted(record_layout.fields, key=lambda f: f.position)
+    if not record_layout.static_record_layout:
+        _check_static(record_layout, layout_fields, len(fnc_shape))
+    names, formats, offsets = [], [], []
+    transposed = set()
+    offset = 0
+    for layout_field in layout_fields:
+        name = _field_name(layout_field)
+        shape: tuple[int, ...] = ()
+        if getattr(layout_field, "addressing_mode", "DIRECT") != "DIRECT":
+            raise NotImplementedError(
+                f"{record_layout.name}: addressing mode {layout_field.addressing_mode} not supported"
+            )
+        if isinstance(layout_field, A2lFncValues):
+            shape = fnc_shape
+            if layout_field.index_mode == "ROW_DIR" and len(shape) > 1:
+                shape = shape[::-1]
+                transposed.add(name)
+            elif layout_field.index_mode not in ("ROW_DIR", "COLUMN_DIR"):
+                raise NotImplementedError(
+                    f"{record_layout.name}: index mode {layout_field.index_mode} not supported"
+                )
+        elif isinstance(layout_field, A2LRecordLayoutAxisPts):
+            axis = name.rsplit("_", 1)[-1]
+            shape = (axis_sizes[AXES.index(axis)],)
+        elif isinstance(layout_field, A2lLRescaleAxis):
+            # pairs of axis point and rescale value
+            shape = (layout_field.map_position, 2)
+
+        if name.startswith("RESERVED"):
+            dtype = np.dtype(RESERVED_DTYPES[layout_field.datatype])
+        else:
+            dtype = to_dtype(layout_field.datatype, byte_order)
+        alignment = _alignment(dtype, alignments)
+        offset = -(-offset // alignment) * alignment
+        names.append(name)
+        formats.append((dtype, shape) if shape else dtype)
+        offsets.append(offset)
+        offset += dtype.itemsize * math.prod(shape)
+
+    dtype = np.dtype(
+        {"names": names, "formats": formats, "offsets": offsets, "itemsize": offset}
+    )
+    return DecodingPlan(dtype, frozenset(transposed))
+
+
+def get_shapes(element) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """Returns the FNC_VALUES shape and axis sizes of a characteristic or AXIS_PTS."""
+    if isinstance(element, A2LAxisPts):
+        return (), (element.max_number_sample_points,)
+    if not isinstance(element, A2LCharacteristic):
+        raise ValueError(f"{element.name} has no record layout")
+    typedef = element.typedef
+    if isinstance(typedef, A2LCharacteristicCurve):
+        sizes = tuple(axis.size for axis in typedef.axis_descriptions)
+        return sizes, sizes
+    if isinstance(typedef, A2LCharacteristicArray):
+        shape = list(typedef.matrix_dim)
+        while len(shape) > 1 and shape[-1] == 1:
+            shape.pop()
+        return tuple(shape), ()
+    if isinstance(typedef, A2LCharacteristicAscii):
+        return (typedef.size,), ()
+    return (), ()
+
+
+class RecordLayoutDecoder:
+    """Caches the decoding plans of a module, one per record layout and shape."""
+
+    def __init__(self, mod_common: A2LModCommon | None = None):
+        self.byte_order = mod_common.byte_order if mod_common is not None else None
+        self.alignments = get_alignments(mod_common)
+        self._plans: dict[tuple, DecodingPlan] = {}
+
+    def get_plan(self, element) -> DecodingPlan:
+        record_layout = (
+            element.record_layout
+            if isinstance(element, A2LAxisPts)
+            else element.typedef.record_layout
+        )
+        fnc_shape, axis_sizes = get_shapes(element)
+        key = (id(record_layout), fnc_shape, axis_sizes)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = compile_record_layout(
+                record_layout, fnc_shape, axis_sizes, self.byte_order, self.alignments
+            )
+            self._plans[key] = plan
+        return plan
@@ -0,0 +1,310 @@
+from concurrent.futures import ProcessPoolExecutor
+import csv
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Sequence
+import warnings
+
+import numpy as np
+
+from ..conversion.compu import to_physical
+from ..model.model import A2LAxisPts, A2LCharacteristic, A2LCharacteristicAscii
+from ..model.project_model import A2LModule
+from .diff import gather_records, valid_points
+from .readout import CalibrationReader, Segments, _compu_method, _in_memory
+from .record_layout import FNC_VALUES, DecodingPlan
+
+# FNV offset basis and a 64 bit golden ratio multiplier for value digests
+_DIGEST_SEED = np.uint64(0xCBF29CE484222325)
+_DIGEST_FACTOR = np.uint64(0x9E3779B97F4A7C15)
+
+
+@dataclass
+class StatisticsGroup:
+    """Objects decoded and converted together, independent of the A2L model.
+
+    Groups are built once from the A2L file and sent to the worker processes.
+    """
+
+    plan: DecodingPlan
+    addresses: np.ndarray
+    # positions of the objects in the statistics
+    indices: np.ndarray
+    # field holding the values, FNC_VALUES or AXIS_PTS_X
+    field: str
+    compu_method: Any
+    # ASCII strings have no numeric statistics
+    text: bool = False
+
+
+def create_statistics_groups(
+    reader: CalibrationReader, elements: Sequence
+) -> tuple[list[StatisticsGroup], list[str]]:
+    """Groups elements by decoding plan and compu method.
+
+    Returns the groups and the names of elements with unsupported record layouts.
+    """
+    groups: dict[tuple, list[int]] = {}
+    unsupported = []
+    for i, element in enumerate(elements):
+        if not _in_memory(element):
+            continue
+        try:
+            plan = reader.get_plan(element)
+        except NotImplementedError:
+            unsupported.append(element.name)
+            continue
+        groups.setdefault((id(plan), id(_compu_method(element))), []).append(i)
+
+    result = []
+    for indices in groups.values():
+        element = elements[indices[0]]
+        result.append(
+            StatisticsGroup(
+                reader.get_plan(element),
+                np.array([elements[i].ecu_address for i in indices], dtype=np.int64),
+                np.array(indices, dtype=np.intp),
+                "AXIS_PTS_X" if isinstance(element, A2LAxisPts) else FNC_VALUES,
+                _compu_method(element),
+                isinstance(element, A2LCharacteristic)
+                and isinstance(element.typedef, A2LCharacteristicAscii),
+            )
+        )
+    return result, unsupported
+
+
+@dataclass
+class ImageStatistics:
+    """Statistics of the values of every object in one image.
+
+    count is the number of valid points. digest identifies the stored value
+    including its axis points.
+    """
+
+    present: np.ndarray
+    minimum: np.ndarray
+    maximum: np.ndarray
+    total: np.ndarray
+    count: np.ndarray
+    digest: np.ndarray
+
+
+def _digests(records: list[np.ndarray]) -> np.ndarray:
+    """Hashes rows of values with a multiplicative hash over 64 bit words."""
+    rows = np.hstack(
+        [np.ascontiguousarray(r).reshape(len(r), -1).view(np.uint8) for r in records]
+    )
+    padding = -rows.shape[1] % 8
+    words = np.pad(rows, ((0, 0), (0, padding))).view(np.uint64)
+    digest = np.full(len(rows), _DIGEST_SEED, dtype=np.uint64)
+    for column in words.T:
+        digest = (digest ^ column) * _DIGEST_FACTOR
+    return digest
+
+
+def image_statistics(
+    groups: Iterable[StatisticsGroup], size: int, segments: Segments
+) -> ImageStatistics:
+    """Computes the statistics of all objects in one image, group by group."""
+    stats = ImageStatistics(
+        np.zeros(size, dtype=bool),
+        np.full(size, np.nan),
+        np.full(size, np.nan),
+        np.zeros(size),
+        np.zeros(size, dtype=np.int64),
+        np.zeros(size, dtype=np.uint64),
+    )
+    for group in groups:
+        records, present = gather_records(group.plan, group.addresses, segments)
+        indices = group.indices[present]
+        if not len(indices):
+            continue
+        fields = group.plan.fields(records[present])
+        stats.present[indices] = True
+
+        # unused points are excluded from the values and the digest
+        masked = []
+        for name in group.plan.dtype.names:
+            if name.startswith("RESERVED"):
+                continue
+            valid = valid_points([fields], name)
+            value = fields[name]
+            masked.append(value if valid is None else np.where(valid, value, 0))
+        stats.digest[indices] = _digests(masked)
+        if group.text:
+            continue
+
+        values = fields[group.field]
+        valid = valid_points([fields], group.field)
+        if valid is None:
+            valid = np.ones(values.shape, dtype=bool)
+        valid = np.broadcast_to(valid, values.shape)
+        physical = to_physical(group.compu_method, values)
+        if physical.dtype.kind not in "iuf":
+            continue
+        physical = np.where(valid, physical, np.nan).reshape(len(indices), -1)
+        count = valid.reshape(len(indices), -1).sum(axis=1)
+        with warnings.catch_warnings():
+            # objects without valid points
+            warnings.simplefilter("ignore", RuntimeWarning)
+            stats.minimum[indices] = np.nanmin(physical, axis=1)
+            stats.maximum[indices] = np.nanmax(physical, axis=1)
+        stats.total[indices] = np.nansum(physical, axis=1)
+        stats.count[indices] = count
+    return stats
+
+
+@dataclass
+class FleetStatistics:
+    """Columns of statistics per object over all images."""
+
+    names: list[str]
+    images: list[str]
+    minimum: np.ndarray
+    maximum: np.ndarray
+    mean: np.ndarray
+    distinct: np.ndarray
+    # number of images without the object
+    missing: np.ndarray
+    # images x objects, True if an image holds a rare value of an object
+    outliers: np.ndarray
+
+    def outlier_images(self, i: int) -> list[str]:
+        return [self.images[j] for j in np.flatnonzero(self.outliers[:, i])]
+
+
+def aggregate_statistics(
+    names: list[str],
+    images: list[str],
+    stats: Sequence[ImageStatistics],
+    outlier_share: float = 0.1,
+) -> FleetStatistics:
+    """Combines the statistics of all images.
+
+    A value is an outlier if it is held by at most outlier_share of the images
+    containing the object, and is not the most common value.
+    """
+    present = np.array([s.present for s in stats]).reshape(len(stats), len(names))
+    count = np.array([s.count for s in stats]).reshape(present.shape)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        minimum = np.nanmin([s.minimum for s in stats], axis=0)
+        maximum = np.nanmax([s.maximum for s in stats], axis=0)
+        mean = np.sum([s.total for s in stats], axis=0) / count.sum(axis=0)
+
+    # frequency of the value of every image among all images, per object
+    digests = np.array([s.digest for s in stats]).reshape(present.shape)
+    order = np.argsort(digests, axis=0, kind="stable")
+    ordered = np.take_along_axis(digests, order, axis=0)
+    starts = np.ones(ordered.shape, dtype=bool)
+    starts[1:] = ordered[1:] != ordered[:-1]
+    runs = np.cumsum(starts.T.ravel()) - 1
+    sizes = np.bincount(runs)
+    frequency = np.empty(present.shape, dtype=np.int64)
+    np.put_along_axis(frequency, order, sizes[runs].reshape(ordered.T.shape).T, axis=0)
+    frequency[~present] = 0
+
+    available = present.sum(axis=0)
+    distinct = (starts & np.take_along_axis(present, order, axis=0)).sum(axis=0)
+    outliers = (
+        present
+        & (frequency <= outlier_share * available)
+        & (frequency < frequency.max(axis=0))
+    )
+    return FleetStatistics(
+        names,
+        images,
+        minimum,
+        maximum,
+        np.where(count.sum(axis=0) > 0, mean, np.nan),
+        distinct,
+        len(stats) - available,
+        outliers,
+    )
+
+
+# state of the worker processes, set once by _init_worker
+_worker: dict[str, Any] = {}
+
+
+def _init_worker(
+    groups: list[StatisticsGroup], size: int, load_image: Callable[[Any], Segments]
+):
+    _worker.update(groups=groups, size=size, load_image=load_image)
+
+
+def _process_image(image) -> ImageStatistics:
+    segments = _worker["load_image"](image)
+    return image_statistics(_worker["groups"], _worker["size"], segments)
+
+
+def fleet_statistics(
+    module: A2LModule,
+    images: Sequence,
+    load_image: Callable[[Any], Segments],
+    max_workers: int | None = None,
+    outlier_share: float = 0.1,
+) -> tuple[FleetStatistics, list[str]]:
+    """Computes statistics of the characteristics and AXIS_PTS over many images.
+
+    The decoding plans are built once and sent to a pool of processes, each
+    process loads images with load_image(image) and returns compact per image
+    statistics. load_image must be picklable, e.g. a module level function.
+    Returns the statistics and the names of unsupported objects.
+    """
+    # TYPEDEF_CHARACTERISTIC are kept with the characteristics but have no memory
+    elements = [
+        element
+        for element in module.characteristics + module.axis_pts
+        if _in_memory(element)
+    ]
+    groups, unsupported = create_statistics_groups(CalibrationReader(module), elements)
+    size = len(elements)
+    with ProcessPoolExecutor(
+        max_workers, initializer=_init_worker, initargs=(groups, size, load_image)
+    ) as executor:
+        stats = list(executor.map(_process_image, images))
+    fleet = aggregate_statistics(
+        [element.name for element in elements],
+        [str(image) for image in images],
+        stats,
+        outlier_share,
+    )
+    return fleet, unsupported
+
+
+def write_statistics(fleet: FleetStatistics, path: Path):
+    """Writes one row per object, the statistics as columns.
+
+    A .npz suffix stores the columns as numpy arrays, any other suffix CSV.
+    """
+    if Path(path).suffix == ".npz":
+        np.savez(
+            path,
+            name=np.array(fleet.names),
+            image=np.array(fleet.images),
+            minimum=fleet.minimum,
+            maximum=fleet.maximum,
+            mean=fleet.mean,
+            distinct=fleet.distinct,
+            missing=fleet.missing,
+            outliers=fleet.outliers,
+        )
+        return
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            ["name", "min", "max", "mean", "distinct", "missing", "outliers"]
+        )
+        for i, name in enumerate(fleet.names):
+            writer.writerow(
+                [
+                    name,
+                    fleet.minimum[i],
+                    fleet.maximum[i],
+                    fleet.mean[i],
+                    fleet.distinct[i],
+                    fleet.missing[i],
+                    " ".join(fleet.outlier_images(i)),
+                ]
+            )
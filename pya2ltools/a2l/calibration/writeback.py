@@ -0,0 +1,219 @@
+from bisect import bisect_right
+import itertools
+from typing import Any, Iterable, Mapping
+
+import numpy as np
+
+from ..conversion.compu import to_raw
+from ..model.model import (
+    A2LAxisPts,
+    A2LCharacteristic,
+    A2LCharacteristicAscii,
+)
+from .readout import (
+    CalibrationReader,
+    CalibrationValue,
+    Segments,
+    _compu_method,
+    _limits,
+    _std_axes,
+)
+from .record_layout import AXES, FNC_VALUES
+
+
+def to_stored(physical, compu_method, limits, dtype: np.dtype) -> np.ndarray:
+    """Converts physical values to raw values that fit into dtype."""
+    raw_range = None
+    if dtype.kind in "iu":
+        info = np.iinfo(dtype)
+        raw_range = (info.min, info.max)
+    raw = to_raw(compu_method, physical, limits, raw_range)
+    if np.any(np.isnan(raw)):
+        raise ValueError(f"Values without raw representation: {physical}")
+    if raw_range is not None:
+        raw = np.clip(np.rint(raw), *raw_range)
+    return raw
+
+
+def _value(value) -> CalibrationValue | None:
+    if isinstance(value, CalibrationValue):
+        return value
+    return None
+
+
+class CalibrationWriter:
+    """Writes physical values of characteristics and AXIS_PTS into memory.
+
+    Values are converted to raw, clipped to the limits and encoded with the
+    decoding plans of a CalibrationReader. Values of objects sharing a plan and
+    segment are read, updated and written back with one gather and one scatter.
+    """
+
+    def __init__(self, module, reader: CalibrationReader | None = None):
+        self.module = module
+        self.reader = reader if reader is not None else CalibrationReader(module)
+        self.unknown: list[str] = []
+        self.missing: list[str] = []
+        self.unsupported: list[str] = []
+        self.unconvertible: list[str] = []
+
+    def write(
+        self,
+        segments: Segments,
+        values: Mapping[str, Any] | Iterable[tuple[str, Any]],
+        skip_unconvertible: bool = False,
+    ) -> list[str]:
+        """Writes values by name into the writable buffers of segments.
+
+        A value is an array of physical values or a CalibrationValue, whose axes
+        are written to the STD_AXIS points of curves and maps. Smaller arrays are
+        written to the start of a characteristic, a value must have as many
+        dimensions as the characteristic. Returns the names written.
+
+        Values that cannot be converted raise ValueError or NotImplementedError,
+        with skip_unconvertible their names are collected in unconvertible and the
+        other values are written.
+        """
+        if isinstance(values, Mapping):
+            values = values.items()
+        values = dict(values)
+        self.unknown = []
+        self.unconvertible = []
+        elements = []
+        for name in values:
+            element = self.module.get_reference_dict().get(name)
+            if not isinstance(element, (A2LCharacteristic, A2LAxisPts)):
+                self.unknown.append(name)
+                continue
+            elements.append(element)
+
+        groups = self.reader.group(segments, elements)
+        self.missing = self.reader.missing
+        self.unsupported = self.reader.unsupported
+        starts = [start for start, _ in segments]
+        written = []
+        for group in groups.values():
+            try:
+                self._write_group(group, values, segments, starts)
+            except (ValueError, NotImplementedError):
+                if not skip_unconvertible:
+                    raise
+                # a group is scattered only if all of its values are converted,
+                # so the values are written again one by one
+                for element in group:
+                    try:
+                        self._write_group([element], values, segments, starts)
+                    except (ValueError, NotImplementedError):
+                        self.unconvertible.append(element.name)
+                    else:
+                        written.append(element.name)
+                continue
+            written += [element.name for element in group]
+        return written
+
+    def write_stream(
+        self,
+        segments: Segments,
+        values: Iterable[CalibrationValue],
+        batch_size: int = 10000,
+    ) -> int:
+        """Writes values in batches of batch_size while they are produced.
+
+        A parameter file read value by value is never held in memory as a whole.
+        unknown, missing and unsupported collect the names of all batches. Returns
+        the number of values written.
+        """
+        iterator = iter(values)
+        count = 0
+        unknown, missing, unsupported = [], [], []
+        while batch := list(itertools.islice(iterator, batch_size)):
+            count += len(self.write(segments, [(value.name, value) for value in batch]))
+            unknown += self.unknown
+            missing += self.missing
+            unsupported += self.unsupported
+        self.unknown, self.missing, self.unsupported = unknown, missing, unsupported
+        return count
+
+    def _write_group(self, group: list, values: dict, segments, starts):
+        plan = self.reader.get_plan(group[0])
+        start, buffer = segments[bisect_right(starts, group[0].ecu_address) - 1]
+        offsets = [element.ecu_address - start for element in group]
+        records = plan.gather(buffer, offsets)
+        fields = plan.fields(records)
+        compu_method = _compu_method(group[0])
+
+        # values of the same shape are converted together
+        target = fields.get(FNC_VALUES)
+        by_shape: dict[tuple, list[int]] = {}
+        for i, element in enumerate(group):
+            if isinstance(element, A2LAxisPts):
+                self._write_axis_pts(element, values[element.name], fields, i)
+            elif isinstance(element.typedef, A2LCharacteristicAscii):
+                self._write_ascii(element, values[element.name], fields, i)
+            else:
+                shape = np.shape(self._physical(values[element.name]))
+                if len(shape) != target.ndim - 1:
+                    raise ValueError(
+                        f"{element.name}: value of shape {shape} for "
+                        f"{target.shape[1:]} values"
+                    )
+                by_shape.setdefault(shape, []).append(i)
+                self._write_axes(element, values[element.name], fields, i)
+
+        for shape, indices in by_shape.items():
+            physical = [self._physical(values[group[i].name]) for i in indices]
+            # every element is clipped to its own limits
+            limits = np.array([_limits(group[i]) for i in indices], dtype=np.float64)
+            limits = limits.T.reshape((2, len(indices)) + (1,) * len(shape))
+            raw = to_stored(np.array(physical), compu_method, limits, target.dtype)
+            region = tuple(slice(size) for size in shape)
+            if len(indices) == len(group):
+                target[(slice(None), *region)] = raw
+            else:
+                target[(np.array(indices), *region)] = raw
+        plan.scatter(buffer, offsets, records)
+
+    @staticmethod
+    def _physical(value):
+        calibration_value = _value(value)
+        return calibration_value.physical if calibration_value else value
+
+    def _write_axes(self, element, value, fields: dict, i: int):
+        calibration_value = _value(value)
+        if calibration_value is None or not calibration_value.axes:
+            return
+        std_axes = _std_axes(element)
+        axes = calibration_value.axes
+        if len(axes) == len(getattr(element.typedef, "axis_descriptions", [])):
+            # one axis per dimension, shared and fixed axes are not written here
+            axes = [axes[dimension] for dimension, _ in std_axes]
+        for (dimension, description), axis in zip(std_axes, axes):
+            if axis is None:
+                continue
+            name = AXES[dimension]
+            points = fields[f"AXIS_PTS_{name}"]
+            raw = to_stored(
+                axis,
+                description.compu_method,
+                (description.min, description.max),
+                points.dtype,
+            )
+            points[i, : len(raw)] = raw
+            if f"NO_AXIS_PTS_{name}" in fields:
+                fields[f"NO_AXIS_PTS_{name}"][i] = len(raw)
+
+    def _write_axis_pts(self, element: A2LAxisPts, value, fields: dict, i: int):
+        points = fields["AXIS_PTS_X"]
+        raw = to_stored(
+            self._physical(value), element.compu_method, _limits(element), points.dtype
+        )
+        points[i, : len(raw)] = raw
+        if "NO_AXIS_PTS_X" in fields:
+            fields["NO_AXIS_PTS_X"][i] = len(raw)
+
+    def _write_ascii(self, element, value, fields: dict, i: int):
+        text = str(self._physical(value)).encode("ascii")
+        target = fields[FNC_VALUES]
+        if len(text) > target.shape[1]:
+            raise ValueError(f"{element.name}: {text!r} longer than {target.shape[1]}")
+        target[i] = np.frombuffer(text.ljust(target.shape[1], b"\0"), np.uint8)
@@ -0,0 +1,292 @@
+import numpy as np
+
+from ..model.model import (
+    A2LCompuMethod,
+    A2LCompuMethodFormula,
+    A2LCompuMethodLinear,
+    A2LCompuMethodRational,
+    A2LCompuMethodTableInterpolation,
+    A2LCompuMethodTableNoInterpolation,
+    A2LCompuMethodVerbalTable,
+    A2LCompuTab,
+    A2LCompuVTabRange,
+    A2LCharacteristic,
+)
+from .formula import evaluate_formula
+
+
+def _table(compu_method) -> tuple[dict, float | str | None]:
+    tab: A2LCompuTab = compu_method.compu_tab_ref
+    if tab is None:
+        return compu_method.values, getattr(compu_method, "default_value", None)
+    return tab.values, tab.default_value
+
+
+def _sorted_table(values: dict) -> tuple[np.ndarray, np.ndarray]:
+    keys = np.fromiter(values.keys(), dtype=np.float64, count=len(values))
+    order = np.argsort(keys, kind="stable")
+    return keys[order], np.array(list(values.values()), dtype=object)[order]
+
+
+def linear(compu_method: A2LCompuMethodLinear, raw: np.ndarray) -> np.ndarray:
+    a, b = compu_method.coeffs
+    return a * raw + b
+
+
+def rational(
+    compu_method: A2LCompuMethodRational,
+    raw: np.ndarray,
+    limits: tuple | None = None,
+) -> np.ndarray:
+    """Solves raw = (a*x^2 + b*x + c) / (d*x^2 + e*x + f) for the physical x.
+
+    Of two solutions the one within limits is returned, the larger one without
+    limits. Raw values without a solution, or without one within limits, are NaN.
+    """
+    a, b, c, d, e, f = compu_method.coeffs
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # (a - d*raw) * x^2 + (b - e*raw) * x + (c - f*raw) = 0
+        quadratic, linear, constant = a - d * raw, b - e * raw, c - f * raw
+        if a == 0 and d == 0:
+            return -constant / linear
+        root = np.sqrt(linear**2 - 4 * quadratic * constant)
+        first = (-linear + root) / (2 * quadratic)
+        second = (-linear - root) / (2 * quadratic)
+        larger, smaller = np.fmax(first, second), np.fmin(first, second)
+        if limits is not None:
+            lower, upper = limits
+            larger = np.where((lower <= larger) & (larger <= upper), larger, np.nan)
+            smaller = np.where((lower <= smaller) & (smaller <= upper), smaller, np.nan)
+        physical = np.where(np.isnan(larger), smaller, larger)
+        return np.where(quadratic == 0, -constant / linear, physical)
+
+
+def table_interpolation(
+    compu_method: A2LCompuMethodTableInterpolation, raw: np.ndarray
+) -> np.ndarray:
+    # values outside the table are clipped to the first or last entry
+    values, _ = _table(compu_method)
+    keys, physical = _sorted_table(values)
+    return np.interp(raw, keys, physical.astype(np.float64))
+
+
+def _lookup(keys: np.ndarray, values: np.ndarray, raw: np.ndarray, default):
+    if len(keys) == 0:
+        return np.full(raw.shape, default, dtype=values.dtype)
+    index = np.clip(np.searchsorted(keys, raw), 0, len(keys) - 1)
+    found = keys[index] == raw
+    return np.where(found, values[index], default)
+
+
+def table_no_interpolation(
+    compu_method: A2LCompuMethodTableNoInterpolation, raw: np.ndarray
+) -> np.ndarray:
+    values, default = _table(compu_method)
+    keys, physical = _sorted_table(values)
+    default = np.nan if default is None else default
+    return _lookup(keys, physical.astype(np.float64), raw, default)
+
+
+def verbal_table(
+    compu_method: A2LCompuMethodVerbalTable, raw: np.ndarray
+) -> np.ndarray:
+    """Returns an object array of strings, None where no entry and no default exist."""
+    tab = compu_method.compu_tab_ref
+    values, default = _table(compu_method)
+    if isinstance(tab, A2LCompuVTabRange):
+        lower = np.array([k[0] for k in values.keys()], dtype=np.float64)
+        upper = np.array([k[1] for k in values.keys()], dtype=np.float64)
+        order = np.argsort(lower, kind="stable")
+        lower, upper = lower[order], upper[order]
+        texts = np.array(list(values.values()), dtype=object)[order]
+        if len(lower) == 0:
+            return np.full(raw.shape, default, dtype=object)
+        index = np.clip(np.searchsorted(lower, raw, side="right") - 1, 0, None)
+        found = (lower[index] <= raw) & (raw <= upper[index])
+        return np.where(found, texts[index], default)
+    keys, texts = _sorted_table(values)
+    return _lookup(keys, texts, raw, default)
+
+
+def formula(compu_method: A2LCompuMethodFormula, raw: np.ndarray) -> np.ndarray:
+    return evaluate_formula(compu_method.formula, raw)
+
+
+CONVERSIONS = {
+    A2LCompuMethodFormula: formula,
+    A2LCompuMethodLinear: linear,
+    A2LCompuMethodRational: rational,
+    A2LCompuMethodTableInterpolation: table_interpolation,
+    A2LCompuMethodTableNoInterpolation: table_no_interpolation,
+    A2LCompuMethodVerbalTable: verbal_table,
+}
+
+
+def to_physical(
+    compu_method: A2LCompuMethod | None, raw, limits: tuple | None = None
+) -> np.ndarray:
+    """Converts an array of raw ECU values to physical values in one call.
+
+    compu_method None stands for NO_COMPU_METHOD and, like IDENTICAL, returns the
+    raw values as float. limits select between the two solutions of a non-linear
+    RAT_FUNC, they may be arrays broadcast against raw.
+    """
+    raw = np.asarray(raw, dtype=np.float64)
+    if compu_method is None or type(compu_method) is A2LCompuMethod:
+        return raw
+    if isinstance(compu_method, A2LCompuMethodRational):
+        return rational(compu_method, raw, limits)
+    conversion = CONVERSIONS.get(type(compu_method))
+    if conversion is None:
+        raise NotImplementedError(
+            f"Conversion {type(compu_method).__name__} of {compu_method.name} not supported"
+        )
+    return conversion(compu_method, raw)
+
+
+def linear_inverse(compu_method: A2LCompuMethodLinear, physical: np.ndarray):
+    a, b = compu_method.coeffs
+    return (physical - b) / a
+
+
+def rational_inverse(compu_method: A2LCompuMethodRational, physical: np.ndarray):
+    a, b, c, d, e, f = compu_method.coeffs
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (a * physical**2 + b * physical + c) / (
+            d * physical**2 + e * physical + f
+        )
+
+
+def table_interpolation_inverse(
+    compu_method: A2LCompuMethodTableInterpolation, physical: np.ndarray
+) -> np.ndarray:
+    # only unique for monotonous tables
+    values, _ = _table(compu_method)
+    raw = np.fromiter(values.keys(), dtype=np.float64, count=len(values))
+    phys = np.fromiter(values.values(), dtype=np.float64, count=len(values))
+    order = np.argsort(phys, kind="stable")
+    return np.interp(physical, phys[order], raw[order])
+
+
+def table_no_interpolation_inverse(
+    compu_method: A2LCompuMethodTableNoInterpolation, physical: np.ndarray
+) -> np.ndarray:
+    values, _ = _table(compu_method)
+    inverse = {v: k for k, v in values.items()}
+    keys, raw = _sorted_table(inverse)
+    return _lookup(keys, raw.astype(np.float64), physical, np.nan)
+
+
+def verbal_table_inverse(
+    compu_method: A2LCompuMethodVerbalTable, physical: np.ndarray
+) -> np.ndarray:
+    """Looks up the raw value of each text, ranges return their lower bound."""
+    values, _ = _table(compu_method)
+    inverse = {}
+    for raw, text in values.items():
+        inverse.setdefault(text, raw[0] if isinstance(raw, tuple) else raw)
+    texts = np.array(list(inverse.keys()), dtype=str)
+    raw = np.array(list(inverse.values()), dtype=np.float64)
+    order = np.argsort(texts, kind="stable")
+    return _lookup(texts[order], raw[order], physical.astype(str), np.nan)
+
+
+def formula_inverse(
+    compu_method: A2LCompuMethodFormula,
+    physical: np.ndarray,
+    raw_range: tuple[float, float] | None = None,
+) -> np.ndarray:
+    """Evaluates FORMULA_INV, or inverts FORMULA numerically within raw_range.
+
+    Without FORMULA_INV the formula must be monotonous in raw_range, e.g. the range
+    of an integer datatype. The integer raw value with the nearest physical value
+    is returned, NaN outside of the physical range of the formula.
+    """
+    if compu_method.formula_inv is not None:
+        return evaluate_formula(compu_method.formula_inv, physical)
+    if raw_range is None:
+        raise NotImplementedError(
+            f"{compu_method.name}: FORMULA without FORMULA_INV can only be inverted "
+            "for integer datatypes"
+        )
+
+    def forward(raw):
+        return evaluate_formula(compu_method.formula, raw)
+
+    lower = np.full(physical.shape, float(raw_range[0]))
+    upper = np.full(physical.shape, float(raw_range[1]))
+    low, high = forward(lower), forward(upper)
+    if np.any(low > high):
+        low, high, lower, upper = high, low, upper, lower
+    with np.errstate(invalid="ignore"):
+        inside = (np.fmin(low, high) <= physical) & (physical <= np.fmax(low, high))
+        # bisection until lower and upper are neighbouring integers
+        for _ in range(64):
+            middle = np.floor((lower + upper) / 2)
+            below = forward(middle) <= physical
+            lower, upper = np.where(below, middle, lower), np.where(
+                below, upper, middle
+            )
+        closer = np.abs(forward(upper) - physical) < np.abs(forward(lower) - physical)
+    return np.where(inside, np.where(closer, upper, lower), np.nan)
+
+
+INVERSE_CONVERSIONS = {
+    A2LCompuMethodFormula: formula_inverse,
+    A2LCompuMethodLinear: linear_inverse,
+    A2LCompuMethodRational: rational_inverse,
+    A2LCompuMethodTableInterpolation: table_interpolation_inverse,
+    A2LCompuMethodTableNoInterpolation: table_no_interpolation_inverse,
+    A2LCompuMethodVerbalTable: verbal_table_inverse,
+}
+
+
+def to_raw(
+    compu_method: A2LCompuMethod | None,
+    physical,
+    limits: tuple[float, float] | None = None,
+    raw_range: tuple[float, float] | None = None,
+) -> np.ndarray:
+    """Converts an array of physical values to raw values in one call.
+
+    Physical values are clipped to limits first. Raw values are returned as float,
+    values without a raw representation are NaN. raw_range is the range of an
+    integer datatype, in which a FORMULA without FORMULA_INV is inverted.
+    """
+    if isinstance(compu_method, A2LCompuMethodVerbalTable):
+        return verbal_table_inverse(compu_method, np.asarray(physical))
+
+    physical = np.asarray(physical, dtype=np.float64)
+    if limits is not None:
+        physical = np.clip(physical, *limits)
+    if compu_method is None or type(compu_method) is A2LCompuMethod:
+        return physical
+    if isinstance(compu_method, A2LCompuMethodFormula):
+        return formula_inverse(compu_method, physical, raw_range)
+    conversion = INVERSE_CONVERSIONS.get(type(compu_method))
+    if conversion is None:
+        raise NotImplementedError(
+            f"Inverse conversion {type(compu_method).__name__} of {compu_method.name} not supported"
+        )
+    return conversion(compu_method, physical)
+
+
+def get_limits(characteristic: A2LCharacteristic, extended: bool = False):
+    typedef = characteristic.typedef
+    if extended and typedef.extended_min is not None:
+        return typedef.extended_min, typedef.extended_max
+    return typedef.min, typedef.max
+
+
+def characteristic_to_raw(
+    characteristic: A2LCharacteristic, physical, extended: bool = False
+) -> np.ndarray:
+    """Converts physical values of a characteristic, clipped to its limits.
+
+    With extended the EXTENDED_LIMITS are used if the characteristic has them.
+    """
+    return to_raw(
+        characteristic.typedef.compu_method,
+        physical,
+        get_limits(characteristic, extended),
+    )
@@ -0,0 +1,93 @@
+from collections import deque
+from typing import Iterable
+
+import numpy as np
+
+from ..model.model import A2LCharacteristic, DependentCharacteristic
+from ..model.project_model import A2LModule
+from .formula import evaluate_formula
+
+
+def get_dependency(characteristic: A2LCharacteristic) -> DependentCharacteristic | None:
+    if characteristic.dependent_characteristic is not None:
+        return characteristic.dependent_characteristic
+    return characteristic.virtual_characteristic
+
+
+class DependentEvaluator:
+    """Computes DEPENDENT_CHARACTERISTIC and VIRTUAL_CHARACTERISTIC values of a module.
+
+    Values are physical and passed as a dict of characteristic name to array. The
+    dependency graph is built and ordered once, a cycle raises a ValueError.
+    """
+
+    def __init__(self, module: A2LModule):
+        self._dependencies: dict[str, DependentCharacteristic] = {}
+        self._dependents: dict[str, list[str]] = {}
+        for characteristic in module.characteristics:
+            if not isinstance(characteristic, A2LCharacteristic):
+                continue
+            dependency = get_dependency(characteristic)
+            if dependency is None:
+                continue
+            self._dependencies[characteristic.name] = dependency
+            for variable in dependency.variables:
+                self._dependents.setdefault(variable.name, []).append(
+                    characteristic.name
+                )
+        self.order = self._sort()
+        self._position = {name: i for i, name in enumerate(self.order)}
+
+    def _sort(self) -> list[str]:
+        in_degree = {
+            name: sum(v.name in self._dependencies for v in dependency.variables)
+            for name, dependency in self._dependencies.items()
+        }
+        ready = deque(name for name, degree in in_degree.items() if degree == 0)
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for dependent in self._dependents.get(name, []):
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(in_degree):
+            cycle = sorted(name for name, degree in in_degree.items() if degree > 0)
+            raise ValueError(f"Cyclic dependent characteristics: {', '.join(cycle)}")
+        return order
+
+    def _evaluate(self, name: str, values: dict[str, np.ndarray]) -> np.ndarray:
+        dependency = self._dependencies[name]
+        try:
+            variables = [values[v.name] for v in dependency.variables]
+        except KeyError as e:
+            raise ValueError(f"{name} depends on {e.args[0]} without value") from None
+        return evaluate_formula(dependency.formula, *variables)
+
+    def evaluate(self, values: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+        """Computes all dependent characteristics, returns values extended by them."""
+        values = dict(values)
+        for name in self.order:
+            values[name] = self._evaluate(name, values)
+        return values
+
+    def get_affected(self, changed: Iterable[str]) -> list[str]:
+        """Returns the dependent characteristics downstream of changed in order."""
+        affected = set()
+        pending = list(changed)
+        while pending:
+            for dependent in self._dependents.get(pending.pop(), []):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    pending.append(dependent)
+        return sorted(affected, key=self._position.__getitem__)
+
+    def update(
+        self, values: dict[str, np.ndarray], changed: Iterable[str]
+    ) -> list[str]:
+        """Recomputes in place only the values affected by changed, returns their names."""
+        affected = self.get_affected(changed)
+        for name in affected:
+            values[name] = self._evaluate(name, values)
+        return affected
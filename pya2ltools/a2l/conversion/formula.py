@@ -0,0 +1,188 @@
+import functools
+import re
+from typing import Callable
+
+import numpy as np
+
+# ASAM formulas use C syntax, operators by increasing precedence
+BINARY_OPERATORS = (
+    ("||",),
+    ("&&",),
+    ("|",),
+    ("^",),
+    ("&",),
+    ("==", "!="),
+    ("<", "<=", ">", ">="),
+    ("<<", ">>"),
+    ("+", "-"),
+    ("*", "/", "%"),
+)
+
+FUNCTIONS = {
+    "abs": "np.abs",
+    "acos": "np.arccos",
+    "asin": "np.arcsin",
+    "atan": "np.arctan",
+    "ceil": "np.ceil",
+    "cos": "np.cos",
+    "cosh": "np.cosh",
+    "exp": "np.exp",
+    "floor": "np.floor",
+    "log": "np.log",
+    "log10": "np.log10",
+    "pow": "np.power",
+    "sin": "np.sin",
+    "sinh": "np.sinh",
+    "sqrt": "np.sqrt",
+    "tan": "np.tan",
+    "tanh": "np.tanh",
+}
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<number>0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)"
+    r"|(?P<name>[A-Za-z_]\w*)"
+    r"|(?P<operator>\|\||&&|==|!=|<=|>=|<<|>>|[-+*/%()<>|&^!~,]))"
+)
+
+
+def _int(value):
+    return np.asarray(value).astype(np.int64)
+
+
+def _tokenize(formula: str) -> list[str]:
+    tokens = []
+    position = 0
+    formula = formula.rstrip()
+    while position < len(formula):
+        match = _TOKEN.match(formula, position)
+        if match is None:
+            raise ValueError(f"Invalid formula {formula!r} at position {position}")
+        tokens.append(match.group(match.lastgroup))
+        position = match.end()
+    return tokens
+
+
+class _Translator:
+    """Translates the tokens of a formula to a numpy expression."""
+
+    def __init__(self, formula: str):
+        self.formula = formula
+        self.tokens = _tokenize(formula)
+        self.position = 0
+        self.arity = 0
+
+    def error(self, message: str) -> ValueError:
+        return ValueError(f"Invalid formula {self.formula!r}: {message}")
+
+    def peek(self) -> str | None:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def next(self) -> str:
+        token = self.peek()
+        if token is None:
+            raise self.error("unexpected end")
+        self.position += 1
+        return token
+
+    def expect(self, token: str):
+        if self.next() != token:
+            raise self.error(f"expected {token}")
+
+    def translate(self) -> str:
+        expression = self.binary(0)
+        if self.peek() is not None:
+            raise self.error(f"unexpected {self.peek()}")
+        return expression
+
+    def binary(self, level: int) -> str:
+        if level == len(BINARY_OPERATORS):
+            return self.unary()
+        left = self.binary(level + 1)
+        while self.peek() in BINARY_OPERATORS[level]:
+            operator = self.next()
+            right = self.binary(level + 1)
+            left = self.operation(operator, left, right)
+        return left
+
+    @staticmethod
+    def operation(operator: str, left: str, right: str) -> str:
+        if operator == "||":
+            return f"np.logical_or({left}, {right})"
+        if operator == "&&":
+            return f"np.logical_and({left}, {right})"
+        if operator == "%":
+            return f"np.fmod({left}, {right})"
+        if operator in ("|", "^", "&", "<<", ">>"):
+            return f"(_int({left}) {operator} _int({right}))"
+        return f"({left} {operator} {right})"
+
+    def unary(self) -> str:
+        token = self.peek()
+        if token in ("-", "+"):
+            self.next()
+            return f"({token}{self.unary()})"
+        if token == "!":
+            self.next()
+            return f"np.logical_not({self.unary()})"
+        if token == "~":
+            self.next()
+            return f"(~_int({self.unary()}))"
+        return self.primary()
+
+    def primary(self) -> str:
+        token = self.next()
+        if token == "(":
+            expression = self.binary(0)
+            self.expect(")")
+            return f"({expression})"
+        if token[0].isdigit() or token[0] == ".":
+            return repr(int(token, 16) if token[:2] in ("0x", "0X") else float(token))
+        variable = re.fullmatch(r"[Xx](\d*)", token)
+        if variable is not None:
+            index = int(variable.group(1) or 1)
+            if index == 0:
+                raise self.error("variables start at X1")
+            self.arity = max(self.arity, index)
+            return f"X[{index - 1}]"
+        if token in FUNCTIONS and self.peek() == "(":
+            self.next()
+            arguments = [self.binary(0)]
+            while self.peek() == ",":
+                self.next()
+                arguments.append(self.binary(0))
+            self.expect(")")
+            return f"{FUNCTIONS[token]}({', '.join(arguments)})"
+        raise self.error(f"unexpected {token}")
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_formula(formula: str) -> Callable[..., np.ndarray]:
+    """Compiles an ASAM formula to a function evaluating it on arrays.
+
+    The function takes one argument per variable X1 ... Xn (X is X1). Only numbers,
+    variables, C operators and the ASAM math functions are accepted, so the
+    generated code cannot reach anything else. Compiled formulas are cached by
+    formula string.
+    """
+    translator = _Translator(formula)
+    expression = translator.translate()
+    code = compile(
+        f"lambda *X: np.asarray({expression}, dtype=np.float64)",
+        f"<formula {formula}>",
+        "eval",
+    )
+    function = eval(code, {"__builtins__": {}, "np": np, "_int": _int})
+    function.arity = translator.arity
+    return function
+
+
+def evaluate_formula(formula: str, *variables) -> np.ndarray:
+    compiled = compile_formula(formula)
+    if len(variables) < compiled.arity:
+        raise ValueError(
+            f"Formula {formula!r} needs {compiled.arity} variables, got {len(variables)}"
+        )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return compiled(*(np.asarray(v, dtype=np.float64) for v in variables))
@@ -0,0 +1,136 @@
+from dataclasses import dataclass, field
+import itertools
+from typing import Mapping, Sequence
+
+import numpy as np
+
+from ..model.model import (
+    A2LAxisDescription,
+    A2LAxisDescriptionComAxis,
+    A2LAxisDescriptionCurveAxis,
+    A2LAxisDescriptionFixAxis,
+    A2LCharacteristic,
+    A2LCharacteristicCurve,
+)
+from .compu import to_physical
+
+
+@dataclass
+class LookupTable:
+    """Values of a CURVE, MAP, CUBOID or CUBE_4 on its axes.
+
+    values has one dimension per axis, values[i, j] belongs to axes[0][i] and
+    axes[1][j]. An axis with a rescale (CURVE_AXIS) is an index axis, query points
+    are mapped to indices by the rescale curve first.
+    """
+
+    axes: list[np.ndarray]
+    values: np.ndarray
+    rescales: list["LookupTable | None"] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.rescales:
+            self.rescales = [None] * len(self.axes)
+        if self.values.shape != tuple(len(axis) for axis in self.axes):
+            raise ValueError(
+                f"Values of shape {self.values.shape} do not match axes of size "
+                f"{[len(axis) for axis in self.axes]}"
+            )
+        # interpolation needs increasing axes, reversing is a view
+        for dimension, axis in enumerate(self.axes):
+            if len(axis) > 1 and axis[0] > axis[-1]:
+                self.axes[dimension] = axis[::-1]
+                self.values = np.flip(self.values, dimension)
+
+    def __call__(self, *points) -> np.ndarray:
+        return interpolate(self, *points)
+
+
+def _segments(axis: np.ndarray, points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the lower index and the weight of the upper point for each point."""
+    if len(axis) == 1:
+        return np.zeros(points.shape, dtype=np.intp), np.zeros(points.shape)
+    # ASAM: outside of the axis the value at the nearest end is used
+    points = np.clip(points, axis[0], axis[-1])
+    index = np.clip(np.searchsorted(axis, points, side="right") - 1, 0, len(axis) - 2)
+    lower = axis[index]
+    width = axis[index + 1] - lower
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weight = np.where(width > 0, (points - lower) / width, 0.0)
+    return index, weight
+
+
+def interpolate(table: LookupTable, *points) -> np.ndarray:
+    """Evaluates table at N points with multilinear interpolation.
+
+    One array of coordinates is passed per axis, all broadcast to the same shape.
+    """
+    if len(points) != len(table.axes):
+        raise ValueError(f"Expected {len(table.axes)} coordinates, got {len(points)}")
+    points = np.broadcast_arrays(*(np.asarray(p, dtype=np.float64) for p in points))
+    segments = []
+    for axis, rescale, coordinates in zip(table.axes, table.rescales, points):
+        if rescale is not None:
+            coordinates = rescale(coordinates)
+        segments.append(_segments(axis, coordinates))
+
+    result = np.zeros(points[0].shape if points else ())
+    for corner in itertools.product((0, 1), repeat=len(segments)):
+        weight = np.ones(result.shape)
+        index = []
+        for upper, (lower_index, upper_weight), size in zip(
+            corner, segments, table.values.shape
+        ):
+            weight = weight * (upper_weight if upper else 1 - upper_weight)
+            index.append(np.minimum(lower_index + upper, size - 1))
+        result += weight * table.values[tuple(index)]
+    return result
+
+
+def fix_axis(axis_description: A2LAxisDescriptionFixAxis) -> np.ndarray:
+    if axis_description.par_list:
+        raw = np.array(axis_description.par_list, dtype=np.float64)
+    else:
+        offset, distance, count = axis_description.par_dist
+        raw = offset + distance * np.arange(count, dtype=np.float64)
+    return to_physical(axis_description.compu_method, raw)
+
+
+def create_lookup_table(
+    characteristic: A2LCharacteristic,
+    values,
+    std_axes: Sequence[np.ndarray] = (),
+    axis_pts: Mapping[str, np.ndarray] | None = None,
+    curves: Mapping[str, LookupTable] | None = None,
+) -> LookupTable:
+    """Creates the lookup table of characteristic from physical values.
+
+    std_axes holds the STD_AXIS values stored with the characteristic in order, or
+    the axes of every dimension like CalibrationValue.axes, axis_pts the values of AXIS_PTS referenced by COM_AXIS and RES_AXIS and curves
+    the lookup tables of curves referenced by CURVE_AXIS. Shared axes are used as
+    they are, without copying.
+    """
+    typedef = characteristic.typedef
+    if not isinstance(typedef, A2LCharacteristicCurve):
+        raise ValueError(f"{characteristic.name} has no axes")
+
+    positional = len(std_axes) == len(typedef.axis_descriptions)
+    std_axes_iter = iter(std_axes)
+    axes = []
+    rescales = []
+    for dimension, axis_description in enumerate(typedef.axis_descriptions):
+        rescale = None
+        if isinstance(axis_description, A2LAxisDescriptionFixAxis):
+            axis = fix_axis(axis_description)
+        elif isinstance(axis_description, A2LAxisDescriptionComAxis):
+            axis = (axis_pts or {})[axis_description.axis_pts_ref.name]
+        elif isinstance(axis_description, A2LAxisDescriptionCurveAxis):
+            axis = np.arange(axis_description.size, dtype=np.float64)
+            rescale = (curves or {})[axis_description.curve_axis_ref.name]
+        elif isinstance(axis_description, A2LAxisDescription):
+            axis = std_axes[dimension] if positional else next(std_axes_iter, None)
+            if axis is None:
+                raise ValueError(f"Missing STD_AXIS values of {characteristic.name}")
+        axes.append(np.asarray(axis, dtype=np.float64))
+        rescales.append(rescale)
+    return LookupTable(axes, np.asarray(values, dtype=np.float64), rescales)
@@ -0,0 +1,40 @@
+import enum
+import hashlib
+import json
+from typing import Any
+
+from .references import field_names, is_element
+
+
+def canonical_form(element: Any, exclude: tuple[str, ...] = ()) -> dict[str, Any]:
+    """Returns a JSON compatible representation of element.
+
+    References to other elements are represented by their name, so the result only
+    depends on the element itself. Fields in exclude are left out.
+    """
+    form = {"type": type(element).__name__}
+    for name in field_names(type(element)):
+        if name not in exclude:
+            form[name] = _canonical_value(getattr(element, name))
+    return form
+
+
+def _canonical_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, str, int)):
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, enum.Enum):
+        return value.value
+    if is_element(value):
+        return {"ref": value.name}
+    if isinstance(value, (list, tuple)):
+        return [_canonical_value(v) for v in value]
+    if isinstance(value, dict):
+        return [[_canonical_value(k), _canonical_value(v)] for k, v in value.items()]
+    return canonical_form(value)
+
+
+def structural_hash(element: Any, exclude: tuple[str, ...] = ()) -> str:
+    content = json.dumps(canonical_form(element, exclude), separators=(",", ":"))
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
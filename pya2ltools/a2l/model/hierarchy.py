@@ -0,0 +1,174 @@
+from typing import Any
+
+import numpy as np
+
+from .model import A2LCharacteristic
+from .project_model import A2LFunction, A2LGroup, A2LModule
+
+
+def _children(node: A2LGroup | A2LFunction) -> list[Any]:
+    if isinstance(node, A2LGroup):
+        return node.sub_groups + node.function_lists
+    return node.sub_functions
+
+
+def _members(node: A2LGroup | A2LFunction) -> list[Any]:
+    if isinstance(node, A2LGroup):
+        return node.characteristics + node.measurements
+    return (
+        node.ref_characteristics
+        + node.def_characteristics
+        + node.in_measurements
+        + node.out_measurements
+        + node.loc_measurements
+    )
+
+
+class HierarchyIndex:
+    """Transitive membership of the GROUP and FUNCTION hierarchy.
+
+    Every element gets a number, the transitive members of a group or function are
+    stored as a bitset (an int) and computed once. A reverse map keeps the groups
+    and functions directly containing each element.
+    """
+
+    def __init__(self, module: A2LModule):
+        self._elements: list[Any] = []
+        self._numbers: dict[int, int] = {}
+        self._closures: dict[int, int] = {}
+        self._member_lists: dict[int, list[Any]] = {}
+        self._parents: dict[int, list[Any]] = {}
+        self._children: dict[int, list[Any]] = {}
+        for node in module.groups + module.functions:
+            self._add_node(node)
+
+    def _number(self, element: Any) -> int:
+        number = self._numbers.get(id(element))
+        if number is None:
+            number = len(self._elements)
+            self._numbers[id(element)] = number
+            self._elements.append(element)
+        return number
+
+    def _add_node(self, node: A2LGroup | A2LFunction):
+        self._number(node)
+        children = _members(node) + _children(node)
+        self._children[id(node)] = children
+        for child in children:
+            self._parents.setdefault(id(child), []).append(node)
+
+    def _closure(self, node: Any) -> int:
+        closure = self._closures.get(id(node))
+        if closure is None:
+            self._compute_closures(node)
+            closure = self._closures[id(node)]
+        return closure
+
+    def _compute_closures(self, root: Any):
+        """Computes the closures of root and the nodes below it.
+
+        Nodes of a cycle contain each other and share one closure, so the strongly
+        connected components are found with Tarjan's algorithm and their closures
+        are computed after those of the components below them.
+        """
+        index: dict[int, int] = {}
+        low: dict[int, int] = {}
+        stack: list[Any] = []
+        on_stack: set[int] = set()
+        # depth first search without recursion, a frame is a node and its children
+        frames = [(root, iter(_children(root)))]
+        index[id(root)] = low[id(root)] = 0
+        stack.append(root)
+        on_stack.add(id(root))
+        while frames:
+            node, children = frames[-1]
+            for child in children:
+                if id(child) in self._closures:
+                    continue
+                if id(child) not in index:
+                    index[id(child)] = low[id(child)] = len(index)
+                    stack.append(child)
+                    on_stack.add(id(child))
+                    frames.append((child, iter(_children(child))))
+                    break
+                if id(child) in on_stack:
+                    low[id(node)] = min(low[id(node)], index[id(child)])
+            else:
+                frames.pop()
+                if frames:
+                    parent = frames[-1][0]
+                    low[id(parent)] = min(low[id(parent)], low[id(node)])
+                if low[id(node)] == index[id(node)]:
+                    self._close_component(node, stack, on_stack)
+
+    def _close_component(self, head: Any, stack: list[Any], on_stack: set[int]):
+        component = []
+        while True:
+            node = stack.pop()
+            on_stack.discard(id(node))
+            component.append(node)
+            if node is head:
+                break
+        ids = {id(node) for node in component}
+        closure = 0
+        for node in component:
+            for member in _members(node):
+                closure |= 1 << self._number(member)
+            for child in _children(node):
+                closure |= 1 << self._number(child)
+                if id(child) not in ids:
+                    closure |= self._closures[id(child)]
+        for node in component:
+            self._closures[id(node)] = closure
+
+    def get_members(self, node: A2LGroup | A2LFunction) -> list[Any]:
+        """Returns all characteristics, measurements, groups and functions below node."""
+        members = self._member_lists.get(id(node))
+        if members is None:
+            closure = self._closure(node)
+            data = closure.to_bytes((closure.bit_length() + 7) // 8, "little")
+            numbers = np.flatnonzero(
+                np.unpackbits(np.frombuffer(data, dtype=np.uint8), bitorder="little")
+            )
+            members = [self._elements[number] for number in numbers]
+            self._member_lists[id(node)] = members
+        return list(members)
+
+    def get_characteristics(self, node: A2LGroup | A2LFunction) -> list[Any]:
+        return [m for m in self.get_members(node) if isinstance(m, A2LCharacteristic)]
+
+    def contains(self, node: A2LGroup | A2LFunction, element: Any) -> bool:
+        closure = self._closure(node)
+        number = self._numbers.get(id(element))
+        return number is not None and bool(closure >> number & 1)
+
+    def get_parents(self, element: Any) -> list[Any]:
+        """Returns the groups and functions directly containing element."""
+        return list(self._parents.get(id(element), []))
+
+    def get_ancestors(self, element: Any) -> list[Any]:
+        """Returns all groups and functions containing element."""
+        ancestors = []
+        seen = set()
+        stack = list(self._parents.get(id(element), []))
+        while stack:
+            node = stack.pop()
+            if id(node) not in seen:
+                seen.add(id(node))
+                ancestors.append(node)
+                stack += self._parents.get(id(node), [])
+        return ancestors
+
+    def update(self, node: A2LGroup | A2LFunction):
+        """Updates the index after members or children of node changed.
+
+        Also used to add a new group or function. Only node and the groups and
+        functions containing it are recomputed, on their next query.
+        """
+        for child in self._children.pop(id(node), []):
+            parents = self._parents[id(child)]
+            parents[:] = [p for p in parents if p is not node]
+        self._add_node(node)
+        for stale in [node, *self.get_ancestors(node)]:
+            self._closures.pop(id(stale), None)
+            self._member_lists.pop(id(stale), None)
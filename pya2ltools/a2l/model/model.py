@@ -112,6 +112,9 @@ class A2LRecordLayout:
     fields: list[A2LRecordLayoutNoAxisPts | A2LRecordLayoutAxisPts | A2lFncValues] = (
         field(default_factory=list)
     )
+    # memory is reserved for the maximum number of axis points, otherwise records
+    # with NO_AXIS_PTS are stored compactly
+    static_record_layout: bool = False
 
 
 @dataclass
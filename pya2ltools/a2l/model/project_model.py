@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Any, Optional, Self
+from typing import Any, Iterable, Optional, Self
 
 
 from .model import (
@@ -66,6 +66,42 @@ class A2ML:
     content: str
 
 
+# maps the element types that can appear inside a MODULE to the list holding them
+# TYPEDEF_CHARACTERISTIC is stored in characteristics by the reader
+MODULE_ELEMENT_TYPES: dict[type, str] = {
+    A2ML: "a2ml",
+    A2LCharacteristic: "characteristics",
+    A2LCharacteristicTypedef: "characteristics",
+    A2LMeasurement: "measurements",
+    A2LCompuMethod: "compu_methods",
+    A2LAxisPts: "axis_pts",
+    A2LCompuTab: "compu_tabs",
+    A2LCompuVTab: "compu_vtabs",
+    A2LCompuVTabRange: "compu_vtab_ranges",
+    A2LGroup: "groups",
+    A2LFunction: "functions",
+    A2LModCommon: "mod_common",
+    A2LModPar: "mod_par",
+    A2LRecordLayout: "record_layouts",
+    A2LStructure: "typedef_structures",
+    A2LTypedefAxis: "typedef_axes",
+    A2LInstance: "instances",
+    A2LTransformer: "transformers",
+    A2LBlob: "blobs",
+    A2LIfData: "if_data",
+}
+
+
+def element_list_name(element: Any) -> str:
+    list_name = MODULE_ELEMENT_TYPES.get(type(element))
+    if list_name is not None:
+        return list_name
+    for element_type, list_name in MODULE_ELEMENT_TYPES.items():
+        if isinstance(element, element_type):
+            return list_name
+    raise ValueError(f"{type(element).__name__} is not a module element")
+
+
 @dataclass
 class A2LModule:
     name: str = ""
@@ -107,6 +143,58 @@ class A2LModule:
     def get_addressable_objects(self):
         return self.characteristics + self.measurements + self.axis_pts
 
+    def get_element(self, name: str) -> Any:
+        return self._reference_dict[name]
+
+    def get_reference_dict(self) -> dict[str, Any]:
+        return self._reference_dict
+
+    def add_elements(self, elements: Iterable[Any]):
+        # elements are expected to be resolved already
+        for element in elements:
+            getattr(self, element_list_name(element)).append(element)
+            self.global_list.append(element)
+            if hasattr(element, "name"):
+                self._reference_dict[element.name] = element
+
+    def remove_elements(self, elements: Iterable[Any]):
+        elements = list(elements)
+        ids = {id(element) for element in elements}
+        if not ids:
+            return
+        for list_name in {element_list_name(element) for element in elements}:
+            items = getattr(self, list_name)
+            setattr(self, list_name, [e for e in items if id(e) not in ids])
+        self.global_list = [e for e in self.global_list if id(e) not in ids]
+        for element in elements:
+            name = getattr(element, "name", None)
+            if name is not None and self._reference_dict.get(name) is element:
+                del self._reference_dict[name]
+
+    def replace_elements(self, replacements: Iterable[tuple[Any, Any]]):
+        # references to the replaced elements are not updated
+        replacements = list(replacements)
+        new_elements = {id(old): new for old, new in replacements}
+        if not new_elements:
+            return
+        list_names = set()
+        for old, new in replacements:
+            list_name = element_list_name(old)
+            if list_name != element_list_name(new):
+                raise ValueError(
+                    f"Can not replace {type(old).__name__} with {type(new).__name__}"
+                )
+            list_names.add(list_name)
+            name = getattr(old, "name", None)
+            if name is not None and self._reference_dict.get(name) is old:
+                del self._reference_dict[name]
+            if getattr(new, "name", None) is not None:
+                self._reference_dict[new.name] = new
+        for list_name in list_names:
+            items = getattr(self, list_name)
+            setattr(self, list_name, [new_elements.get(id(e), e) for e in items])
+        self.global_list = [new_elements.get(id(e), e) for e in self.global_list]
+
     def __add__(self, other):
         if isinstance(other, A2LModule):
             self.characteristics += other.characteristics
@@ -0,0 +1,66 @@
+from typing import Any
+
+from .project_model import A2LModule
+from .references import iter_references, rename_references
+
+
+class ReferenceIndex:
+    """Maps every element of a module to the elements referencing it.
+
+    Built once from a resolved module, afterwards rename, delete and "who uses this"
+    queries only touch the referencing elements.
+    """
+
+    def __init__(self, module: A2LModule):
+        self.module = module
+        self._referrers: dict[int, list[Any]] = {}
+        for element in module.global_list:
+            self._add_references(element)
+
+    def _references(self, element: Any) -> dict[int, Any]:
+        lookup = self.module.get_reference_dict()
+        return {id(r): r for r in iter_references(element, lookup)}
+
+    def _add_references(self, element: Any):
+        for referenced in self._references(element):
+            self._referrers.setdefault(referenced, []).append(element)
+
+    def _remove_references(self, element: Any):
+        for referenced in self._references(element):
+            referrers = self._referrers[referenced]
+            referrers[:] = [r for r in referrers if r is not element]
+
+    def get_referrers(self, element: Any) -> list[Any]:
+        return list(self._referrers.get(id(element), []))
+
+    def is_referenced(self, element: Any) -> bool:
+        return bool(self._referrers.get(id(element)))
+
+    def add(self, element: Any):
+        """Adds a resolved element to the module and the index."""
+        self.module.add_elements([element])
+        self._add_references(element)
+
+    def delete(self, element: Any):
+        """Removes element from the module, fails if it is still referenced."""
+        referrers = self._referrers.get(id(element))
+        if referrers:
+            names = ", ".join(r.name for r in referrers)
+            raise ValueError(f"{element.name} is still referenced by {names}")
+        self._remove_references(element)
+        self._referrers.pop(id(element), None)
+        self.module.remove_elements([element])
+
+    def rename(self, element: Any, name: str):
+        """Renames element, references by name are updated as well."""
+        lookup = self.module.get_reference_dict()
+        if name in lookup:
+            raise ValueError(f"Element {name} already exists")
+        old_name = element.name
+        element.name = name
+        if lookup.get(old_name) is element:
+            del lookup[old_name]
+        lookup[name] = element
+
+        for referrer in self._referrers.get(id(element), []):
+            rename_references(referrer, old_name, name)
@@ -0,0 +1,94 @@
+from dataclasses import fields, is_dataclass
+import functools
+from typing import Any, Iterator, Mapping
+
+from .model import A2LIfData
+from .project_model import MODULE_ELEMENT_TYPES
+
+# IF_DATA is owned by the element defining it and never referenced
+_element_types = tuple(t for t in MODULE_ELEMENT_TYPES if t is not A2LIfData)
+
+# fields that hold names of other elements instead of the resolved elements, VIRTUAL
+# measurements keep the names of their inputs in variables
+NAMED_REFERENCES = ("status_string_ref", "variables")
+
+
+@functools.cache
+def field_names(cls: type) -> tuple[str, ...]:
+    return tuple(f.name for f in fields(cls))
+
+
+def is_element(value: Any) -> bool:
+    return isinstance(value, _element_types)
+
+
+def iter_references(
+    element: Any, lookup: Mapping[str, Any] | None = None
+) -> Iterator[Any]:
+    """Yields all elements directly referenced by element.
+
+    Nested objects owned by element (typedefs, axis descriptions, ...) are searched
+    as well. Named references are only followed if a lookup is given.
+    """
+    for name in field_names(type(element)):
+        value = getattr(element, name)
+        if name in NAMED_REFERENCES:
+            yield from _iter_named(value, lookup)
+            continue
+        yield from _iter_value(value, lookup)
+
+
+def _iter_named(value: Any, lookup: Mapping[str, Any] | None) -> Iterator[Any]:
+    # the variables of a DEPENDENT_CHARACTERISTIC are resolved, those of VIRTUAL not
+    for item in value if isinstance(value, list) else [value]:
+        if not isinstance(item, str):
+            yield from _iter_value(item, lookup)
+        elif lookup is not None:
+            referenced = lookup.get(item)
+            if referenced is not None:
+                yield referenced
+
+
+def _iter_value(value: Any, lookup: Mapping[str, Any] | None) -> Iterator[Any]:
+    if is_element(value):
+        yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from _iter_value(item, lookup)
+    elif is_dataclass(value):
+        yield from iter_references(value, lookup)
+
+
+def replace_references(element: Any, replacements: Mapping[int, Any]):
+    """Replaces references of element, replacements maps id(old) to the new element."""
+    for name in field_names(type(element)):
+        value = getattr(element, name)
+        if is_element(value):
+            if id(value) in replacements:
+                setattr(element, name, replacements[id(value)])
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                if is_element(item):
+                    if id(item) in replacements:
+                        value[i] = replacements[id(item)]
+                elif is_dataclass(item):
+                    replace_references(item, replacements)
+        elif is_dataclass(value):
+            replace_references(value, replacements)
+
+
+def rename_references(element: Any, old_name: str, name: str):
+    """Replaces references by name to old_name in element and its nested objects."""
+    for field_name in field_names(type(element)):
+        value = getattr(element, field_name)
+        if field_name in NAMED_REFERENCES:
+            if value == old_name:
+                setattr(element, field_name, name)
+            elif isinstance(value, list):
+                value[:] = [name if item == old_name else item for item in value]
+        elif isinstance(value, list):
+            for item in value:
+                if is_dataclass(item) and not is_element(item):
+                    rename_references(item, old_name, name)
+        elif is_dataclass(value) and not is_element(value):
+            rename_references(value, old_name, name)
@@ -0,0 +1,52 @@
+from typing import Any
+
+from ..model.hashing import structural_hash
+from ..model.project_model import A2LModule
+from ..model.references import replace_references
+
+# compu methods come last, they reference the tables
+DEDUPLICATED_LISTS = (
+    "compu_tabs",
+    "compu_vtabs",
+    "compu_vtab_ranges",
+    "record_layouts",
+    "compu_methods",
+)
+
+
+def _rewrite(element: Any, replacements: dict[int, Any], renamed: dict[str, str]):
+    replace_references(element, replacements)
+    status_string_ref = getattr(element, "status_string_ref", None)
+    if status_string_ref in renamed:
+        element.status_string_ref = renamed[status_string_ref]
+
+
+def deduplicate(module: A2LModule) -> dict[str, str]:
+    """Collapses structurally identical compu methods, tables and record layouts.
+
+    Name and description are ignored when comparing. The first definition survives
+    and all references are rewritten to it. Returns a mapping of removed names to the
+    name of the surviving element.
+    """
+    replacements: dict[int, Any] = {}
+    renamed: dict[str, str] = {}
+    removed = []
+
+    for list_name in DEDUPLICATED_LISTS:
+        survivors: dict[str, Any] = {}
+        for element in getattr(module, list_name):
+            _rewrite(element, replacements, renamed)
+            key = structural_hash(element, exclude=("name", "description"))
+            survivor = survivors.setdefault(key, element)
+            if survivor is not element:
+                replacements[id(element)] = survivor
+                renamed[element.name] = survivor.name
+                removed.append(element)
+
+    if not removed:
+        return renamed
+
+    for element in module.global_list:
+        _rewrite(element, replacements, renamed)
+    module.remove_elements(removed)
+    return renamed
@@ -0,0 +1,136 @@
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+from typing import Any
+
+from ..model.hashing import canonical_form, structural_hash
+from ..model.project_model import A2LModule, element_list_name
+
+# elements are identified by the module list holding them and their name, unnamed
+# elements like MOD_COMMON, MOD_PAR and A2ML by their position in the list, "#0"
+ElementKey = tuple[str, str]
+
+
+@dataclass
+class FieldChange:
+    path: str
+    old: Any
+    new: Any
+
+
+@dataclass
+class A2LDiff:
+    added: list[ElementKey] = field(default_factory=list)
+    removed: list[ElementKey] = field(default_factory=list)
+    changed: dict[ElementKey, list[FieldChange]] = field(default_factory=dict)
+
+    def is_empty(self) -> bool:
+        return not self.added and not self.removed and not self.changed
+
+
+def element_key(element: Any, position: int = 0) -> ElementKey:
+    """Returns the key of element, position is its index in the list of the module."""
+    name = getattr(element, "name", None)
+    return element_list_name(element), f"#{position}" if name is None else name
+
+
+def find_unnamed(module: A2LModule, key: ElementKey) -> Any:
+    """Returns the unnamed element of key, None if the module has none there."""
+    kind, name = key
+    elements = getattr(module, kind, [])
+    position = int(name[1:])
+    return elements[position] if position < len(elements) else None
+
+
+def _keyed_elements(module: A2LModule):
+    positions: dict[str, dict[int, int]] = {}
+    for element in module.global_list:
+        position = 0
+        if getattr(element, "name", None) is None:
+            list_name = element_list_name(element)
+            if list_name not in positions:
+                positions[list_name] = {
+                    id(e): i for i, e in enumerate(getattr(module, list_name))
+                }
+            position = positions[list_name][id(element)]
+        yield element_key(element, position), element
+
+
+def module_elements(module: A2LModule) -> dict[ElementKey, Any]:
+    return dict(_keyed_elements(module))
+
+
+def module_hashes(module: A2LModule) -> dict[ElementKey, str]:
+    return {key: structural_hash(e) for key, e in _keyed_elements(module)}
+
+
+def write_hashes(hashes: dict[ElementKey, str], path: Path):
+    with path.open("w", encoding="utf-8") as f:
+        json.dump([[*key, h] for key, h in hashes.items()], f)
+
+
+def read_hashes(path: Path) -> dict[ElementKey, str]:
+    with path.open("r", encoding="utf-8") as f:
+        return {(kind, name): h for kind, name, h in json.load(f)}
+
+
+def diff_hashes(old: dict[ElementKey, str], new: dict[ElementKey, str]) -> A2LDiff:
+    """Compares two hash maps, changed elements get no field details."""
+    diff = A2LDiff()
+    diff.removed = [key for key in old if key not in new]
+    for key, h in new.items():
+        old_hash = old.get(key)
+        if old_hash is None:
+            diff.added.append(key)
+        elif old_hash != h:
+            diff.changed[key] = []
+    return diff
+
+
+def _compare(path: str, old: Any, new: Any, changes: list[FieldChange]):
+    if old == new:
+        return
+    if (
+        isinstance(old, dict)
+        and isinstance(new, dict)
+        and "type" in old
+        and old["type"] == new.get("type")
+    ):
+        for key in old:
+            _compare(f"{path}.{key}" if path else key, old[key], new[key], changes)
+    elif isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        for i, (o, n) in enumerate(zip(old, new)):
+            _compare(f"{path}[{i}]", o, n, changes)
+    else:
+        changes.append(FieldChange(path, old, new))
+
+
+def field_changes(old: Any, new: Any) -> list[FieldChange]:
+    """Returns the differing fields of two elements, references compare by name."""
+    changes = []
+    _compare("", canonical_form(old), canonical_form(new), changes)
+    return changes
+
+
+def diff_modules(
+    old: A2LModule,
+    new: A2LModule,
+    old_hashes: dict[ElementKey, str] | None = None,
+    new_hashes: dict[ElementKey, str] | None = None,
+) -> A2LDiff:
+    """Matches elements by list and name and compares them by structural hash.
+
+    Precomputed hashes can be passed to skip hashing a module again.
+    """
+    if old_hashes is None:
+        old_hashes = module_hashes(old)
+    if new_hashes is None:
+        new_hashes = module_hashes(new)
+
+    diff = diff_hashes(old_hashes, new_hashes)
+    if diff.changed:
+        old_elements = module_elements(old)
+        new_elements = module_elements(new)
+        for key in diff.changed:
+            diff.changed[key] = field_changes(old_elements[key], new_elements[key])
+    return diff
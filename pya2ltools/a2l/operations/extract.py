@@ -0,0 +1,74 @@
+from typing import Any, Iterable
+
+from ..model.project_model import A2LModule, element_list_name
+from ..model.references import iter_references
+
+# module wide definitions every extracted module keeps
+SHARED_LISTS = ("a2ml", "mod_common", "mod_par", "if_data")
+
+# definitions are written before the elements using them
+LIST_ORDER = (
+    "record_layouts",
+    "compu_tabs",
+    "compu_vtabs",
+    "compu_vtab_ranges",
+    "compu_methods",
+    "typedef_structures",
+    "typedef_axes",
+    "measurements",
+    "axis_pts",
+    "characteristics",
+    "blobs",
+    "instances",
+    "transformers",
+    "functions",
+    "groups",
+)
+
+
+def dependency_closure(module: A2LModule, elements: Iterable[Any]) -> list[Any]:
+    """Returns elements and everything they reference, directly or indirectly.
+
+    Only the closure is visited, so the cost does not depend on the module size.
+    """
+    lookup = module.get_reference_dict()
+    closure = list(elements)
+    seen = {id(e) for e in closure}
+    stack = list(closure)
+    while stack:
+        for referenced in iter_references(stack.pop(), lookup):
+            if id(referenced) not in seen:
+                seen.add(id(referenced))
+                closure.append(referenced)
+                stack.append(referenced)
+    return closure
+
+
+def create_submodule(module: A2LModule, elements: Iterable[Any]) -> A2LModule:
+    """Creates a module with the given elements and the shared module definitions.
+
+    The elements are not copied, the new module shares them with module.
+    """
+    order = {list_name: i for i, list_name in enumerate(LIST_ORDER)}
+    elements = sorted(elements, key=lambda e: order[element_list_name(e)])
+
+    submodule = A2LModule(name=module.name, description=module.description)
+    for list_name in SHARED_LISTS:
+        submodule.add_elements(getattr(module, list_name))
+    submodule.add_elements(elements)
+    return submodule
+
+
+def extract(module: A2LModule, names: Iterable[str]) -> A2LModule:
+    """Extracts the named elements and all their dependencies into a new module.
+
+    Names can refer to characteristics, measurements, groups, functions or any other
+    named element.
+    """
+    lookup = module.get_reference_dict()
+    seeds = []
+    for name in names:
+        if lookup.get(name) is None:
+            raise ValueError(f"Element {name} not found in module {module.name}")
+        seeds.append(lookup[name])
+    return create_submodule(module, dependency_closure(module, seeds))
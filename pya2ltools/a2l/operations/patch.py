@@ -0,0 +1,108 @@
+from dataclasses import asdict, dataclass
+import json
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from ..model.project_model import A2LModule
+from ..model.references import replace_references
+from ..reader.reader import read_elements
+from ..writer.writer import write_element
+from .diff import A2LDiff, find_unnamed, module_elements
+
+ADD = "add"
+REMOVE = "remove"
+REPLACE = "replace"
+
+
+@dataclass
+class PatchOperation:
+    op: str
+    kind: str
+    name: str
+    text: str | None = None
+
+
+def create_patch(diff: A2LDiff, new: A2LModule) -> list[PatchOperation]:
+    """Creates the operations turning the old module of diff into new."""
+    elements = module_elements(new)
+    operations = [PatchOperation(REMOVE, kind, name) for kind, name in diff.removed]
+    for op, keys in ((ADD, diff.added), (REPLACE, diff.changed)):
+        for kind, name in keys:
+            text = write_element(elements[(kind, name)])
+            operations.append(PatchOperation(op, kind, name, text))
+    return operations
+
+
+def write_patch(operations: Iterable[PatchOperation], path: Path):
+    with path.open("w", encoding="utf-8") as f:
+        for operation in operations:
+            f.write(json.dumps(asdict(operation)) + "\n")
+
+
+def read_patch(path: Path) -> Iterator[PatchOperation]:
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield PatchOperation(**json.loads(line))
+
+
+def _parse_element(operation: PatchOperation) -> Any:
+    elements = read_elements(operation.text)
+    if len(elements) != 1:
+        raise ValueError(
+            f"Expected one element for {operation.kind} {operation.name}, got {len(elements)}"
+        )
+    return elements[0]
+
+
+def apply_patch(module: A2LModule, operations: Iterable[PatchOperation]):
+    """Applies patch operations to module.
+
+    Elements are looked up by name, unnamed elements by their position, the work
+    is proportional to the number of operations. Replaced elements of the same
+    type are updated in place so existing references stay valid. Only replacing an
+    element with one of a different type requires rewriting the references of the
+    whole module.
+    """
+    lookup = module.get_reference_dict()
+
+    def find(operation: PatchOperation) -> Any:
+        if operation.name.startswith("#"):
+            element = find_unnamed(module, (operation.kind, operation.name))
+        else:
+            element = lookup.get(operation.name)
+        if element is None:
+            raise ValueError(f"Element {operation.name} not found in {module.name}")
+        return element
+
+    removed = []
+    added = []
+    replaced = []
+    for operation in operations:
+        if operation.op == REMOVE:
+            removed.append(find(operation))
+        elif operation.op == ADD:
+            added.append(_parse_element(operation))
+        elif operation.op == REPLACE:
+            replaced.append((find(operation), _parse_element(operation)))
+        else:
+            raise ValueError(f"Unknown patch operation {operation.op}")
+
+    module.remove_elements(removed)
+    module.add_elements(added)
+    for element in added + [new for _, new in replaced]:
+        if hasattr(element, "resolve_references"):
+            element.resolve_references(lookup)
+
+    swapped = []
+    for old, new in replaced:
+        if type(old) is type(new):
+            vars(old).update(vars(new))
+        else:
+            swapped.append((old, new))
+
+    if swapped:
+        module.replace_elements(swapped)
+        replacements = {id(old): new for old, new in swapped}
+        for element in module.global_list:
+            replace_references(element, replacements)
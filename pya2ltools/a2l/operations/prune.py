@@ -0,0 +1,38 @@
+from ..model.project_model import A2LModule
+from ..model.references import iter_references
+
+PRUNED_LISTS = (
+    "compu_methods",
+    "compu_tabs",
+    "compu_vtabs",
+    "compu_vtab_ranges",
+    "record_layouts",
+)
+
+
+def prune(module: A2LModule) -> dict[str, int]:
+    """Removes compu methods, tables and record layouts nothing refers to.
+
+    All other elements are roots of the reference graph, everything not reachable
+    from them is dropped. Returns the number of removed elements per list.
+    """
+    prunable = {id(e) for list_name in PRUNED_LISTS for e in getattr(module, list_name)}
+    roots = [e for e in module.global_list if id(e) not in prunable]
+
+    reachable = {id(e) for e in roots}
+    lookup = module.get_reference_dict()
+    stack = roots
+    while stack:
+        for referenced in iter_references(stack.pop(), lookup):
+            if id(referenced) not in reachable:
+                reachable.add(id(referenced))
+                stack.append(referenced)
+
+    removed = []
+    counts = {}
+    for list_name in PRUNED_LISTS:
+        unused = [e for e in getattr(module, list_name) if id(e) not in reachable]
+        removed += unused
+        counts[list_name] = len(unused)
+    module.remove_elements(removed)
+    return counts
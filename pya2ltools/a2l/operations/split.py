@@ -0,0 +1,60 @@
+from typing import Any
+
+from ..model.project_model import A2LModule
+from .extract import create_submodule, dependency_closure
+
+UNASSIGNED_SHARD = "_unassigned"
+
+
+def _top_level(elements: list[Any], children: str) -> list[Any]:
+    referenced = {id(c) for e in elements for c in getattr(e, children)}
+    return [e for e in elements if id(e) not in referenced]
+
+
+def group_seeds(module: A2LModule) -> dict[str, list[Any]]:
+    roots = [g for g in module.groups if g.root]
+    if not roots:
+        roots = _top_level(module.groups, "sub_groups")
+    return {g.name: [g] for g in roots}
+
+
+def function_seeds(module: A2LModule) -> dict[str, list[Any]]:
+    return {f.name: [f] for f in _top_level(module.functions, "sub_functions")}
+
+
+def prefix_seeds(module: A2LModule, separator: str = ".") -> dict[str, list[Any]]:
+    seeds: dict[str, list[Any]] = {}
+    for element in module.get_addressable_objects():
+        seeds.setdefault(element.name.split(separator, 1)[0], []).append(element)
+    return seeds
+
+
+def split(module: A2LModule, by: str, separator: str = ".") -> dict[str, A2LModule]:
+    """Partitions module into shards by root GROUP, top level FUNCTION or name prefix.
+
+    Every shard contains the dependency closure of its seeds, so shards can be read
+    on their own. Addressable objects, groups and functions not covered by any shard
+    end up in an extra shard, so together the shards hold the whole module.
+    """
+    if by == "group":
+        seeds = group_seeds(module)
+    elif by == "function":
+        seeds = function_seeds(module)
+    elif by == "prefix":
+        seeds = prefix_seeds(module, separator)
+    else:
+        raise ValueError(f"Unknown split criterion {by}")
+
+    closures = {name: dependency_closure(module, s) for name, s in seeds.items()}
+    covered = {id(e) for closure in closures.values() for e in closure}
+    unassigned = [
+        e
+        for e in module.get_addressable_objects() + module.groups + module.functions
+        if id(e) not in covered
+    ]
+    if unassigned:
+        closures[UNASSIGNED_SHARD] = dependency_closure(module, unassigned)
+
+    return {
+        name: create_submodule(module, closure) for name, closure in closures.items()
+    }
@@ -266,15 +266,8 @@ def typedef_axis(tokens: Lexer) -> Tuple[dict, Lexer]:
     return {"typedef_axes": [A2LTypedefAxis(**params)]}, tokens
 
 
-def module(tokens: Lexer) -> Tuple[dict, Lexer]:
-    if tokens[0] != "MODULE":
-        raise Exception("MODULE expected, got " + tokens[0])
-
-    params = DictWithIndex()
-    params["name"] = tokens[1]
-    params["description"], tokens = parse_string(tokens[2:])
-
-    parser: Parser = {
+def module_element_parser() -> Parser:
+    return {
         "/begin": lambda x: ({}, x[1:]),
         "MOD_PAR": mod_par,
         "MOD_COMMON": mod_common,
@@ -298,8 +291,17 @@ def module(tokens: Lexer) -> Tuple[dict, Lexer]:
         "A2ML": a2ml,
     }
 
+
+def module(tokens: Lexer) -> Tuple[dict, Lexer]:
+    if tokens[0] != "MODULE":
+        raise Exception("MODULE expected, got " + tokens[0])
+
+    params = DictWithIndex()
+    params["name"] = tokens[1]
+    params["description"], tokens = parse_string(tokens[2:])
+
     tokens = parse_with_lexer(
-        parser=parser, name="MODULE", tokens=tokens, params=params
+        parser=module_element_parser(), name="MODULE", tokens=tokens, params=params
     )
     return {"modules": [A2LModule(**params, global_list=params.global_list)]}, tokens
 
@@ -687,6 +689,7 @@ def record_layout(tokens: Lexer) -> Tuple[Any, Lexer]:
         "NO_RESCALE_X": no_axis_value,
         "RESERVED": no_axis_value,
         "AXIS_RESCALE_X": rescale_axis,
+        "STATIC_RECORD_LAYOUT": lambda x: ({"static_record_layout": True}, x[1:]),
     }
 
     tokens = parse_with_lexer(
@@ -1072,3 +1075,17 @@ def read_a2l(path: Path) -> A2lFile:
     )
 
     return A2lFile(**params)
+
+
+def read_elements(text: str) -> list[Any]:
+    """Parses module elements, references in the elements are not resolved."""
+    tokens = Lexer.from_string(text)
+
+    params = DictWithIndex()
+    parse_with_lexer(
+        parser=module_element_parser(),
+        tokens=tokens,
+        params=params,
+        end_condition=lambda x: len(x) == 0,
+    )
+    return params.get_global_list()
@@ -0,0 +1,69 @@
+from argparse import ArgumentParser
+from functools import partial
+from pathlib import Path
+from a2l.reader.reader import read_a2l
+from a2l.calibration.statistics import fleet_statistics, write_statistics
+from image.reader import read_image
+
+
+def subcommand_calibration_statistics(parser: ArgumentParser):
+    parser.add_argument(
+        "--a2l_file", help="A2L file shared by the images", required=True, type=Path
+    )
+    parser.add_argument(
+        "--image_files",
+        "--hex_files",
+        help="Images to compute statistics over",
+        required=True,
+        nargs="+",
+        type=Path,
+    )
+    parser.add_argument(
+        "--base_address",
+        help="Address of the first byte of binary files",
+        default=0,
+        type=lambda x: int(x, 0),
+    )
+    parser.add_argument("--workers", help="Number of processes", default=None, type=int)
+    parser.add_argument(
+        "--outlier_share",
+        help="Values held by at most this share of the images are outliers",
+        default=0.1,
+        type=float,
+    )
+    parser.add_argument(
+        "--output", help="Output file (CSV or .npz)", required=True, type=Path
+    )
+    parser.set_defaults(func=calibration_statistics)
+
+
+def load_segments(path: Path, base_address: int = 0):
+    return read_image(path, base_address).segments
+
+
+def calibration_statistics(
+    a2l_file: Path,
+    image_files: list[Path],
+    output: Path,
+    base_address: int = 0,
+    workers: int = None,
+    outlier_share: float = 0.1,
+):
+    print(f"Computing statistics of {len(image_files)} images")
+    a2l = read_a2l(a2l_file)
+    modules = a2l.project.modules
+    for module in modules:
+        fleet, unsupported = fleet_statistics(
+            module,
+            image_files,
+            partial(load_segments, base_address=base_address),
+            workers,
+            outlier_share,
+        )
+        if unsupported:
+            print(f"Unsupported record layout: {', '.join(unsupported)}")
+        path = output
+        if len(modules) > 1:
+            path = output.with_stem(f"{output.stem}_{module.name}")
+        write_statistics(fleet, path)
+        print(f"Wrote statistics of {len(fleet.names)} objects to {path}")
@@ -0,0 +1,28 @@
+from argparse import ArgumentParser
+from pathlib import Path
+from a2l.reader.reader import read_a2l
+from a2l.writer.writer import write_a2l_file
+from a2l.operations.deduplicate import deduplicate
+
+
+def subcommand_deduplicate_a2l(parser: ArgumentParser):
+    parser.add_argument(
+        "--a2l_file", help="A2L file to deduplicate", required=True, type=Path
+    )
+    parser.add_argument("--output", help="Output file", required=False, type=Path)
+    parser.set_defaults(func=deduplicate_a2l)
+
+
+def deduplicate_a2l(a2l_file: Path, output: Path = None):
+    if output is None:
+        output = a2l_file
+
+    print(f"Deduplicating A2L file {a2l_file}")
+    a2l = read_a2l(a2l_file)
+
+    for module in a2l.project.modules:
+        renamed = deduplicate(module)
+        for name, survivor in renamed.items():
+            print(f"{name} -> {survivor}")
+        print(f"Removed {len(renamed)} duplicate elements from module {module.name}")
+    write_a2l_file(a2l, output)
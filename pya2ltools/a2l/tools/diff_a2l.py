@@ -0,0 +1,97 @@
+from argparse import ArgumentParser
+import hashlib
+import json
+from pathlib import Path
+from a2l.reader.reader import read_a2l
+from a2l.operations.diff import (
+    A2LDiff,
+    diff_modules,
+    module_hashes,
+    read_hashes,
+    write_hashes,
+)
+from a2l.operations.patch import create_patch, write_patch
+
+
+def subcommand_diff_a2l(parser: ArgumentParser):
+    parser.add_argument("--old", help="Old A2L file", required=True, type=Path)
+    parser.add_argument("--new", help="New A2L file", required=True, type=Path)
+    parser.add_argument(
+        "--hash_cache",
+        help="Directory to store and reuse element hashes",
+        required=False,
+        type=Path,
+    )
+    parser.add_argument(
+        "--patch",
+        help="Write a patch turning the old into the new file",
+        required=False,
+        type=Path,
+    )
+    parser.set_defaults(func=diff_a2l)
+
+
+def file_digest(a2l_file: Path, hash_cache: Path | None) -> str | None:
+    if hash_cache is None:
+        return None
+    return hashlib.sha256(a2l_file.read_bytes()).hexdigest()
+
+
+def get_hashes(module, digest: str | None, hash_cache: Path | None):
+    if hash_cache is None:
+        return module_hashes(module)
+
+    cache_file = hash_cache / f"{digest}_{module.name}.json"
+    if cache_file.exists():
+        return read_hashes(cache_file)
+    hashes = module_hashes(module)
+    hash_cache.mkdir(parents=True, exist_ok=True)
+    write_hashes(hashes, cache_file)
+    return hashes
+
+
+def print_diff(diff: A2LDiff):
+    for kind, name in diff.added:
+        print(f"+ {kind} {name}")
+    for kind, name in diff.removed:
+        print(f"- {kind} {name}")
+    for (kind, name), changes in diff.changed.items():
+        print(f"~ {kind} {name}")
+        for change in changes:
+            # an empty path means the element type changed
+            print(
+                f"    {change.path or 'type'}: {json.dumps(change.old)} -> {json.dumps(change.new)}"
+            )
+
+
+def diff_a2l(old: Path, new: Path, hash_cache: Path = None, patch: Path = None):
+    old_a2l = read_a2l(old)
+    new_a2l = read_a2l(new)
+
+    old_digest = file_digest(old, hash_cache)
+    new_digest = file_digest(new, hash_cache)
+
+    new_modules = {module.name: module for module in new_a2l.project.modules}
+    old_names = {module.name for module in old_a2l.project.modules}
+    for old_module in old_a2l.project.modules:
+        new_module = new_modules.get(old_module.name)
+        if new_module is None:
+            print(f"- MODULE {old_module.name}")
+            continue
+        print(f"MODULE {old_module.name}")
+        diff = diff_modules(
+            old_module,
+            new_module,
+            get_hashes(old_module, old_digest, hash_cache),
+            get_hashes(new_module, new_digest, hash_cache),
+        )
+        print_diff(diff)
+        print(
+            f"{len(diff.added)} added, {len(diff.removed)} removed, {len(diff.changed)} changed"
+        )
+        # like merging, patches only cover the first module
+        if patch is not None and old_module is old_a2l.project.modules[0]:
+            write_patch(create_patch(diff, new_module), patch)
+    for new_module in new_a2l.project.modules:
+        if new_module.name not in old_names:
+            print(f"+ MODULE {new_module.name}")
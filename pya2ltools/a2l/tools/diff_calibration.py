@@ -0,0 +1,62 @@
+from argparse import ArgumentParser
+from pathlib import Path
+import numpy as np
+from a2l.reader.reader import read_a2l
+from a2l.calibration.diff import CalibrationComparator, write_differences
+from image.reader import read_image
+
+
+def subcommand_diff_calibration(parser: ArgumentParser):
+    parser.add_argument(
+        "--a2l_file", help="A2L file shared by the images", required=True, type=Path
+    )
+    parser.add_argument(
+        "--image_files",
+        "--hex_files",
+        help="Images to compare with the first one",
+        required=True,
+        nargs="+",
+        type=Path,
+    )
+    parser.add_argument(
+        "--base_address",
+        help="Address of the first byte of binary files",
+        default=0,
+        type=lambda x: int(x, 0),
+    )
+    parser.add_argument(
+        "--output", help="Output file (JSON Lines)", required=False, type=Path
+    )
+    parser.set_defaults(func=diff_calibration)
+
+
+def diff_calibration(
+    a2l_file: Path, image_files: list[Path], output: Path = None, base_address: int = 0
+):
+    if len(image_files) < 2:
+        raise ValueError("At least two images are required")
+    a2l = read_a2l(a2l_file)
+    images = [
+        read_image(image_file, base_address).segments for image_file in image_files
+    ]
+
+    differences = []
+    for module in a2l.project.modules:
+        comparator = CalibrationComparator(module)
+        differences += comparator.compare(images)
+        if comparator.missing:
+            print(f"Not in every image: {', '.join(comparator.missing)}")
+        if comparator.unsupported:
+            print(f"Unsupported record layout: {', '.join(comparator.unsupported)}")
+
+    for difference in differences:
+        changes = []
+        for image_file, delta in zip(image_files[1:], difference.deltas[1:]):
+            if delta is None:
+                changes.append(f"{image_file.name}: changed")
+            elif np.any(delta):
+                changes.append(f"{image_file.name}: {np.max(np.abs(delta)):g}")
+        print(f"{difference.name} ({', '.join(changes)})")
+    print(f"{len(differences)} changed")
+    if output is not None:
+        write_differences(differences, output)
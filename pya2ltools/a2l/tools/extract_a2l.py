@@ -0,0 +1,36 @@
+from argparse import ArgumentParser
+import dataclasses
+from pathlib import Path
+from a2l.reader.reader import read_a2l
+from a2l.writer.writer import write_a2l_file
+from a2l.operations.extract import extract
+
+
+def subcommand_extract_a2l(parser: ArgumentParser):
+    parser.add_argument(
+        "--a2l_file", help="A2L file to extract from", required=True, type=Path
+    )
+    parser.add_argument(
+        "--names",
+        help="Characteristics, groups or functions to extract",
+        required=True,
+        nargs="+",
+    )
+    parser.add_argument("--output", help="Output file", required=True, type=Path)
+    parser.set_defaults(func=extract_a2l)
+
+
+def extract_a2l(a2l_file: Path, names: list[str], output: Path):
+    print(f"Extracting {names} from A2L file {a2l_file}")
+    a2l = read_a2l(a2l_file)
+
+    modules = []
+    for module in a2l.project.modules:
+        submodule = extract(module, names)
+        print(
+            f"Extracted {len(submodule.global_list)} of {len(module.global_list)} elements from module {module.name}"
+        )
+        modules.append(submodule)
+
+    project = dataclasses.replace(a2l.project, modules=modules)
+    write_a2l_file(dataclasses.replace(a2l, project=project), output)
@@ -0,0 +1,108 @@
+from argparse import ArgumentParser
+from pathlib import Path
+from a2l.reader.reader import read_a2l
+from a2l.calibration.migration import MigrationReport, migrate_calibration
+from a2l.tools.update_a2l import update_addresses
+from dwarf.reader import DwarfInfo
+from image.reader import read_image
+from image.writer import write_image
+
+
+def subcommand_migrate_calibration(parser: ArgumentParser):
+    parser.add_argument(
+        "--a2l_file", help="A2L file of the old software", required=True, type=Path
+    )
+    parser.add_argument(
+        "--image_file",
+        "--hex_file",
+        help="Image of the old software holding the calibration",
+        required=True,
+        type=Path,
+    )
+    parser.add_argument(
+        "--new_a2l_file",
+        help="A2L file of the new software, by default the old one with the "
+        "addresses of --new_elf_file",
+        type=Path,
+    )
+    parser.add_argument(
+        "--new_elf_file",
+        help="ELF file of the new software",
+        type=Path,
+    )
+    parser.add_argument(
+        "--new_image_file",
+        "--new_hex_file",
+        help="Image of the new software, by default --new_elf_file",
+        type=Path,
+    )
+    parser.add_argument(
+        "--base_address",
+        help="Address of the first byte of binary files",
+        default=0,
+        type=lambda x: int(x, 0),
+    )
+    parser.add_argument(
+        "--output",
+        help="Migrated image, the format is chosen by its suffix",
+        required=True,
+        type=Path,
+    )
+    parser.set_defaults(func=migrate)
+
+
+def migrate(
+    a2l_file: Path,
+    image_file: Path,
+    output: Path,
+    new_a2l_file: Path = None,
+    new_elf_file: Path = None,
+    new_image_file: Path = None,
+    base_address: int = 0,
+):
+    if new_a2l_file is None and new_elf_file is None:
+        raise ValueError("Either --new_a2l_file or --new_elf_file is required")
+    if new_image_file is None:
+        if new_elf_file is None:
+            raise ValueError("Either --new_image_file or --new_elf_file is required")
+        new_image_file = new_elf_file
+
+    print(f"Migrating calibration data from {image_file} to {new_image_file}")
+    old_a2l = read_a2l(a2l_file)
+    if new_a2l_file is not None:
+        new_a2l = read_a2l(new_a2l_file)
+    else:
+        new_a2l = read_a2l(a2l_file)
+        dwarf_info = DwarfInfo.from_elffile(new_elf_file)
+        for module in new_a2l.project.modules:
+            update_addresses(module, dwarf_info)
+    old_image = read_image(image_file, base_address)
+    new_image = read_image(new_image_file, base_address)
+
+    new_modules = {module.name: module for module in new_a2l.project.modules}
+    for old_module in old_a2l.project.modules:
+        new_module = new_modules.get(old_module.name)
+        if new_module is None:
+            print(f"Module {old_module.name} not in new A2L file")
+            continue
+        report = migrate_calibration(
+            old_module, old_image.read, new_module, new_image.segments
+        )
+        print_report(report)
+
+    write_image(new_image, output)
+    print(f"Wrote {output}")
+
+
+def print_report(report: MigrationReport):
+    print(f"Copied {len(report.copied)} values")
+    for title, names in [
+        ("Not in new A2L file", report.removed),
+        ("Only in new A2L file", report.added),
+        ("Changed kind or dimensions", report.incompatible),
+        ("Not in image", report.missing),
+        ("Unsupported record layout", report.unsupported),
+        ("No raw value in new A2L file", report.unconvertible),
+    ]:
+        if names:
+            print(f"{title}: {', '.join(names)}")
@@ -0,0 +1,26 @@
+from argparse import ArgumentParser
+from pathlib import Path
+from a2l.reader.reader import read_a2l
+from a2l.writer.writer import write_a2l_file
+from a2l.operations.patch import apply_patch, read_patch
+
+
+def subcommand_patch_a2l(parser: ArgumentParser):
+    parser.add_argument(
+        "--a2l_file", help="A2L file to patch", required=True, type=Path
+    )
+    parser.add_argument(
+        "--patch", help="Patch file created by diff_a2l", required=True, type=Path
+    )
+    parser.add_argument("--output", help="Output file", required=False, type=Path)
+    parser.set_defaults(func=patch_a2l)
+
+
+def patch_a2l(a2l_file: Path, patch: Path, output: Path = None):
+    if output is None:
+        output = a2l_file
+
+    print(f"Applying patch {patch} to A2L file {a2l_file}")
+    a2l = read_a2l(a2l_file)
+    apply_patch(a2l.project.modules[0], read_patch(patch))
+    write_a2l_file(a2l, output)
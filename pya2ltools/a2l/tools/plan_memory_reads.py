@@ -0,0 +1,41 @@
+from argparse import ArgumentParser
+from pathlib import Path
+from a2l.reader.reader import read_a2l
+from a2l.calibration.readout import CalibrationReader
+from a2l.calibration.read_plan import create_read_plan
+
+
+def subcommand_plan_memory_reads(parser: ArgumentParser):
+    parser.add_argument(
+        "--a2l_file", help="A2L file to plan reads for", required=True, type=Path
+    )
+    parser.add_argument(
+        "--max_gap",
+        help="Maximum number of unused bytes inside a block",
+        default=16,
+        type=int,
+    )
+    parser.add_argument(
+        "--max_block_size", help="Maximum size of a block", default=4096, type=int
+    )
+    parser.set_defaults(func=plan_memory_reads)
+
+
+def plan_memory_reads(a2l_file: Path, max_gap: int = 16, max_block_size: int = 4096):
+    print(f"Planning memory reads for A2L file {a2l_file}")
+    a2l = read_a2l(a2l_file)
+
+    for module in a2l.project.modules:
+        plan = create_read_plan(
+            CalibrationReader(module), max_gap=max_gap, max_block_size=max_block_size
+        )
+        for block in plan.blocks:
+            print(
+                f"0x{block.address:08X} {block.size:6} bytes {len(block.elements)} objects"
+            )
+        print(
+            f"Module {module.name}: {plan.element_count} objects in "
+            f"{len(plan.blocks)} blocks, {plan.size} bytes"
+        )
+        if plan.unsupported:
+            print(f"Unsupported record layout: {', '.join(plan.unsupported)}")
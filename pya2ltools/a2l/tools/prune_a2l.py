@@ -0,0 +1,28 @@
+from argparse import ArgumentParser
+from pathlib import Path
+from a2l.reader.reader import read_a2l
+from a2l.writer.writer import write_a2l_file
+from a2l.operations.prune import prune
+
+
+def subcommand_prune_a2l(parser: ArgumentParser):
+    parser.add_argument(
+        "--a2l_file", help="A2L file to prune", required=True, type=Path
+    )
+    parser.add_argument("--output", help="Output file", required=False, type=Path)
+    parser.set_defaults(func=prune_a2l)
+
+
+def prune_a2l(a2l_file: Path, output: Path = None):
+    if output is None:
+        output = a2l_file
+
+    print(f"Pruning unreferenced elements from A2L file {a2l_file}")
+    a2l = read_a2l(a2l_file)
+
+    for module in a2l.project.modules:
+        counts = prune(module)
+        for list_name, count in counts.items():
+            print(f"{list_name}: removed {count}")
+        print(f"Removed {sum(counts.values())} elements from module {module.name}")
+    write_a2l_file(a2l, output)
@@ -1,8 +1,10 @@
 from argparse import ArgumentParser
+import itertools
 from pathlib import Path
-import struct
 from a2l.reader.reader import read_a2l
-from intelhex import IntelHex
+from a2l.calibration.readout import CalibrationReader
+from a2l.calibration.data_file import SUFFIXES, write_values
+from image.reader import read_image
 
 
 def subcommand_read_calibration_data(parser: ArgumentParser):
@@ -10,24 +12,56 @@ def subcommand_read_calibration_data(parser: ArgumentParser):
         "--a2l_file", help="A2L file to create Data Model for", required=True, type=Path
     )
     parser.add_argument(
+        "--image_file",
         "--hex_file",
-        help="Hex file to read data from",
+        help="Intel HEX, S-record, ELF or binary file to read data from",
         required=True,
         type=Path,
     )
-    parser.add_argument("--output", help="Output file", required=True, type=Path)
+    parser.add_argument(
+        "--base_address",
+        help="Address of the first byte of a binary file",
+        default=0,
+        type=lambda x: int(x, 0),
+    )
+    parser.add_argument(
+        "--output",
+        help="Output file (DCM, CSV or JSON Lines, chosen by suffix)",
+        required=True,
+        type=Path,
+    )
+    parser.add_argument(
+        "--format",
+        help="Output format instead of the one of the suffix",
+        choices=sorted(set(SUFFIXES.values())),
+        default=None,
+    )
     parser.set_defaults(func=create_calibration_data)
 
 
-def create_calibration_data(a2l_file: Path, hex_file: Path, output: Path = None):
-    if output is None:
-        output = a2l_file
-
-    print(f"Creating calibration data from A2L file {a2l_file} and hex file {hex_file}")
+def create_calibration_data(
+    a2l_file: Path,
+    image_file: Path,
+    output: Path,
+    base_address: int = 0,
+    format: str = None,
+):
+    print(f"Creating calibration data from A2L file {a2l_file} and image {image_file}")
     a2l = read_a2l(a2l_file)
-    hex = IntelHex(str(hex_file))
+    image = read_image(image_file, base_address)
 
-    for module in a2l.project.modules:
-        for c in module.get_addressable_objects():
-            var = struct.unpack(">B", hex.gets(c.ecu_address, 1))[0]
-            print(f"{c.name} = {var}")
+    readers = [CalibrationReader(module) for module in a2l.project.modules]
+    values = itertools.chain.from_iterable(
+        reader.read(image.segments) for reader in readers
+    )
+    axis_pts = {axis.name for module in a2l.project.modules for axis in module.axis_pts}
+    skipped = []
+    count = write_values(values, output, format, axis_pts, skipped)
+    print(f"Wrote {count} values to {output}")
+    if skipped:
+        print(f"Not representable in {output}: {', '.join(skipped)}")
+    for reader in readers:
+        if reader.missing:
+            print(f"Not in image: {', '.join(reader.missing)}")
+        if reader.unsupported:
+            print(f"Unsupported record layout: {', '.join(reader.unsupported)}")
@@ -0,0 +1,49 @@
+from argparse import ArgumentParser
+from pathlib import Path
+from a2l.reader.reader import read_a2l
+from a2l.calibration.checksum import ALGORITHMS, segment_checksums
+from image.reader import read_image
+
+
+def subcommand_segment_checksums(parser: ArgumentParser):
+    parser.add_argument(
+        "--a2l_file", help="A2L file with MEMORY_SEGMENTs", required=True, type=Path
+    )
+    parser.add_argument(
+        "--image_file",
+        "--hex_file",
+        help="Intel HEX, S-record, ELF or binary file",
+        required=True,
+        type=Path,
+    )
+    parser.add_argument(
+        "--algorithm", help="Checksum algorithm", choices=ALGORITHMS, required=True
+    )
+    parser.add_argument(
+        "--program_types",
+        help="Program types of the memory segments, e.g. CALIBRATION_VARIABLES",
+        nargs="*",
+        default=None,
+    )
+    parser.add_argument(
+        "--base_address",
+        help="Address of the first byte of a binary file",
+        default=0,
+        type=lambda x: int(x, 0),
+    )
+    parser.set_defaults(func=print_segment_checksums)
+
+
+def print_segment_checksums(
+    a2l_file: Path,
+    image_file: Path,
+    algorithm: str,
+    program_types: list[str] = None,
+    base_address: int = 0,
+):
+    a2l = read_a2l(a2l_file)
+    image = read_image(image_file, base_address)
+    for module in a2l.project.modules:
+        checksums = segment_checksums(module, image.segments, algorithm, program_types)
+        for name, value in checksums.items():
+            print(f"{name}: {'not in image' if value is None else hex(value)}")
@@ -0,0 +1,59 @@
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+import dataclasses
+from pathlib import Path
+from a2l.reader.reader import read_a2l
+from a2l.writer.writer import write_a2l_file
+from a2l.operations.split import split
+
+
+def subcommand_split_a2l(parser: ArgumentParser):
+    parser.add_argument(
+        "--a2l_file", help="A2L file to split", required=True, type=Path
+    )
+    parser.add_argument(
+        "--by",
+        help="Split by root group, top level function or name prefix, what no shard "
+        "covers goes to the _unassigned shard",
+        choices=["group", "function", "prefix"],
+        default="group",
+    )
+    parser.add_argument(
+        "--separator", help="Separator ending the name prefix", default="."
+    )
+    parser.add_argument(
+        "--output_dir",
+        help="Directory to write the shards to",
+        required=True,
+        type=Path,
+    )
+    parser.add_argument(
+        "--jobs", help="Number of worker processes", required=False, type=int
+    )
+    parser.set_defaults(func=split_a2l)
+
+
+def split_a2l(
+    a2l_file: Path,
+    output_dir: Path,
+    by: str = "group",
+    separator: str = ".",
+    jobs: int = None,
+):
+    print(f"Splitting A2L file {a2l_file} by {by}")
+    a2l = read_a2l(a2l_file)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    files = []
+    paths = []
+    for module in a2l.project.modules:
+        for name, shard in split(module, by, separator).items():
+            if len(a2l.project.modules) > 1:
+                name = f"{module.name}_{name}"
+            project = dataclasses.replace(a2l.project, modules=[shard])
+            files.append(dataclasses.replace(a2l, project=project))
+            paths.append(output_dir / f"{name}.a2l")
+            print(f"{name}: {len(shard.global_list)} elements")
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        list(executor.map(write_a2l_file, files, paths))
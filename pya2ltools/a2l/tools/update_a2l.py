@@ -28,12 +28,19 @@ def update_a2l(a2l_file: Path, elf_file: Path, output: Path = None):
     dwarf_info: DwarfInfo = DwarfInfo.from_elffile(elf_file)
 
     for module in a2l.project.modules:
-        for c in module.get_addressable_objects():
-            name = c.name
-            offset = 0
-            if c.symbol_link is not None:
-                offset = c.symbol_link.offset
-                name = c.symbol_link.symbol_name
-            c.ecu_address = dwarf_info.get_address_by_variable_path(name) + offset
+        for c in update_addresses(module, dwarf_info):
             print(f"{c.name} = {hex(c.ecu_address)}")
     write_a2l_file(a2l, output)
+
+
+def update_addresses(module, dwarf_info: DwarfInfo) -> list:
+    """Sets the ECU addresses of the addressable objects from the debug info."""
+    objects = module.get_addressable_objects()
+    for c in objects:
+        name = c.name
+        offset = 0
+        if c.symbol_link is not None:
+            offset = c.symbol_link.offset
+            name = c.symbol_link.symbol_name
+        c.ecu_address = dwarf_info.get_address_by_variable_path(name) + offset
+    return objects
@@ -0,0 +1,127 @@
+from argparse import ArgumentParser
+from pathlib import Path
+from a2l.reader.reader import read_a2l
+from a2l.calibration.writeback import CalibrationWriter
+from a2l.calibration.data_file import SUFFIXES, read_values
+from a2l.calibration.checksum import (
+    ALGORITHMS,
+    find_checksum_location,
+    patch_checksums,
+)
+from image.reader import read_image
+from image.writer import write_image
+
+
+def subcommand_write_calibration_data(parser: ArgumentParser):
+    parser.add_argument(
+        "--a2l_file",
+        help="A2L file describing the calibration data",
+        required=True,
+        type=Path,
+    )
+    parser.add_argument(
+        "--image_file",
+        "--hex_file",
+        help="Intel HEX, S-record, ELF or binary file to write data into",
+        required=True,
+        type=Path,
+    )
+    parser.add_argument(
+        "--data_file",
+        help="Calibration data (DCM, CSV or JSON Lines, chosen by suffix)",
+        required=True,
+        type=Path,
+    )
+    parser.add_argument(
+        "--format",
+        help="Format of the data file instead of the one of the suffix",
+        choices=sorted(set(SUFFIXES.values())),
+        default=None,
+    )
+    parser.add_argument(
+        "--base_address",
+        help="Address of the first byte of a binary file",
+        default=0,
+        type=lambda x: int(x, 0),
+    )
+    parser.add_argument(
+        "--output",
+        help="Output file, the format is chosen by its suffix",
+        required=True,
+        type=Path,
+    )
+    parser.add_argument(
+        "--checksum_algorithm",
+        help="Checksum to update after writing",
+        choices=ALGORITHMS,
+        default=None,
+    )
+    parser.add_argument(
+        "--checksum_addresses",
+        help="Addresses of checksums over the MEMORY_SEGMENT containing them",
+        nargs="*",
+        default=None,
+        type=lambda x: int(x, 0),
+    )
+    parser.set_defaults(func=write_calibration_data)
+
+
+def write_calibration_data(
+    a2l_file: Path,
+    image_file: Path,
+    data_file: Path,
+    output: Path,
+    base_address: int = 0,
+    format: str = None,
+    checksum_algorithm: str = None,
+    checksum_addresses: list[int] | None = None,
+):
+    print(f"Writing calibration data from {data_file} into image {image_file}")
+    a2l = read_a2l(a2l_file)
+    image = read_image(image_file, base_address)
+
+    # the data file is streamed once per module
+    unknown = None
+    count = 0
+    for module in a2l.project.modules:
+        writer = CalibrationWriter(module)
+        count += writer.write_stream(image.segments, read_values(data_file, format))
+        if writer.missing:
+            print(f"Not in image: {', '.join(writer.missing)}")
+        if writer.unsupported:
+            print(f"Unsupported record layout: {', '.join(writer.unsupported)}")
+        module_unknown = set(writer.unknown)
+        unknown = module_unknown if unknown is None else unknown & module_unknown
+    if unknown:
+        print(f"No characteristic or AXIS_PTS: {', '.join(sorted(unknown))}")
+
+    if checksum_addresses:
+        if checksum_algorithm is None:
+            raise ValueError("--checksum_addresses needs --checksum_algorithm")
+        # every address is looked up once, in the first module containing it
+        locations = []
+        for address in dict.fromkeys(checksum_addresses):
+            for module in a2l.project.modules:
+                try:
+                    location = find_checksum_location(
+                        module, address, checksum_algorithm
+                    )
+                except ValueError:
+                    continue
+                byte_order = (
+                    module.mod_common[0].byte_order if module.mod_common else None
+                )
+                locations.append((location, byte_order))
+                break
+            else:
+                raise ValueError(
+                    f"Checksum address {address:#x} not in a MEMORY_SEGMENT"
+                )
+        for location, byte_order in locations:
+            checksums = patch_checksums(image.segments, [location], byte_order)
+            print(
+                f"Checksum at {location.address:#x} = {checksums[location.address]:#x}"
+            )
+
+    write_image(image, output)
+    print(f"Wrote {count} values to {output}")
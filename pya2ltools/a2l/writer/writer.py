@@ -1,6 +1,6 @@
 from ast import Tuple
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from ..reader.reader import measurement, record_layout
 
@@ -316,6 +316,8 @@ def write_record_layout(record_layout: A2LRecordLayout) -> str:
     fields = ""
     for field in record_layout.fields:
         fields += "\n\t\t\t\t" + writers[type(field)](field)
+    if record_layout.static_record_layout:
+        fields += "\n\t\t\t\tSTATIC_RECORD_LAYOUT"
     return template.record_layout.format(name=record_layout.name, fields=fields)
 
 
@@ -691,13 +693,26 @@ def write_element(element: Any) -> str:
     return writers[type(element)](element)
 
 
-def write_module(module: A2LModule) -> str:
-    content = "\n".join([write_element(element) for element in module.global_list])
-    return template.module.format(
+# marks where the content of a template is inserted when writing in chunks
+CONTENT_MARKER = "\0"
+
+
+def iter_module(module: A2LModule) -> Iterator[str]:
+    head, tail = template.module.format(
         name=module.name,
         description=module.description,
-        elements=content,
-    )
+        elements=CONTENT_MARKER,
+    ).split(CONTENT_MARKER)
+    yield head
+    for i, element in enumerate(module.global_list):
+        if i:
+            yield "\n"
+        yield write_element(element)
+    yield tail
+
+
+def write_module(module: A2LModule) -> str:
+    return "".join(iter_module(module))
 
 
 def write_header(header: A2LHeader) -> str:
@@ -708,27 +723,38 @@ def write_header(header: A2LHeader) -> str:
     )
 
 
-def write_project(project: A2LProject) -> str:
-    content = "".join([write_module(module) for module in project.modules])
-
-    return template.project.format(
+def iter_project(project: A2LProject) -> Iterator[str]:
+    head, tail = template.project.format(
         name=project.name,
         description=project.description,
         header=write_header(project.header) if project.header else "",
-        modules=content,
-    )
+        modules=CONTENT_MARKER,
+    ).split(CONTENT_MARKER)
+    yield head
+    for module in project.modules:
+        yield from iter_module(module)
+    yield tail
 
 
-def write_a2l_file(file: A2lFile, output_path: Path):
+def write_project(project: A2LProject) -> str:
+    return "".join(iter_project(project))
+
+
+def iter_a2l_file(file: A2lFile) -> Iterator[str]:
     major, minor = file.asap2_version.split(".")
 
-    content = template.a2l_file.format(
+    head, tail = template.a2l_file.format(
         asap2_version_major=major,
         asap2_version_minor=minor,
-        project=write_project(file.project),
-    )
+        project=CONTENT_MARKER,
+    ).split(CONTENT_MARKER)
+    yield head
+    yield from iter_project(file.project)
+    yield tail
 
-    content = content.replace("\t", "  ")
 
+def write_a2l_file(file: A2lFile, output_path: Path):
+    # written element by element, the file content is never held in memory
     with output_path.open("w", encoding="utf-8") as f:
-        f.write(content)
+        for chunk in iter_a2l_file(file):
+            f.write(chunk.replace("\t", "  "))
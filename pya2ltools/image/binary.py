@@ -0,0 +1,17 @@
+import mmap
+from pathlib import Path
+
+from .image import MemoryImage
+
+
+def read_binary(path: Path, base_address: int = 0) -> MemoryImage:
+    """Maps a raw memory dump into memory starting at base_address.
+
+    The mapping is copy on write, data is paged in when read and changes never
+    reach the file.
+    """
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return MemoryImage()
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    return MemoryImage([(base_address, buffer)])
@@ -0,0 +1,56 @@
+import mmap
+from pathlib import Path
+
+from elftools.elf.constants import SH_FLAGS
+from elftools.elf.elffile import ELFFile
+
+from .image import MemoryImage
+
+
+def elf_segments(
+    elf: ELFFile, data, physical: bool = False
+) -> list[tuple[int, object]]:
+    """Returns the initialized memory of the loadable segments of elf.
+
+    data is the content of the ELF file, segments are slices of it. Segments with
+    zero initialized memory behind the file content are copied into one buffer, so
+    objects crossing the end of the file content are read as a whole. Files without
+    program headers (object files) are read by their allocated sections.
+    """
+    view = memoryview(data)
+    segments = []
+    for segment in elf.iter_segments("PT_LOAD"):
+        address = segment["p_paddr"] if physical else segment["p_vaddr"]
+        size, memory_size = segment["p_filesz"], segment["p_memsz"]
+        offset = segment["p_offset"]
+        if memory_size > size:
+            buffer = bytearray(memory_size)
+            buffer[:size] = view[offset : offset + size]
+            segments.append((address, buffer))
+        elif size:
+            segments.append((address, view[offset : offset + size]))
+    if segments or elf.num_segments():
+        return segments
+
+    for section in elf.iter_sections():
+        if not section["sh_flags"] & SH_FLAGS.SHF_ALLOC or not section["sh_size"]:
+            continue
+        if section["sh_type"] == "SHT_NOBITS":
+            segments.append((section["sh_addr"], bytearray(section["sh_size"])))
+        else:
+            offset = section["sh_offset"]
+            segments.append(
+                (section["sh_addr"], view[offset : offset + section["sh_size"]])
+            )
+    return segments
+
+
+def read_elf(path: Path, physical: bool = False) -> MemoryImage:
+    """Maps the loadable segments of an ELF file into memory.
+
+    With physical the load addresses (LMA) are used instead of the virtual
+    addresses, e.g. to read initial values of RAM variables from flash.
+    """
+    with open(path, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    return MemoryImage(elf_segments(ELFFile(data), data, physical))
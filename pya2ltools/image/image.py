@@ -0,0 +1,86 @@
+from bisect import bisect_right
+from typing import Any
+
+import numpy as np
+
+
+class MemoryImage:
+    """Memory of an ECU as a few contiguous segments sorted by address.
+
+    Reads return memoryview slices of the segment buffers, no bytes are copied.
+    """
+
+    def __init__(self, segments: list[tuple[int, Any]] | None = None):
+        self.segments: list[tuple[int, Any]] = sorted(
+            segments or [], key=lambda segment: segment[0]
+        )
+        self._starts = [start for start, _ in self.segments]
+
+    def _find(self, address: int, size: int) -> tuple[int, Any]:
+        index = bisect_right(self._starts, address) - 1
+        if index >= 0:
+            start, buffer = self.segments[index]
+            if address + size <= start + len(buffer):
+                return start, buffer
+        raise ValueError(f"{size} bytes at 0x{address:X} not in memory image")
+
+    def contains(self, address: int, size: int = 1) -> bool:
+        try:
+            self._find(address, size)
+        except ValueError:
+            return False
+        return True
+
+    def read(self, address: int, size: int) -> memoryview:
+        start, buffer = self._find(address, size)
+        return memoryview(buffer)[address - start : address - start + size]
+
+    @property
+    def size(self) -> int:
+        return sum(len(buffer) for _, buffer in self.segments)
+
+
+def merge_segments(
+    segments: list[tuple[int, bytearray]],
+) -> list[tuple[int, bytearray]]:
+    """Sorts segments and merges adjacent and overlapping ones.
+
+    Overlapping bytes are taken from the segment starting later.
+    """
+    merged: list[tuple[int, bytearray]] = []
+    for start, data in sorted(segments, key=lambda segment: segment[0]):
+        if merged:
+            last_start, last = merged[-1]
+            end = last_start + len(last)
+            if start <= end:
+                offset = start - last_start
+                last[offset : offset + len(data)] = data
+                continue
+        merged.append((start, data))
+    return merged
+
+
+def gather_segments(
+    raw: np.ndarray, starts: np.ndarray, counts: np.ndarray, addresses: np.ndarray
+) -> list[tuple[int, bytearray]]:
+    """Extracts the data of decoded records into contiguous segments.
+
+    starts and counts locate the data of each record in raw, records continuing
+    the address of the previous record are appended to its segment.
+    """
+    if len(starts) == 0:
+        return []
+    # mark the data bytes of all records and extract them at once
+    delta = np.zeros(len(raw) + 1, dtype=np.int8)
+    delta[starts] = 1
+    delta[starts + counts] -= 1
+    data = raw[np.cumsum(delta[:-1], dtype=np.int8).astype(bool)]
+
+    breaks = np.flatnonzero(addresses[1:] != addresses[:-1] + counts[:-1]) + 1
+    positions = np.concatenate(([0], np.cumsum(counts)[breaks - 1], [len(data)]))
+    first_records = np.concatenate(([0], breaks))
+    segments = [
+        (int(addresses[i]), bytearray(data[begin:end]))
+        for i, begin, end in zip(first_records, positions[:-1], positions[1:])
+    ]
+    return merge_segments(segments)
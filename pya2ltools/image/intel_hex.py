@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import numpy as np
+
+from .image import MemoryImage, gather_segments
+
+DATA = 0
+END_OF_FILE = 1
+EXTENDED_SEGMENT_ADDRESS = 2
+START_SEGMENT_ADDRESS = 3
+EXTENDED_LINEAR_ADDRESS = 4
+START_LINEAR_ADDRESS = 5
+
+RECORD_TYPES = (
+    DATA,
+    END_OF_FILE,
+    EXTENDED_SEGMENT_ADDRESS,
+    START_SEGMENT_ADDRESS,
+    EXTENDED_LINEAR_ADDRESS,
+    START_LINEAR_ADDRESS,
+)
+
+
+def _invalid(records: np.ndarray, message: str) -> ValueError:
+    return ValueError(f"Record {int(np.flatnonzero(records)[0]) + 1}: {message}")
+
+
+def parse_intel_hex(text: str) -> list[tuple[int, bytearray]]:
+    """Parses Intel HEX records into contiguous segments.
+
+    All records are decoded with one bytes.fromhex call and split with numpy.
+    """
+    lines = text.split()
+    if not lines:
+        return []
+    if any(line[0] != ":" for line in lines):
+        raise ValueError("Record does not start with ':'")
+    lengths = np.fromiter(map(len, lines), dtype=np.intp, count=len(lines))
+    if np.any(lengths % 2 == 0):
+        raise _invalid(lengths % 2 == 0, "odd number of hex digits")
+    raw = np.frombuffer(bytes.fromhex("".join(lines).replace(":", "")), np.uint8)
+
+    sizes = (lengths - 1) // 2
+    offsets = np.cumsum(sizes) - sizes
+    if np.any(sizes < 5):
+        raise _invalid(sizes < 5, "invalid record length")
+    counts = raw[offsets].astype(np.intp)
+    if np.any(counts + 5 != sizes):
+        raise _invalid(counts + 5 != sizes, "invalid record length")
+    checksums = np.add.reduceat(raw, offsets, dtype=np.uint8)
+    if np.any(checksums):
+        raise _invalid(checksums != 0, "invalid checksum")
+
+    types = raw[offsets + 3]
+    if np.any(~np.isin(types, RECORD_TYPES)):
+        raise _invalid(~np.isin(types, RECORD_TYPES), "unknown record type")
+    end = np.flatnonzero(types == END_OF_FILE)
+    if len(end):
+        offsets, counts, types = (a[: end[0]] for a in (offsets, counts, types))
+
+    # every record uses the base address of the last address record before it
+    values = (
+        raw[offsets + 4].astype(np.int64) << 8
+        | raw[np.minimum(offsets + 5, len(raw) - 1)]
+    )
+    bases = np.where(types == EXTENDED_LINEAR_ADDRESS, values << 16, values << 4)
+    is_base = (types == EXTENDED_LINEAR_ADDRESS) | (types == EXTENDED_SEGMENT_ADDRESS)
+    last_base = np.maximum.accumulate(np.where(is_base, np.arange(len(types)), -1))
+    base = np.where(last_base >= 0, bases[np.maximum(last_base, 0)], 0)
+
+    data_records = types == DATA
+    offsets, counts = offsets[data_records], counts[data_records]
+    addresses = base[data_records] + (
+        raw[offsets + 1].astype(np.int64) << 8 | raw[offsets + 2]
+    )
+    return gather_segments(raw, offsets + 4, counts, addresses)
+
+
+def read_intel_hex(path: Path) -> MemoryImage:
+    with open(path, "r") as f:
+        return MemoryImage(parse_intel_hex(f.read()))
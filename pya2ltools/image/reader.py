@@ -0,0 +1,62 @@
+from pathlib import Path
+
+from .binary import read_binary
+from .elf import read_elf
+from .image import MemoryImage
+from .intel_hex import read_intel_hex
+from .srecord import read_srecord
+
+INTEL_HEX = "hex"
+SRECORD = "srec"
+BINARY = "bin"
+ELF = "elf"
+
+SUFFIXES = {
+    ".hex": INTEL_HEX,
+    ".ihex": INTEL_HEX,
+    ".s19": SRECORD,
+    ".s28": SRECORD,
+    ".s37": SRECORD,
+    ".srec": SRECORD,
+    ".mot": SRECORD,
+    ".bin": BINARY,
+    ".elf": ELF,
+    ".axf": ELF,
+    ".out": ELF,
+}
+
+
+def detect_format(path: Path) -> str:
+    """Detects the format of path by its suffix or else by its first bytes."""
+    image_format = SUFFIXES.get(Path(path).suffix.lower())
+    if image_format is not None:
+        return image_format
+    with open(path, "rb") as f:
+        start = f.read(4)
+    if start == b"\x7fELF":
+        return ELF
+    if start[:1] == b":":
+        return INTEL_HEX
+    if start[:1] == b"S" and start[1:2].isdigit():
+        return SRECORD
+    return BINARY
+
+
+def read_image(
+    path: Path, base_address: int = 0, image_format: str | None = None
+) -> MemoryImage:
+    """Reads an Intel HEX, Motorola S-record, ELF or raw binary image.
+
+    base_address is the address of the first byte of a raw binary.
+    """
+    if image_format is None:
+        image_format = detect_format(path)
+    if image_format == INTEL_HEX:
+        return read_intel_hex(path)
+    if image_format == SRECORD:
+        return read_srecord(path)
+    if image_format == ELF:
+        return read_elf(path)
+    if image_format == BINARY:
+        return read_binary(path, base_address)
+    raise ValueError(f"Unknown image format {image_format}")
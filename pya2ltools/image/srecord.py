@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import numpy as np
+
+from .image import MemoryImage, gather_segments
+
+# address length of the data records S1, S2 and S3
+ADDRESS_LENGTHS = {ord("1"): 2, ord("2"): 3, ord("3"): 4}
+
+# header, count and termination records carry no data
+OTHER_RECORDS = b"056789"
+
+
+def _invalid(records: np.ndarray, message: str) -> ValueError:
+    return ValueError(f"Record {int(np.flatnonzero(records)[0]) + 1}: {message}")
+
+
+def parse_srecord(text: str) -> list[tuple[int, bytearray]]:
+    """Parses Motorola S-records (S19, S28, S37) into contiguous segments.
+
+    All records are decoded with one bytes.fromhex call and split with numpy.
+    """
+    lines = text.split()
+    if not lines:
+        return []
+    if any(line[0] != "S" for line in lines):
+        raise ValueError("Record does not start with 'S'")
+    lengths = np.fromiter(map(len, lines), dtype=np.intp, count=len(lines))
+    if np.any(lengths < 6):
+        raise _invalid(lengths < 6, "invalid record length")
+    types = np.frombuffer("".join(line[1] for line in lines).encode(), np.uint8)
+    address_lengths = np.zeros(len(lines), dtype=np.intp)
+    for record_type, length in ADDRESS_LENGTHS.items():
+        address_lengths[types == record_type] = length
+    is_data = address_lengths > 0
+    known = is_data | np.isin(types, np.frombuffer(OTHER_RECORDS, np.uint8))
+    if not np.all(known):
+        raise _invalid(~known, "unknown record type")
+
+    if np.any(lengths % 2 == 1):
+        raise _invalid(lengths % 2 == 1, "odd number of hex digits")
+    raw = np.frombuffer(bytes.fromhex("".join(line[2:] for line in lines)), np.uint8)
+
+    sizes = (lengths - 2) // 2
+    offsets = np.cumsum(sizes) - sizes
+    counts = raw[offsets].astype(np.intp)
+    if np.any(counts + 1 != sizes):
+        raise _invalid(counts + 1 != sizes, "invalid record length")
+    checksums = np.add.reduceat(raw, offsets, dtype=np.uint8)
+    if np.any(checksums != 0xFF):
+        raise _invalid(checksums != 0xFF, "invalid checksum")
+
+    offsets, sizes = offsets[is_data], sizes[is_data]
+    address_lengths = address_lengths[is_data]
+    if np.any(sizes < address_lengths + 2):
+        raise _invalid(sizes < address_lengths + 2, "invalid record length")
+    addresses = np.zeros(len(offsets), dtype=np.int64)
+    for i in range(4):
+        has_byte = i < address_lengths
+        byte = raw[np.where(has_byte, offsets + 1 + i, 0)]
+        addresses = np.where(has_byte, addresses << 8 | byte, addresses)
+    starts = offsets + 1 + address_lengths
+    return gather_segments(raw, starts, sizes - 2 - address_lengths, addresses)
+
+
+def read_srecord(path: Path) -> MemoryImage:
+    with open(path, "r") as f:
+        return MemoryImage(parse_srecord(f.read()))
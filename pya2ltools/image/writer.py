@@ -0,0 +1,141 @@
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from .image import MemoryImage
+from .reader import BINARY, INTEL_HEX, SRECORD, SUFFIXES
+
+# S-record types by address length: data record and termination record
+SRECORD_TYPES = {2: ("S1", "S9"), 3: ("S2", "S8"), 4: ("S3", "S7")}
+SRECORD_ADDRESS_LENGTHS = {".s19": 2, ".s28": 3, ".s37": 4}
+
+
+def _lines(records: np.ndarray, start: str) -> str:
+    """Formats rows of equally long records as hex lines."""
+    text = records.tobytes().hex().upper()
+    width = 2 * records.shape[1]
+    return "".join(
+        f"{start}{text[i : i + width]}\n" for i in range(0, len(text), width)
+    )
+
+
+def _records(
+    data: np.ndarray,
+    address: int,
+    record_size: int,
+    address_length: int,
+    header: list[int],
+) -> Iterator[np.ndarray]:
+    """Yields arrays of records of data, full records first and the remainder.
+
+    Each row holds the byte count, the big endian address, header bytes, data and
+    room for the checksum.
+    """
+    full = len(data) // record_size
+    for count, begin, end in [
+        (full, 0, full * record_size),
+        (1 if len(data) % record_size else 0, full * record_size, len(data)),
+    ]:
+        if count == 0:
+            continue
+        size = (end - begin) // count
+        rows = np.zeros((count, 1 + address_length + len(header) + size + 1), np.uint8)
+        addresses = address + begin + size * np.arange(count, dtype=np.int64)
+        for i in range(address_length):
+            rows[:, 1 + i] = addresses >> (8 * (address_length - 1 - i)) & 0xFF
+        rows[:, 1 + address_length : 1 + address_length + len(header)] = header
+        rows[:, -1 - size : -1] = data[begin:end].reshape(count, size)
+        yield rows
+
+
+def iter_intel_hex(image: MemoryImage, record_size: int = 32) -> Iterator[str]:
+    """Yields the Intel HEX text of image in chunks of 64 KiB."""
+    upper = None
+    for start, buffer in image.segments:
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        position = 0
+        while position < len(data):
+            address = start + position
+            # records must not cross a 64 KiB boundary
+            size = min(len(data) - position, 0x10000 - (address & 0xFFFF))
+            if address >> 16 != upper:
+                upper = address >> 16
+                yield _lines(
+                    _checksum_intel_hex(
+                        np.array([[2, 0, 0, 4, upper >> 8, upper & 0xFF, 0]], np.uint8)
+                    ),
+                    ":",
+                )
+            for rows in _records(
+                data[position : position + size], address & 0xFFFF, record_size, 2, [0]
+            ):
+                rows[:, 0] = rows.shape[1] - 5
+                yield _lines(_checksum_intel_hex(rows), ":")
+            position += size
+    yield ":00000001FF\n"
+
+
+def _checksum_intel_hex(rows: np.ndarray) -> np.ndarray:
+    rows[:, -1] = -rows[:, :-1].sum(axis=1, dtype=np.uint8)
+    return rows
+
+
+def iter_srecord(
+    image: MemoryImage, record_size: int = 32, address_length: int = 4
+) -> Iterator[str]:
+    """Yields the Motorola S-record text of image in chunks."""
+    data_type, termination = SRECORD_TYPES[address_length]
+    if image.segments:
+        start, buffer = image.segments[-1]
+        if start + len(buffer) > 1 << (8 * address_length):
+            raise ValueError(f"Addresses do not fit into {data_type} records")
+    for start, buffer in image.segments:
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        for position in range(0, len(data), 0x10000):
+            for rows in _records(
+                data[position : position + 0x10000],
+                start + position,
+                record_size,
+                address_length,
+                [],
+            ):
+                rows[:, 0] = rows.shape[1] - 1
+                yield _lines(_checksum_srecord(rows), data_type)
+    end = np.zeros((1, 2 + address_length), np.uint8)
+    end[0, 0] = address_length + 1
+    yield _lines(_checksum_srecord(end), termination)
+
+
+def _checksum_srecord(rows: np.ndarray) -> np.ndarray:
+    rows[:, -1] = ~rows[:, :-1].sum(axis=1, dtype=np.uint8)
+    return rows
+
+
+def write_binary(image: MemoryImage, path: Path, fill: int = 0xFF):
+    """Writes the memory from the first to the last segment, gaps are filled."""
+    with open(path, "wb") as f:
+        end = None
+        for start, buffer in image.segments:
+            if end is not None and start > end:
+                f.write(bytes([fill]) * (start - end))
+            f.write(buffer)
+            end = start + len(buffer)
+
+
+def write_image(image: MemoryImage, path: Path, image_format: str | None = None):
+    """Writes image as Intel HEX, S-record or binary, by default chosen by suffix."""
+    if image_format is None:
+        image_format = SUFFIXES.get(Path(path).suffix.lower(), INTEL_HEX)
+    if image_format == BINARY:
+        write_binary(image, path)
+        return
+    if image_format == INTEL_HEX:
+        chunks = iter_intel_hex(image)
+    elif image_format == SRECORD:
+        address_length = SRECORD_ADDRESS_LENGTHS.get(Path(path).suffix.lower(), 4)
+        chunks = iter_srecord(image, address_length=address_length)
+    else:
+        raise ValueError(f"Cannot write images as {image_format}")
+    with open(path, "w") as f:
+        f.writelines(chunks)
@@ -3,6 +3,18 @@ from argparse import ArgumentParser
 from a2l.tools.update_a2l import subcommand_update_a2l
 from a2l.tools.merge_a2l import subcommand_merge_a2l
 from a2l.tools.read_calibration_data import subcommand_read_calibration_data
+from a2l.tools.deduplicate_a2l import subcommand_deduplicate_a2l
+from a2l.tools.prune_a2l import subcommand_prune_a2l
+from a2l.tools.extract_a2l import subcommand_extract_a2l
+from a2l.tools.split_a2l import subcommand_split_a2l
+from a2l.tools.diff_a2l import subcommand_diff_a2l
+from a2l.tools.patch_a2l import subcommand_patch_a2l
+from a2l.tools.plan_memory_reads import subcommand_plan_memory_reads
+from a2l.tools.write_calibration_data import subcommand_write_calibration_data
+from a2l.tools.migrate_calibration import subcommand_migrate_calibration
+from a2l.tools.diff_calibration import subcommand_diff_calibration
+from a2l.tools.calibration_statistics import subcommand_calibration_statistics
+from a2l.tools.segment_checksums import subcommand_segment_checksums
 
 
 def main():
@@ -14,7 +26,69 @@ def main():
     subcommand_merge_a2l(subparsers.add_parser("merge_a2l", help="Merge A2L files"))
     subcommand_read_calibration_data(
         subparsers.add_parser(
-            "create_calibration_data", help="Read calibration data from hex file"
+            "create_calibration_data", help="Read calibration data from an image file"
+        )
+    )
+
+    subcommand_deduplicate_a2l(
+        subparsers.add_parser(
+            "deduplicate_a2l",
+            help="Merge identical compu methods, compu tabs and record layouts",
+        )
+    )
+    subcommand_prune_a2l(
+        subparsers.add_parser(
+            "prune_a2l",
+            help="Remove unreferenced compu methods, compu tabs and record layouts",
+        )
+    )
+    subcommand_extract_a2l(
+        subparsers.add_parser(
+            "extract_a2l",
+            help="Extract elements and their dependencies into a new A2L file",
+        )
+    )
+    subcommand_split_a2l(
+        subparsers.add_parser("split_a2l", help="Split A2L file into shards")
+    )
+    subcommand_diff_a2l(
+        subparsers.add_parser("diff_a2l", help="Compare the elements of two A2L files")
+    )
+    subcommand_patch_a2l(
+        subparsers.add_parser("patch_a2l", help="Apply a patch created by diff_a2l")
+    )
+
+    subcommand_write_calibration_data(
+        subparsers.add_parser(
+            "write_calibration_data", help="Write calibration data into an image file"
+        )
+    )
+    subcommand_migrate_calibration(
+        subparsers.add_parser(
+            "migrate_calibration",
+            help="Copy calibration data into the image of a new software version",
+        )
+    )
+    subcommand_diff_calibration(
+        subparsers.add_parser(
+            "diff_calibration", help="Compare the calibration data of images"
+        )
+    )
+    subcommand_calibration_statistics(
+        subparsers.add_parser(
+            "calibration_statistics",
+            help="Compute statistics of the calibration data of many images",
+        )
+    )
+    subcommand_segment_checksums(
+        subparsers.add_parser(
+            "segment_checksums", help="Compute checksums of the memory segments"
+        )
+    )
+    subcommand_plan_memory_reads(
+        subparsers.add_parser(
+            "plan_memory_reads",
+            help="Merge the memory of addressable objects into few read blocks",
         )
     )
 
@@ -0,0 +1,699 @@
+import dataclasses
+import json
+from pathlib import Path
+import unittest
+import zlib
+
+import numpy as np
+
+from pya2ltools.a2l.reader.reader import read_a2l, read_elements
+from pya2ltools.a2l.calibration.checksum import (
+    ChecksumLocation,
+    checksum,
+    find_checksum_location,
+    memory_slices,
+    patch_checksums,
+    segment_checksums,
+)
+from pya2ltools.a2l.calibration.data_file import read_values, write_values
+from pya2ltools.a2l.calibration.diff import CalibrationComparator
+from pya2ltools.a2l.calibration.migration import migrate_calibration
+from pya2ltools.a2l.calibration.read_plan import create_read_plan
+from pya2ltools.a2l.calibration.statistics import fleet_statistics, write_statistics
+from pya2ltools.a2l.calibration.readout import (
+    CalibrationReader,
+    write_calibration_data,
+)
+from pya2ltools.a2l.calibration.writeback import CalibrationWriter
+from pya2ltools.a2l.calibration.record_layout import (
+    FNC_VALUES,
+    RecordLayoutDecoder,
+    compile_record_layout,
+)
+from pya2ltools.a2l.writer.writer import write_record_layout
+from pya2ltools.image.image import MemoryImage
+from pya2ltools.a2l.model.model import (
+    A2LMemorySegment,
+    A2LModCommon,
+    A2LModPar,
+    ByteOrder,
+)
+
+A2L_PATH = Path("test") / "ECU_Description" / "ASAP2_Operations.a2l"
+
+
+class TestRecordLayout(unittest.TestCase):
+    def setUp(self):
+        self.module = read_a2l(A2L_PATH).project.modules[0]
+        self.decoder = RecordLayoutDecoder(self.module.mod_common[0])
+
+    def test_curve(self):
+        plan = self.decoder.get_plan(self.module.get_element("SpeedCurve"))
+        self.assertEqual(7, plan.dtype.itemsize)
+        record = plan.decode(bytes([0xFF, 2, 10, 20, 30, 7, 8, 9]), offset=1)
+        self.assertEqual(2, record["NO_AXIS_PTS_X"])
+        np.testing.assert_array_equal([10, 20, 30], record["AXIS_PTS_X"])
+        np.testing.assert_array_equal([7, 8, 9], record[FNC_VALUES])
+
+    def test_map_column_dir(self):
+        plan = self.decoder.get_plan(self.module.get_element("TorqueMap"))
+        data = np.arange(12, dtype="<u2")
+        values = plan.decode(data.tobytes())[FNC_VALUES]
+        np.testing.assert_array_equal(data.reshape(4, 3), values)
+
+    def test_plan_cache(self):
+        decoder = self.decoder
+        self.assertIs(
+            decoder.get_plan(self.module.get_element("Gain")),
+            decoder.get_plan(self.module.get_element("DoubleGain")),
+        )
+        self.assertIsNot(
+            decoder.get_plan(self.module.get_element("Gain")),
+            decoder.get_plan(self.module.get_element("Table")),
+        )
+
+    def test_row_dir_alignment_byte_order(self):
+        record_layout = read_elements("""/begin RECORD_LAYOUT RL.TEST
+                NO_AXIS_PTS_X 1 UBYTE
+                RESERVED 2 BYTE
+                FNC_VALUES 4 SLONG ROW_DIR DIRECT
+                NO_AXIS_PTS_Y 3 UWORD
+                STATIC_RECORD_LAYOUT
+            /end RECORD_LAYOUT""")[0]
+        mod_common = A2LModCommon("", "ABSOLUTE", ByteOrder.MSB_FIRST)
+        decoder = RecordLayoutDecoder(mod_common)
+        plan = compile_record_layout(
+            record_layout, (2, 3), (2, 3), decoder.byte_order, decoder.alignments
+        )
+        self.assertEqual(
+            [0, 1, 2, 4], [plan.dtype.fields[n][1] for n in plan.dtype.names]
+        )
+        self.assertEqual(28, plan.dtype.itemsize)
+
+        data = bytes([2, 0, 0, 3]) + np.arange(6, dtype=">i4").tobytes()
+        record = plan.decode(data)
+        self.assertEqual(3, record["NO_AXIS_PTS_Y"])
+        # ROW_DIR stores all x values of a row after another
+        np.testing.assert_array_equal([[0, 1], [2, 3], [4, 5]], record[FNC_VALUES].T)
+
+        records = plan.decode_many(data + data, [0, 28])
+        self.assertEqual((2, 2, 3), records[FNC_VALUES].shape)
+        np.testing.assert_array_equal([3, 3], records["NO_AXIS_PTS_Y"])
+        np.testing.assert_array_equal(record[FNC_VALUES], records[FNC_VALUES][1])
+
+    def test_compact(self):
+        curve = self.module.get_element("SpeedCurve")
+        curve.typedef.record_layout.static_record_layout = False
+        # FNC_VALUES follow the stored number of axis points
+        with self.assertRaises(NotImplementedError):
+            self.decoder.get_plan(curve)
+        reader = CalibrationReader(self.module)
+        list(reader.read(create_memory()))
+        self.assertEqual(["SpeedCurve"], reader.unsupported)
+
+        # values behind a fixed number of axis points are not moved
+        record_layout = read_elements("""/begin RECORD_LAYOUT RL.TEST
+                NO_AXIS_PTS_X 1 UBYTE
+                FNC_VALUES 2 UBYTE ROW_DIR DIRECT
+            /end RECORD_LAYOUT""")[0]
+        self.assertEqual(4, compile_record_layout(record_layout, (3,)).dtype.itemsize)
+
+    def test_axis_rescale(self):
+        record_layout = read_elements("""/begin RECORD_LAYOUT RL.TEST
+                NO_RESCALE_X 1 UBYTE
+                AXIS_RESCALE_X 2 UBYTE 3 INDEX_INCR DIRECT
+                NO_AXIS_PTS_X 3 UBYTE
+                AXIS_PTS_X 4 UBYTE INDEX_INCR DIRECT
+                STATIC_RECORD_LAYOUT
+            /end RECORD_LAYOUT""")[0]
+        plan = compile_record_layout(record_layout, (), (2,))
+        record = plan.decode(bytes([2, 0, 0, 10, 100, 0, 0, 2, 5, 6]))
+        self.assertEqual(2, record["NO_RESCALE_X"])
+        np.testing.assert_array_equal(
+            [[0, 0], [10, 100], [0, 0]], record["AXIS_RESCALE_X"]
+        )
+        np.testing.assert_array_equal([5, 6], record["AXIS_PTS_X"])
+        self.assertIn("STATIC_RECORD_LAYOUT", write_record_layout(record_layout))
+
+        record_layout.static_record_layout = False
+        with self.assertRaises(NotImplementedError):
+            compile_record_layout(record_layout, (), (2,))
+        # axis points behind a pointer are not dereferenced
+        record_layout.static_record_layout = True
+        record_layout.fields[-1].addressing_mode = "PBEG"
+        with self.assertRaises(NotImplementedError):
+            compile_record_layout(record_layout, (), (2,))
+
+
+def create_memory() -> list[tuple[int, bytearray]]:
+    """Memory of the Operations module, State is not part of it."""
+    calibration = bytearray(0x108)
+    calibration[0x0:0x2] = bytes([5, 10])
+    calibration[0x2:0x4] = np.array([80], dtype="<i2").tobytes()
+    calibration[0x4:0x8] = np.array([1.5], dtype="<f4").tobytes()
+    calibration[0x8:0xA] = bytes([15, 2])
+    calibration[0x10:0x14] = bytes([1, 2, 3, 4])
+    calibration[0x20:0x27] = bytes([2, 10, 20, 30, 7, 8, 9])
+    calibration[0x30:0x48] = np.arange(12, dtype="<u2").tobytes()
+    calibration[0x100:0x107] = bytes([0, 5, 10, 15, 1, 2, 3])
+    measurements = bytearray([5, 0, 8, 0])
+    return [(0x1000, calibration), (0x2000, measurements)]
+
+
+def add_typedef(module):
+    """Adds a TYPEDEF_CHARACTERISTIC, which is kept with the characteristics."""
+    (typedef,) = read_elements("""/begin TYPEDEF_CHARACTERISTIC T.Gain "gain"
+            VALUE RL.VALUE_UBYTE 0 CM.LINEAR -10 500
+        /end TYPEDEF_CHARACTERISTIC""")
+    typedef.resolve_references(module.get_reference_dict())
+    module.characteristics.append(typedef)
+    return module
+
+
+class TestCalibrationReader(unittest.TestCase):
+    def test_read(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        reader = CalibrationReader(module)
+        values = {value.name: value for value in reader.read(create_memory())}
+
+        self.assertEqual(["DoubleGain", "State"], sorted(reader.missing))
+        self.assertEqual([], reader.unsupported)
+        physical = {name: value.physical.tolist() for name, value in values.items()}
+        self.assertEqual(0, physical["Gain"])
+        self.assertEqual(10, physical["Offset"])
+        self.assertEqual(0, physical["Temperature"])
+        self.assertEqual(1.5, physical["Factor"])
+        self.assertEqual(250, physical["Torque"])
+        self.assertEqual("ERROR", physical["Mode"])
+        self.assertEqual([1, 2, 3, 4], physical["Table"])
+        self.assertEqual([7, 8], physical["SpeedCurve"])
+        self.assertEqual([[10, 20]], [a.tolist() for a in values["SpeedCurve"].axes])
+        self.assertEqual((4, 3), values["TorqueMap"].raw.shape)
+        self.assertEqual([-10, 0, 10, 20], physical["SpeedAxis"])
+        self.assertEqual([-1.5, -1, -0.5], physical["EngineSpeedAxis"])
+        self.assertEqual(0, physical["Speed"])
+        self.assertEqual(2, physical["EngineSpeed"])
+
+    def test_virtual(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        elements = read_elements("""/begin MEASUREMENT Distance "virtual"
+                UBYTE CM.LINEAR 0 0 -10 500
+                /begin VIRTUAL Speed /end VIRTUAL
+            /end MEASUREMENT
+            /begin CHARACTERISTIC DoubleOffset "virtual"
+                VALUE 0x0 RL.VALUE_UBYTE 0 CM.LINEAR -10 500
+                /begin VIRTUAL_CHARACTERISTIC "X1 * 2" Offset /end VIRTUAL_CHARACTERISTIC
+            /end CHARACTERISTIC""")
+        for element in elements:
+            element.resolve_references(module.get_reference_dict())
+        module.add_elements(elements)
+        # memory at the default address of the virtual objects
+        memory = [(0x0, bytearray(4))] + create_memory()
+        reader = CalibrationReader(module)
+        names = [value.name for value in reader.read(memory)]
+        self.assertIn("Speed", names)
+        self.assertNotIn("Distance", names)
+        self.assertNotIn("DoubleOffset", names)
+        self.assertNotIn("Distance", reader.missing)
+
+    def test_write(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        output = Path("calibration_data.jsonl")
+        count = write_calibration_data(
+            CalibrationReader(module).read(create_memory()), output
+        )
+        lines = output.read_text().splitlines()
+        self.assertEqual(count, len(lines))
+        self.assertIn(
+            {
+                "name": "SpeedCurve",
+                "raw": [7, 8],
+                "physical": [7, 8],
+                "axes": [[10, 20]],
+            },
+            [json.loads(line) for line in lines],
+        )
+
+    def tearDownClass() -> None:
+        Path("calibration_data.jsonl").unlink(missing_ok=True)
+
+
+class TestCalibrationWriter(unittest.TestCase):
+    def test_write(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        reader = CalibrationReader(module)
+        segments = create_memory()
+        values = {value.name: value for value in reader.read(segments)}
+        values["Gain"].physical = np.array(100)
+        values["SpeedCurve"].physical = np.array([30, 40])
+        values["SpeedCurve"].axes = [np.array([1000, 2000])]
+
+        writer = CalibrationWriter(module, reader)
+        written = writer.write(
+            segments,
+            {
+                "Gain": values["Gain"],
+                "Offset": 1000,
+                "Mode": "ON",
+                "Table": [5, 6],
+                "SpeedCurve": values["SpeedCurve"],
+                "SpeedAxis": [0, 2, 4, 6],
+                "DoubleGain": 1,
+                "State": 1,
+            },
+        )
+        # measurements are not written
+        self.assertEqual(["State"], writer.unknown)
+        self.assertEqual(["DoubleGain"], writer.missing)
+        self.assertEqual(6, len(written))
+
+        physical = {value.name: value for value in reader.read(segments)}
+        self.assertEqual(100, physical["Gain"].physical)
+        # clipped to the limits
+        self.assertEqual(500, physical["Offset"].physical)
+        self.assertEqual("ON", physical["Mode"].physical)
+        self.assertEqual([5, 6, 3, 4], physical["Table"].physical.tolist())
+        self.assertEqual([30, 40], physical["SpeedCurve"].physical.tolist())
+        # raw values of the UBYTE axis saturate
+        self.assertEqual(
+            [[255, 255]], [a.tolist() for a in physical["SpeedCurve"].axes]
+        )
+        self.assertEqual([0, 2, 4, 6], physical["SpeedAxis"].physical.tolist())
+        self.assertEqual(1.5, physical["Factor"].physical)
+
+    def test_limits_per_element(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        gain = module.get_element("Gain").typedef
+        narrow = module.get_element("Offset").typedef
+        narrow.record_layout = gain.record_layout
+        narrow.compu_method = gain.compu_method
+        narrow.max = 20
+        reader = CalibrationReader(module)
+        for values in ({"Gain": 400, "Offset": 400}, {"Offset": 400, "Gain": 400}):
+            segments = create_memory()
+            CalibrationWriter(module, reader).write(segments, values)
+            physical = {
+                value.name: value.physical
+                for value in reader.read(
+                    segments, [module.get_element("Gain"), module.get_element("Offset")]
+                )
+            }
+            self.assertEqual(400, physical["Gain"])
+            self.assertEqual(20, physical["Offset"])
+
+    def test_invalid(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        with self.assertRaises(ValueError):
+            CalibrationWriter(module).write(create_memory(), {"Mode": "UNKNOWN"})
+        # a scalar is not broadcast over an array
+        with self.assertRaises(ValueError):
+            CalibrationWriter(module).write(create_memory(), {"Table": 5})
+
+
+class TestMigration(unittest.TestCase):
+    def test_migrate(self):
+        old_module = read_a2l(A2L_PATH).project.modules[0]
+        new_module = read_a2l(A2L_PATH).project.modules[0]
+        for element in new_module.characteristics + new_module.axis_pts:
+            element.ecu_address += 0x10000
+        # re-encoded without conversion
+        new_module.get_element("Gain").typedef.compu_method = None
+        new_module.get_element("Table").typedef.matrix_dim = [2]
+        new_module.get_element("Factor").name = "NewFactor"
+        new_segments = [(0x10000, bytearray(1)), (0x11000, bytearray(0x108))]
+
+        old_memory = create_memory()
+        old_memory[0][1][0] = 50
+        report = migrate_calibration(
+            old_module, MemoryImage(old_memory).read, new_module, new_segments
+        )
+        self.assertEqual(["Factor"], report.removed)
+        self.assertEqual(["NewFactor"], report.added)
+        self.assertEqual(["Table"], report.incompatible)
+        self.assertEqual(["DoubleGain"], report.missing)
+
+        new_values = {
+            value.name: value.physical.tolist()
+            for value in CalibrationReader(new_module).read(new_segments)
+        }
+        old_values = {
+            value.name: value.physical.tolist()
+            for value in CalibrationReader(old_module).read(old_memory)
+        }
+        self.assertEqual(90, old_values["Gain"])
+        self.assertEqual(90, new_segments[1][1][0])
+        for name in report.copied:
+            if name in new_values:
+                self.assertEqual(old_values[name], new_values[name], msg=name)
+        self.assertEqual(9, len(report.copied))
+
+    def test_unchanged(self):
+        module = add_typedef(read_a2l(A2L_PATH).project.modules[0])
+        old_memory = create_memory()
+        new_segments = [(0x1000, bytearray(0x108)), (0x2000, bytearray(4))]
+        report = migrate_calibration(
+            module, MemoryImage(old_memory).read, module, new_segments
+        )
+        self.assertEqual([], report.incompatible)
+        self.assertEqual([], report.unconvertible)
+        # including the EngineSpeedAxis points below their lower limit
+        self.assertEqual(old_memory[0][1], new_segments[0][1])
+
+    def test_unconvertible(self):
+        old_module = read_a2l(A2L_PATH).project.modules[0]
+        new_module = read_a2l(A2L_PATH).project.modules[0]
+        mode = new_module.get_element("Mode").typedef
+        mode.compu_method = dataclasses.replace(mode.compu_method, name="CM.NEW")
+        old_memory = create_memory()
+        # erased flash has no verbal representation
+        old_memory[0][1][0x9] = 0xFF
+        new_segments = [(0x1000, bytearray(0x108))]
+        report = migrate_calibration(
+            old_module, MemoryImage(old_memory).read, new_module, new_segments
+        )
+        self.assertEqual(["Mode"], report.unconvertible)
+        self.assertNotIn("Mode", report.copied)
+        self.assertEqual(0, new_segments[0][1][0x9])
+        self.assertEqual(old_memory[0][1][:0x9], new_segments[0][1][:0x9])
+
+
+DCM_TEXT = """
+* exported by hand
+KONSERVIERUNG_FORMAT 2.0
+
+FUNKTIONEN
+   FKT Control "1.0" "Control"
+END
+
+MODULKOPF ECU "Engine"
+MODULKOPF Version "1.0"
+
+FESTWERT Gain
+   LANGNAME "Gain"
+   WERT 20.0
+END
+
+FESTWERT Mode
+   TEXT "ON"
+END
+
+KENNFELD TorqueMap 4 3
+   ST/X 1 2 3
+   ST/X 4
+   ST/Y 10
+   WERT 1 2 3 4
+   ST/Y 20
+   WERT 5 6 7 8
+   ST/Y 30
+   WERT 9 10 11
+   WERT 12
+END
+"""
+
+
+class TestDataFile(unittest.TestCase):
+    def test_round_trip(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        values = list(CalibrationReader(module).read(create_memory()))
+        axis_pts = {axis.name for axis in module.axis_pts}
+        for suffix in [".dcm", ".csv", ".jsonl"]:
+            path = Path("calibration_data" + suffix)
+            self.assertEqual(len(values), write_values(values, path, axis_pts=axis_pts))
+            read = {value.name: value for value in read_values(path)}
+            self.assertEqual([v.name for v in values], list(read), msg=suffix)
+            for value in values:
+                np.testing.assert_array_equal(
+                    value.physical, read[value.name].physical, err_msg=suffix
+                )
+                for axis, read_axis in zip(value.axes, read[value.name].axes):
+                    np.testing.assert_array_equal(axis, read_axis)
+
+    def test_verbal_table(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        elements = read_elements("""/begin COMPU_VTAB CV.SWITCH "switch"
+                TAB_VERB 2
+                0 "OFF"
+                1 "ON"
+            /end COMPU_VTAB
+            /begin COMPU_METHOD CM.SWITCH "switch"
+                TAB_VERB "%6.2" ""
+                COMPU_TAB_REF CV.SWITCH
+            /end COMPU_METHOD
+            /begin CHARACTERISTIC Switches "switches"
+                VAL_BLK 0x1050 RL.VALUE_UBYTE 0 CM.SWITCH 0 1
+                MATRIX_DIM 3
+            /end CHARACTERISTIC
+            /begin CHARACTERISTIC Erased "no DEFAULT_VALUE for 0xFF"
+                VALUE 0x1053 RL.VALUE_UBYTE 0 CM.SWITCH 0 1
+            /end CHARACTERISTIC""")
+        module.add_elements(elements)
+        for element in elements[1:]:
+            element.resolve_references(module.get_reference_dict())
+        memory = create_memory()
+        memory[0][1][0x50:0x54] = bytes([1, 0, 1, 0xFF])
+        values = list(CalibrationReader(module).read(memory))
+
+        path = Path("calibration_data.dcm")
+        skipped = []
+        self.assertEqual(len(values) - 1, write_values(values, path, skipped=skipped))
+        self.assertEqual(["Erased"], skipped)
+        read = {value.name: value for value in read_values(path)}
+        self.assertEqual(["ON", "OFF", "ON"], read["Switches"].physical.tolist())
+        self.assertEqual("ERROR", read["Mode"].physical)
+
+        memory = create_memory()
+        CalibrationWriter(module).write(memory, {"Switches": read["Switches"]})
+        self.assertEqual(bytes([1, 0, 1]), memory[0][1][0x50:0x53])
+
+    def test_mixed_axes(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        elements = read_elements("""/begin RECORD_LAYOUT RL.MAP_STD_Y
+                NO_AXIS_PTS_Y 1 UBYTE
+                AXIS_PTS_Y 2 UBYTE INDEX_INCR DIRECT
+                FNC_VALUES 3 UBYTE COLUMN_DIR DIRECT
+                STATIC_RECORD_LAYOUT
+            /end RECORD_LAYOUT
+            /begin CHARACTERISTIC MixedMap "shared x, stored y axis"
+                MAP 0x1060 RL.MAP_STD_Y 0 NO_COMPU_METHOD 0 255
+                /begin AXIS_DESCR
+                    COM_AXIS Speed CM.LINEAR_COPY 4 -10 500
+                    AXIS_PTS_REF SpeedAxis
+                /end AXIS_DESCR
+                /begin AXIS_DESCR
+                    STD_AXIS EngineSpeed NO_COMPU_METHOD 2 0 255
+                /end AXIS_DESCR
+            /end CHARACTERISTIC""")
+        module.add_elements(elements)
+        elements[1].resolve_references(module.get_reference_dict())
+        memory = create_memory()
+        memory[0][1][0x60:0x6B] = bytes([2, 100, 200, *range(8)])
+        values = {value.name: value for value in CalibrationReader(module).read(memory)}
+        mixed_map = values["MixedMap"]
+        self.assertEqual(
+            [[-10, 0, 10, 20], [100, 200]], [a.tolist() for a in mixed_map.axes]
+        )
+
+        path = Path("calibration_data.dcm")
+        write_values([mixed_map], path)
+        self.assertTrue(path.read_text().splitlines()[2].startswith("KENNFELD"))
+        (read,) = read_values(path)
+        read.axes[1] = np.array([50, 60])
+        CalibrationWriter(module).write(memory, {"MixedMap": read})
+        self.assertEqual(bytes([2, 50, 60, *range(8)]), memory[0][1][0x60:0x6B])
+        # the shared axis is not touched
+        self.assertEqual(bytes([0, 5, 10, 15]), memory[0][1][0x100:0x104])
+
+    def test_read_dcm(self):
+        path = Path("calibration_data.dcm")
+        path.write_text(DCM_TEXT)
+        values = {value.name: value for value in read_values(path)}
+        self.assertEqual(["Gain", "Mode", "TorqueMap"], list(values))
+        self.assertEqual("ON", values["Mode"].physical)
+        torque_map = values["TorqueMap"]
+        self.assertEqual((4, 3), torque_map.physical.shape)
+        self.assertEqual([1, 5, 9], torque_map.physical[0].tolist())
+        self.assertEqual([10, 20, 30], torque_map.axes[1].tolist())
+
+        module = read_a2l(A2L_PATH).project.modules[0]
+        memory = create_memory()
+        writer = CalibrationWriter(module)
+        self.assertEqual(3, writer.write_stream(memory, read_values(path), 1))
+        read = {v.name: v.physical for v in CalibrationReader(module).read(memory)}
+        self.assertEqual(20, read["Gain"])
+        self.assertEqual("ON", read["Mode"])
+        # axis points of the map are shared, only its values are written
+        self.assertEqual([1, 5, 9], read["TorqueMap"][0].tolist())
+
+    def tearDownClass() -> None:
+        for suffix in [".dcm", ".csv", ".jsonl"]:
+            Path("calibration_data" + suffix).unlink(missing_ok=True)
+
+
+class TestCalibrationComparator(unittest.TestCase):
+    def test_compare(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        first, second, third = create_memory(), create_memory(), create_memory()
+        CalibrationWriter(module).write(second, {"Gain": 20, "Mode": "ON"})
+        CalibrationWriter(module).write(third, {"Gain": 30, "Table": [1, 2, 3, 5]})
+        comparator = CalibrationComparator(module)
+        differences = comparator.compare([first, second, third])
+
+        self.assertEqual(["DoubleGain"], comparator.missing)
+        deltas = {d.name: d.deltas for d in differences}
+        self.assertEqual(["Gain", "Mode", "Table"], sorted(deltas))
+        self.assertEqual([0, 20, 30], [delta.tolist() for delta in deltas["Gain"]])
+        self.assertEqual([0, 0, 1], [delta[3] for delta in deltas["Table"]])
+        self.assertEqual([None, None, None], deltas["Mode"])
+        mode = next(d for d in differences if d.name == "Mode")
+        self.assertEqual(
+            ["ERROR", "ON", "ERROR"], [value.physical.tolist() for value in mode.values]
+        )
+
+    def test_typedef(self):
+        module = add_typedef(read_a2l(A2L_PATH).project.modules[0])
+        first, second = create_memory(), create_memory()
+        CalibrationWriter(module).write(second, {"Gain": 20})
+        comparator = CalibrationComparator(module)
+        self.assertEqual(
+            ["Gain"], [e.name for e in comparator.changed([first, second])]
+        )
+        self.assertEqual([], comparator.unsupported)
+
+    def test_unused_axis_points(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        first, second = create_memory(), create_memory()
+        # behind the two points of SpeedCurve
+        second[0][1][0x20 + 3] = 1
+        second[0][1][0x20 + 6] = 1
+        comparator = CalibrationComparator(module)
+        self.assertEqual([], comparator.changed([first, second]))
+        second[0][1][0x20] = 3
+        self.assertEqual(
+            ["SpeedCurve"], [e.name for e in comparator.changed([first, second])]
+        )
+
+
+def create_fleet_memory(gain: int) -> list[tuple[int, bytearray]]:
+    memory = create_memory()
+    memory[0][1][0] = gain
+    return memory
+
+
+class TestFleetStatistics(unittest.TestCase):
+    def test_statistics(self):
+        module = add_typedef(read_a2l(A2L_PATH).project.modules[0])
+        gains = [5, 5, 5, 5, 5, 5, 5, 5, 10, 20]
+        fleet, unsupported = fleet_statistics(
+            module, gains, create_fleet_memory, max_workers=2
+        )
+        self.assertEqual([], unsupported)
+        self.assertNotIn("T.Gain", fleet.names)
+        columns = {
+            name: (fleet.minimum[i], fleet.maximum[i], fleet.mean[i], fleet.distinct[i])
+            for i, name in enumerate(fleet.names)
+        }
+        # raw values 5, 10 and 20 with 2 * X - 10
+        self.assertEqual((0, 30, 4, 3), columns["Gain"])
+        self.assertEqual((1, 4, 2.5, 1), columns["Table"])
+        self.assertEqual((7, 8, 7.5, 1), columns["SpeedCurve"])
+        self.assertTrue(np.isnan(columns["Mode"][0]))
+        self.assertEqual(1, columns["Mode"][3])
+
+        gain = fleet.names.index("Gain")
+        self.assertEqual(["10", "20"], fleet.outlier_images(gain))
+        self.assertEqual(10, fleet.missing[fleet.names.index("DoubleGain")])
+        self.assertFalse(fleet.outliers[:, fleet.names.index("Table")].any())
+
+        write_statistics(fleet, Path("statistics.csv"))
+        lines = Path("statistics.csv").read_text().splitlines()
+        self.assertEqual("name,min,max,mean,distinct,missing,outliers", lines[0])
+        self.assertIn("Gain,0.0,30.0,4.0,3,0,10 20", lines)
+
+    def tearDownClass() -> None:
+        Path("statistics.csv").unlink(missing_ok=True)
+
+
+class TestChecksum(unittest.TestCase):
+    def test_algorithms(self):
+        data = [b"1234", memoryview(b"56789")]
+        self.assertEqual(0xBB3D, checksum(data, "CRC_16"))
+        self.assertEqual(0x29B1, checksum(data, "CRC_16_CITT"))
+        self.assertEqual(0xCBF43926, checksum(data, "CRC_32"))
+        self.assertEqual(0xDD, checksum(data, "ADD_11"))
+        self.assertEqual(0x1DD, checksum(data, "ADD_12"))
+
+        words = [b"\x01\x02\xff\xff"]
+        self.assertEqual(0x0101, checksum(words, "ADD_22", ByteOrder.MSB_FIRST))
+        self.assertEqual(0x10101, checksum(words, "ADD_24", ByteOrder.MSB_FIRST))
+        self.assertEqual(0x0200, checksum(words, "ADD_22", ByteOrder.MSB_LAST))
+        self.assertEqual(0xFFFF0201, checksum(words, "ADD_44"))
+        with self.assertRaises(ValueError):
+            checksum([b"123"], "ADD_22")
+
+    def test_memory_slices(self):
+        segments = [(0x100, bytearray(b"abcd")), (0x104, b"efgh")]
+        self.assertEqual(
+            [b"cd", b"ef"], [bytes(s) for s in memory_slices(segments, 0x102, 4)]
+        )
+        with self.assertRaises(ValueError):
+            memory_slices(segments, 0x106, 4)
+
+    def test_patch(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        module.mod_par = [A2LModPar("", 1)]
+        module.mod_par[0].memory_segments = [
+            A2LMemorySegment(
+                "Calibration",
+                "",
+                "CALIBRATION_VARIABLES",
+                "FLASH",
+                "INTERN",
+                0x1000,
+                0x108,
+            ),
+            A2LMemorySegment("Code", "", "CODE", "FLASH", "INTERN", 0x8000, 0x100),
+        ]
+        segments = create_memory()
+        self.assertEqual(
+            {"Calibration": zlib.crc32(segments[0][1])},
+            segment_checksums(module, segments, "CRC_32", ["CALIBRATION_VARIABLES"]),
+        )
+        self.assertIsNone(segment_checksums(module, segments, "ADD_44")["Code"])
+
+        CalibrationWriter(module).write(segments, {"Gain": 100})
+        location = find_checksum_location(module, 0x1104, "CRC_32")
+        self.assertEqual(ChecksumLocation(0x1104, "CRC_32", 0x1000, 0x108), location)
+        checksums = patch_checksums(segments, [location])
+        data = segments[0][1]
+        self.assertEqual(zlib.crc32(data[:0x104]), checksums[0x1104])
+        self.assertEqual(checksums[0x1104], int.from_bytes(data[0x104:], "little"))
+        with self.assertRaises(ValueError):
+            find_checksum_location(module, 0x2000, "CRC_32")
+
+
+class TestReadPlan(unittest.TestCase):
+    def test_plan(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        reader = CalibrationReader(module)
+        plan = create_read_plan(reader)
+        self.assertEqual(
+            [(0x0, 1), (0x1000, 0x48), (0x1100, 7), (0x2000, 5)],
+            [(block.address, block.size) for block in plan.blocks],
+        )
+        self.assertEqual(len(module.get_addressable_objects()), plan.element_count)
+
+        blocks = create_read_plan(reader, max_gap=0).blocks
+        self.assertEqual([0x1000, 0x1010, 0x1020], [b.address for b in blocks[1:4]])
+        blocks = create_read_plan(reader, max_block_size=0x20).blocks
+        self.assertEqual([0x1000, 0x1020, 0x1030], [b.address for b in blocks[1:4]])
+
+    def test_read(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        reader = CalibrationReader(module)
+        image = MemoryImage(create_memory())
+        plan = create_read_plan(reader)
+        values = list(reader.read(plan.read(image.read)))
+        self.assertEqual(
+            [v.name for v in reader.read(image.segments)], [v.name for v in values]
+        )
+        self.assertEqual(["DoubleGain", "State"], reader.missing)
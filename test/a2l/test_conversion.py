@@ -0,0 +1,266 @@
+from pathlib import Path
+import unittest
+
+import numpy as np
+
+from pya2ltools.a2l.reader.reader import read_a2l, read_elements
+from pya2ltools.a2l.conversion.compu import (
+    characteristic_to_raw,
+    to_physical,
+    to_raw,
+)
+from pya2ltools.a2l.conversion.dependent import DependentEvaluator
+from pya2ltools.a2l.conversion.lookup import LookupTable, create_lookup_table
+from pya2ltools.a2l.conversion.formula import compile_formula, evaluate_formula
+from pya2ltools.a2l.model.model import A2LCompuMethodVerbalTable, A2LCompuVTabRange
+
+A2L_PATH = Path("test") / "ECU_Description" / "ASAP2_Operations.a2l"
+
+
+class TestToPhysical(unittest.TestCase):
+    def setUp(self):
+        self.module = read_a2l(A2L_PATH).project.modules[0]
+
+    def convert(self, name: str, raw: list) -> np.ndarray:
+        return to_physical(self.module.get_element(name), np.array(raw))
+
+    def test_identical(self):
+        np.testing.assert_array_equal([1.0, 2.0], to_physical(None, [1, 2]))
+
+    def test_linear(self):
+        np.testing.assert_array_equal(
+            [-10, 0, 500], self.convert("CM.LINEAR", [0, 5, 255])
+        )
+
+    def test_rational(self):
+        # raw = (4 * phys + 8) / 2
+        np.testing.assert_array_equal(
+            [-2, 0, 3998], self.convert("CM.RAT_FUNC", [0, 4, 8000])
+        )
+
+    def test_rational_quadratic(self):
+        # raw = phys^2 has the solutions -sqrt(raw) and sqrt(raw)
+        (compu_method,) = read_elements("""/begin COMPU_METHOD CM.SQUARE ""
+                RAT_FUNC "%6.2" "" COEFFS 1 0 0 0 0 1
+            /end COMPU_METHOD""")
+        np.testing.assert_array_equal(
+            [0, 2, np.nan], to_physical(compu_method, [0, 4, -1])
+        )
+        np.testing.assert_array_equal(
+            [-3, -2, np.nan], to_physical(compu_method, [9, 4, 100], (-5, 0))
+        )
+        np.testing.assert_array_equal(
+            [4, 4], to_raw(compu_method, to_physical(compu_method, [4, 4]))
+        )
+
+    def test_table_interpolation(self):
+        np.testing.assert_array_equal(
+            [0, 50, 250, 400, 400], self.convert("CM.TAB_INTP", [-5, 5, 15, 20, 30])
+        )
+
+    def test_verbal_table(self):
+        np.testing.assert_array_equal(
+            ["OFF", "ERROR", "INVALID"], self.convert("CM.VTAB", [0, 2, 7])
+        )
+
+    def test_verbal_table_range(self):
+        tab = A2LCompuVTabRange(
+            "CVR", "", values={(0, 9): "LOW", (10, 19): "HIGH"}, default_value="?"
+        )
+        compu_method = A2LCompuMethodVerbalTable("CM", "", "", "", compu_tab_ref=tab)
+        np.testing.assert_array_equal(
+            ["?", "LOW", "LOW", "HIGH", "?"],
+            to_physical(compu_method, [-1, 0, 9, 19, 20]),
+        )
+
+    def test_formula(self):
+        np.testing.assert_array_equal(
+            [-40, 0, 87.5], self.convert("CM.FORMULA", [0, 80, 255])
+        )
+
+
+class TestToRaw(unittest.TestCase):
+    def setUp(self):
+        self.module = read_a2l(A2L_PATH).project.modules[0]
+
+    def test_round_trip(self):
+        raw = np.array([0, 1, 5, 10, 20])
+        for name in [
+            "CM.LINEAR",
+            "CM.RAT_FUNC",
+            "CM.FORMULA",
+            "CM.TAB_INTP",
+            "CM.VTAB",
+        ]:
+            compu_method = self.module.get_element(name)
+            physical = to_physical(compu_method, raw)
+            np.testing.assert_array_almost_equal(
+                [0, 1, np.nan, np.nan, np.nan] if name == "CM.VTAB" else raw,
+                to_raw(compu_method, physical),
+            )
+
+    def test_formula_without_inverse(self):
+        (compu_method,) = read_elements("""/begin COMPU_METHOD CM.SQUARE ""
+                FORM "%6.2" ""
+                /begin FORMULA "X1 * X1 / 100" /end FORMULA
+            /end COMPU_METHOD""")
+        # nearest raw value of the monotonous formula in the range of UBYTE
+        np.testing.assert_array_equal(
+            [0, 10, 31, 255, np.nan],
+            to_raw(compu_method, [0, 1, 9.7, 650.25, 700], raw_range=(0, 255)),
+        )
+        with self.assertRaises(NotImplementedError):
+            to_raw(compu_method, [1])
+
+    def test_clip_to_limits(self):
+        np.testing.assert_array_equal(
+            [0, 5, 255],
+            characteristic_to_raw(self.module.get_element("Gain"), [-20, 0, 600]),
+        )
+        factor = self.module.get_element("Factor")
+        np.testing.assert_array_equal(
+            [-100, 100], characteristic_to_raw(factor, [-500, 500])
+        )
+        np.testing.assert_array_equal(
+            [-500, 1000], characteristic_to_raw(factor, [-500, 5000], extended=True)
+        )
+
+
+class TestFormula(unittest.TestCase):
+    def test_operators(self):
+        x = np.array([1.0, 2.0, 4.0])
+        cases = {
+            "X1 + 2 * X - 1": [2, 5, 11],
+            "-X1 ^ 2": [-3, -4, -2],
+            "pow(X1, 2) / 2": [0.5, 2, 8],
+            "X1 % 3 + (X1 > 1 && X1 < 4)": [1, 3, 1],
+            "!(X1 == 2) | 0x10": [17, 16, 17],
+            "X1 << 2 >> 1": [2, 4, 8],
+            "sqrt(X) + log10(100) + abs(-1.5e0)": [4.5, 3.5 + 2**0.5, 5.5],
+        }
+        for formula, expected in cases.items():
+            np.testing.assert_array_almost_equal(
+                expected, evaluate_formula(formula, x), err_msg=formula
+            )
+
+    def test_variables(self):
+        self.assertEqual(2, compile_formula("X2 - X1").arity)
+        np.testing.assert_array_equal(
+            [1, 2], evaluate_formula("X2 - X1", [1, 2], [2, 4])
+        )
+        with self.assertRaises(ValueError):
+            evaluate_formula("X2 - X1", [1, 2])
+
+    def test_invalid(self):
+        for formula in [
+            "__import__('os')",
+            "X1.real",
+            "open(X1)",
+            "X1 +",
+            "(X1",
+            "X0",
+            "X1 X1",
+            "X1; 1",
+        ]:
+            with self.assertRaises(ValueError, msg=formula):
+                compile_formula(formula)
+
+    def test_cache(self):
+        self.assertIs(compile_formula("X1 * 3"), compile_formula("X1 * 3"))
+
+
+def dependent_characteristic(name: str, kind: str, formula: str, variables: str):
+    return f"""/begin CHARACTERISTIC {name} "" VALUE 0 RL.VALUE_UBYTE 0 CM.LINEAR 0 1
+        /begin {kind}_CHARACTERISTIC "{formula}" {variables} /end {kind}_CHARACTERISTIC
+    /end CHARACTERISTIC
+    """
+
+
+class TestDependentEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.module = read_a2l(A2L_PATH).project.modules[0]
+        self.add(
+            dependent_characteristic("Sum", "VIRTUAL", "X1 + X2", "DoubleGain Offset")
+            + dependent_characteristic("Total", "DEPENDENT", "X1 * X2", "Sum Factor")
+        )
+
+    def add(self, text: str):
+        elements = read_elements(text)
+        self.module.add_elements(elements)
+        for element in elements:
+            element.resolve_references(self.module.get_reference_dict())
+
+    def test_evaluate(self):
+        evaluator = DependentEvaluator(self.module)
+        self.assertEqual(["DoubleGain", "Sum", "Total"], evaluator.order)
+
+        values = evaluator.evaluate(
+            {"Gain": np.array([1.0, 2.0]), "Offset": np.array(3.0), "Factor": 10.0}
+        )
+        np.testing.assert_array_equal([2, 4], values["DoubleGain"])
+        np.testing.assert_array_equal([5, 7], values["Sum"])
+        np.testing.assert_array_equal([50, 70], values["Total"])
+
+        total = values["Total"]
+        values["Factor"] = 2.0
+        self.assertEqual(["Total"], evaluator.update(values, ["Factor"]))
+        np.testing.assert_array_equal([10, 14], values["Total"])
+        self.assertIsNot(total, values["Total"])
+        self.assertEqual(
+            ["DoubleGain", "Sum", "Total"], evaluator.update(values, ["Gain"])
+        )
+
+    def test_missing_value(self):
+        with self.assertRaises(ValueError):
+            DependentEvaluator(self.module).evaluate({"Gain": 1.0})
+
+    def test_cycle(self):
+        self.add(
+            dependent_characteristic("A", "DEPENDENT", "X1", "B")
+            + dependent_characteristic("B", "DEPENDENT", "X1", "A")
+        )
+        with self.assertRaisesRegex(ValueError, "A, B"):
+            DependentEvaluator(self.module)
+
+
+class TestLookupTable(unittest.TestCase):
+    def setUp(self):
+        self.module = read_a2l(A2L_PATH).project.modules[0]
+
+    def test_curve(self):
+        curve = create_lookup_table(
+            self.module.get_element("SpeedCurve"),
+            [10, 20, 0],
+            std_axes=[np.array([0, 50, 100])],
+        )
+        np.testing.assert_array_equal(
+            [10, 10, 15, 20, 10, 0, 0], curve([-10, 0, 25, 50, 75, 100, 200])
+        )
+
+    def test_map(self):
+        axis_pts = {
+            "SpeedAxis": np.array([0.0, 10, 20, 30]),
+            "EngineSpeedAxis": np.array([3000.0, 2000, 1000]),
+        }
+        values = np.arange(12, dtype=np.float64).reshape(4, 3)
+        table = create_lookup_table(
+            self.module.get_element("TorqueMap"), values, axis_pts=axis_pts
+        )
+        self.assertTrue(np.shares_memory(axis_pts["SpeedAxis"], table.axes[0]))
+        self.assertTrue(np.shares_memory(values, table.values))
+        np.testing.assert_array_equal([1000, 2000, 3000], table.axes[1])
+
+        np.testing.assert_array_almost_equal(
+            [2, 0, 11, 5.5, 8.75],
+            table([0, 0, 40, 15, 25], [1000, 5000, 0, 2000, 1750]),
+        )
+        self.assertEqual((2, 2), table(np.zeros((2, 2)), 1000).shape)
+
+    def test_curve_axis(self):
+        rescale = LookupTable([np.array([0.0, 100])], np.array([0.0, 2]))
+        table = LookupTable([np.arange(3.0)], np.array([0.0, 10, 40]), [rescale])
+        np.testing.assert_array_equal([0, 5, 10, 25, 40], table([0, 25, 50, 75, 100]))
+
+    def test_invalid_shape(self):
+        with self.assertRaises(ValueError):
+            LookupTable([np.arange(3.0)], np.zeros(4))
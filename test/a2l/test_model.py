@@ -0,0 +1,139 @@
+from pathlib import Path
+import unittest
+
+from pya2ltools.a2l.reader.reader import read_a2l, read_elements
+from pya2ltools.a2l.model.reference_index import ReferenceIndex
+from pya2ltools.a2l.model.hierarchy import HierarchyIndex
+from pya2ltools.a2l.model.project_model import A2LGroup
+
+A2L_PATH = Path("test") / "ECU_Description" / "ASAP2_Operations.a2l"
+
+
+class TestReferenceIndex(unittest.TestCase):
+    def setUp(self):
+        self.module = read_a2l(A2L_PATH).project.modules[0]
+        self.index = ReferenceIndex(self.module)
+
+    def referrer_names(self, name: str) -> list[str]:
+        element = self.module.get_element(name)
+        return sorted(r.name for r in self.index.get_referrers(element))
+
+    def test_referrers(self):
+        self.assertEqual(
+            ["EngineSpeed", "EngineSpeedAxis", "TorqueMap"],
+            self.referrer_names("CM.RAT_FUNC"),
+        )
+        self.assertEqual(
+            ["Cruise", "SpeedAxis", "SpeedCurve", "TorqueMap"],
+            self.referrer_names("Speed"),
+        )
+        self.assertEqual(
+            ["Chassis", "Cruise", "DoubleGain"], self.referrer_names("Gain")
+        )
+        self.assertEqual([], self.referrer_names("CM.UNUSED"))
+
+    def test_rename(self):
+        linear = self.module.get_element("CM.LINEAR")
+        self.index.rename(linear, "CM.SPEED")
+        self.assertIs(linear, self.module.get_element("CM.SPEED"))
+        self.assertNotIn("CM.LINEAR", self.module.get_reference_dict())
+        self.assertEqual(
+            "CM.SPEED", self.module.get_element("Gain").typedef.compu_method.name
+        )
+        with self.assertRaises(ValueError):
+            self.index.rename(linear, "CM.RAT_FUNC")
+
+    def test_delete(self):
+        with self.assertRaises(ValueError):
+            self.index.delete(self.module.get_element("CM.LINEAR"))
+
+        self.index.delete(self.module.get_element("Chassis"))
+        self.index.delete(self.module.get_element("DoubleGain"))
+        self.index.delete(self.module.get_element("Cruise"))
+        self.assertFalse(self.index.is_referenced(self.module.get_element("Gain")))
+        self.index.delete(self.module.get_element("Gain"))
+        self.assertNotIn("Gain", [c.name for c in self.module.characteristics])
+
+    def test_virtual(self):
+        (virtual,) = read_elements("""/begin MEASUREMENT Distance "virtual"
+                UBYTE CM.LINEAR 0 0 -10 500
+                /begin VIRTUAL Speed /end VIRTUAL
+            /end MEASUREMENT""")
+        virtual.resolve_references(self.module.get_reference_dict())
+        self.index.add(virtual)
+        speed = self.module.get_element("Speed")
+        self.assertIn("Distance", self.referrer_names("Speed"))
+        with self.assertRaises(ValueError):
+            self.index.delete(speed)
+
+        self.index.rename(speed, "VehicleSpeed")
+        self.assertEqual(["VehicleSpeed"], virtual.virtual.variables)
+
+
+class TestHierarchyIndex(unittest.TestCase):
+    def setUp(self):
+        self.module = read_a2l(A2L_PATH).project.modules[0]
+        self.index = HierarchyIndex(self.module)
+
+    def names(self, elements: list) -> list[str]:
+        return sorted(e.name for e in elements)
+
+    def test_members(self):
+        chassis = self.module.get_element("Chassis")
+        self.assertEqual(
+            ["Brakes", "DoubleGain", "Gain", "Mode", "Offset", "State"],
+            self.names(self.index.get_members(chassis)),
+        )
+        powertrain = self.module.get_element("Powertrain")
+        self.assertEqual(
+            ["Temperature", "Torque", "TorqueMap"],
+            self.names(self.index.get_characteristics(powertrain)),
+        )
+        self.assertIn("Thermal", self.names(self.index.get_members(powertrain)))
+        self.assertTrue(
+            self.index.contains(powertrain, self.module.get_element("Temperature"))
+        )
+        self.assertFalse(
+            self.index.contains(chassis, self.module.get_element("Temperature"))
+        )
+
+    def test_parents(self):
+        temperature = self.module.get_element("Temperature")
+        self.assertEqual(
+            ["Powertrain", "Thermal"], self.names(self.index.get_parents(temperature))
+        )
+        self.assertEqual(
+            ["Engine", "Powertrain", "Thermal"],
+            self.names(self.index.get_ancestors(temperature)),
+        )
+
+    def test_cycle(self):
+        a, b, c = A2LGroup("A"), A2LGroup("B"), A2LGroup("C")
+        for group, child, name in [(a, b, "Gain"), (b, c, "Offset"), (c, a, "Mode")]:
+            group.sub_groups.append(child)
+            group.characteristics.append(self.module.get_element(name))
+        self.module.groups += [a, b, c]
+        index = HierarchyIndex(self.module)
+        # C is closed first while A and B are still being visited
+        for group in [a, c, b]:
+            self.assertEqual(
+                ["A", "B", "C", "Gain", "Mode", "Offset"],
+                self.names(index.get_members(group)),
+                msg=group.name,
+            )
+
+    def test_update(self):
+        chassis = self.module.get_element("Chassis")
+        brakes = self.module.get_element("Brakes")
+        factor = self.module.get_element("Factor")
+        self.assertFalse(self.index.contains(chassis, factor))
+
+        brakes.characteristics.append(factor)
+        self.index.update(brakes)
+        self.assertTrue(self.index.contains(chassis, factor))
+        self.assertEqual(["Brakes"], self.names(self.index.get_parents(factor)))
+
+        chassis.sub_groups.remove(brakes)
+        self.index.update(chassis)
+        self.assertFalse(self.index.contains(chassis, factor))
+        self.assertEqual([], self.index.get_parents(brakes))
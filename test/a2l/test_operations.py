@@ -0,0 +1,348 @@
+from pathlib import Path
+import unittest
+
+from pya2ltools.a2l.reader.reader import read_a2l, read_elements
+from pya2ltools.a2l.writer.writer import write_a2l_file
+from pya2ltools.a2l.operations.deduplicate import deduplicate
+from pya2ltools.a2l.operations.prune import prune
+from pya2ltools.a2l.operations.extract import extract
+from pya2ltools.a2l.operations.split import UNASSIGNED_SHARD, split
+from pya2ltools.a2l.operations.diff import (
+    FieldChange,
+    diff_modules,
+    module_hashes,
+    read_hashes,
+    write_hashes,
+)
+from pya2ltools.a2l.model.project_model import A2ML
+from pya2ltools.a2l.operations.patch import (
+    apply_patch,
+    create_patch,
+    read_patch,
+    write_patch,
+)
+
+A2L_PATH = Path("test") / "ECU_Description" / "ASAP2_Operations.a2l"
+
+
+class TestDeduplicate(unittest.TestCase):
+    def test_deduplicate(self):
+        a2l_file = read_a2l(A2L_PATH)
+        module = a2l_file.project.modules[0]
+        renamed = deduplicate(module)
+
+        self.assertEqual(
+            {
+                "CT.TAB_COPY": "CT.TAB",
+                "CV.STATE_COPY": "CV.STATE",
+                "RL.VALUE_UBYTE_COPY": "RL.VALUE_UBYTE",
+                "CM.LINEAR_COPY": "CM.LINEAR",
+                "CM.TAB_INTP_COPY": "CM.TAB_INTP",
+            },
+            renamed,
+        )
+        for name in renamed:
+            self.assertNotIn(
+                name, [getattr(e, "name", None) for e in module.global_list]
+            )
+
+        offset = module.get_element("Offset")
+        self.assertIs(module.get_element("CM.LINEAR"), offset.typedef.compu_method)
+        self.assertIs(
+            module.get_element("RL.VALUE_UBYTE"), offset.typedef.record_layout
+        )
+        self.assertIs(
+            module.get_element("CT.TAB"),
+            module.get_element("CM.TAB_INTP").compu_tab_ref,
+        )
+        self.assertIs(
+            module.get_element("CM.LINEAR"),
+            module.get_element("SpeedAxis").compu_method,
+        )
+
+        output = Path("a2l_dedup.a2l")
+        write_a2l_file(a2l_file, output)
+        module = read_a2l(output).project.modules[0]
+        self.assertEqual({}, deduplicate(module))
+        self.assertEqual("CV.STATE", module.get_element("CM.VTAB").compu_tab_ref.name)
+
+    def test_deduplicate_keeps_different_elements(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        deduplicate(module)
+        self.assertEqual(
+            ["CM.LINEAR", "CM.RAT_FUNC", "CM.FORMULA", "CM.TAB_INTP", "CM.VTAB"],
+            [c.name for c in module.compu_methods][:5],
+        )
+
+    def tearDownClass() -> None:
+        Path("a2l_dedup.a2l").unlink(missing_ok=True)
+
+
+class TestPrune(unittest.TestCase):
+    def test_prune(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        counts = prune(module)
+
+        self.assertEqual(2, counts["compu_methods"])
+        self.assertEqual(2, counts["compu_tabs"])
+        self.assertEqual(1, counts["compu_vtabs"])
+        self.assertEqual(1, counts["record_layouts"])
+        names = [getattr(e, "name", None) for e in module.global_list]
+        for name in ["CM.UNUSED", "CM.TAB_INTP", "CT.TAB", "CT.UNUSED", "RL.UNUSED"]:
+            self.assertNotIn(name, names)
+        for name in ["CM.TAB_INTP_COPY", "CT.TAB_COPY", "CV.STATE_COPY"]:
+            self.assertIn(name, names)
+
+    def test_prune_after_deduplicate(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        deduplicate(module)
+        counts = prune(module)
+        self.assertEqual(1, counts["compu_methods"])
+        self.assertEqual(1, counts["compu_tabs"])
+        self.assertEqual(0, counts["compu_vtabs"])
+        self.assertEqual(0, sum(prune(module).values()))
+
+
+class TestExtract(unittest.TestCase):
+    def test_extract_group(self):
+        a2l_file = read_a2l(A2L_PATH)
+        module = a2l_file.project.modules[0]
+        submodule = extract(module, ["Chassis"])
+
+        names = {getattr(e, "name", None) for e in submodule.global_list}
+        self.assertEqual(
+            {
+                None,
+                "Chassis",
+                "Brakes",
+                "Gain",
+                "Offset",
+                "DoubleGain",
+                "Mode",
+                "State",
+                "CM.LINEAR",
+                "CM.LINEAR_COPY",
+                "CM.VTAB",
+                "CV.STATE_COPY",
+                "RL.VALUE_UBYTE",
+                "RL.VALUE_UBYTE_COPY",
+            },
+            names,
+        )
+        self.assertEqual(len(module.mod_common), len(submodule.mod_common))
+
+        a2l_file.project.modules = [submodule]
+        output = Path("a2l_extract.a2l")
+        write_a2l_file(a2l_file, output)
+        module = read_a2l(output).project.modules[0]
+        self.assertEqual(len(submodule.global_list), len(module.global_list))
+
+    def test_extract_characteristic_with_axes(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        submodule = extract(module, ["TorqueMap"])
+        self.assertEqual(
+            ["EngineSpeed", "Speed"], sorted(m.name for m in submodule.measurements)
+        )
+        self.assertEqual(
+            ["EngineSpeedAxis", "SpeedAxis"], sorted(a.name for a in submodule.axis_pts)
+        )
+        self.assertEqual(["TorqueMap"], [c.name for c in submodule.characteristics])
+
+    def test_extract_virtual(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        (virtual,) = read_elements("""/begin MEASUREMENT Distance "virtual"
+                UBYTE CM.LINEAR 0 0 -10 500
+                /begin VIRTUAL Speed EngineSpeed /end VIRTUAL
+            /end MEASUREMENT""")
+        virtual.resolve_references(module.get_reference_dict())
+        module.add_elements([virtual])
+        submodule = extract(module, ["Distance"])
+        self.assertEqual(
+            ["Distance", "EngineSpeed", "Speed"],
+            sorted(m.name for m in submodule.measurements),
+        )
+        self.assertIn("CM.RAT_FUNC", submodule.get_reference_dict())
+
+    def test_extract_unknown(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        with self.assertRaises(ValueError):
+            extract(module, ["Unknown"])
+
+    def tearDownClass() -> None:
+        Path("a2l_extract.a2l").unlink(missing_ok=True)
+
+
+class TestSplit(unittest.TestCase):
+    def test_split_by_group(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        shards = split(module, "group")
+
+        self.assertEqual(["Chassis", "Powertrain", UNASSIGNED_SHARD], list(shards))
+        unassigned = shards[UNASSIGNED_SHARD]
+        self.assertEqual(
+            ["Factor", "Table", "SpeedCurve", "Gain", "Offset"],
+            [c.name for c in unassigned.characteristics],
+        )
+        # Cruise is in no group, its characteristics are shared with Chassis
+        self.assertEqual(["Cruise"], [f.name for f in unassigned.functions])
+        self.assertIn("Thermal", [f.name for f in shards["Powertrain"].functions])
+        self.assert_complete(module, shards)
+
+    def assert_complete(self, module, shards):
+        for kind in [
+            "characteristics",
+            "measurements",
+            "axis_pts",
+            "groups",
+            "functions",
+        ]:
+            names = {e.name for shard in shards.values() for e in getattr(shard, kind)}
+            self.assertEqual({e.name for e in getattr(module, kind)}, names, msg=kind)
+
+    def test_split_by_function(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        shards = split(module, "function")
+        self.assertEqual(["Cruise", "Engine", UNASSIGNED_SHARD], list(shards))
+        self.assertEqual(
+            ["Engine", "Thermal"], [f.name for f in shards["Engine"].functions]
+        )
+        self.assertEqual(
+            ["Chassis", "Brakes", "Powertrain"],
+            [g.name for g in shards[UNASSIGNED_SHARD].groups],
+        )
+        self.assert_complete(module, shards)
+
+    def test_split_by_prefix(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        shards = split(module, "prefix", separator="Speed")
+        self.assertEqual(
+            ["Speed", "SpeedAxis", "SpeedCurve"],
+            sorted(e.name for e in shards[""].get_addressable_objects()),
+        )
+        # every addressable object has a prefix, groups and functions have none
+        self.assertEqual(
+            ["Cruise", "Engine", "Thermal"],
+            [f.name for f in shards[UNASSIGNED_SHARD].functions],
+        )
+        self.assert_complete(module, shards)
+
+
+class TestDiff(unittest.TestCase):
+    def test_diff(self):
+        old = read_a2l(A2L_PATH).project.modules[0]
+        new = read_a2l(A2L_PATH).project.modules[0]
+        self.assertTrue(diff_modules(old, new).is_empty())
+
+        new.get_element("CM.RAT_FUNC").coeffs[5] = 4
+        new.get_element("Temperature").typedef.compu_method = new.get_element(
+            "CM.LINEAR"
+        )
+        new.remove_elements([new.get_element("Factor")])
+        new.add_elements([old.get_element("CM.UNUSED")])
+        old.remove_elements([old.get_element("CM.UNUSED")])
+
+        diff = diff_modules(old, new)
+        self.assertEqual([("compu_methods", "CM.UNUSED")], diff.added)
+        self.assertEqual([("characteristics", "Factor")], diff.removed)
+        self.assertEqual(
+            {
+                ("compu_methods", "CM.RAT_FUNC"): [FieldChange("coeffs[5]", 2, 4)],
+                ("characteristics", "Temperature"): [
+                    FieldChange(
+                        "typedef.compu_method",
+                        {"ref": "CM.FORMULA"},
+                        {"ref": "CM.LINEAR"},
+                    )
+                ],
+            },
+            diff.changed,
+        )
+
+    def test_unnamed(self):
+        old = read_a2l(A2L_PATH).project.modules[0]
+        new = read_a2l(A2L_PATH).project.modules[0]
+        old.add_elements([A2ML("first"), A2ML("second")])
+        new.add_elements([A2ML("first"), A2ML("changed"), A2ML("third")])
+        new.mod_common[0].description = "changed"
+
+        diff = diff_modules(old, new)
+        self.assertEqual([("a2ml", "#2")], diff.added)
+        self.assertEqual([("a2ml", "#1"), ("mod_common", "#0")], sorted(diff.changed))
+
+    def test_hashes(self):
+        module = read_a2l(A2L_PATH).project.modules[0]
+        hashes = module_hashes(module)
+        output = Path("a2l_hashes.json")
+        write_hashes(hashes, output)
+        self.assertEqual(hashes, read_hashes(output))
+        self.assertTrue(diff_modules(module, module, new_hashes=hashes).is_empty())
+
+    def tearDownClass() -> None:
+        Path("a2l_hashes.json").unlink(missing_ok=True)
+
+
+class TestPatch(unittest.TestCase):
+    def create_new_module(self):
+        new = read_a2l(A2L_PATH).project.modules[0]
+        rational = new.get_element("CM.RAT_FUNC")
+        linear = read_elements(
+            """/begin COMPU_METHOD CM.RAT_FUNC "now linear" LINEAR "%6.2" "rpm"
+                COEFFS_LINEAR 3 0
+            /end COMPU_METHOD"""
+        )[0]
+        new.replace_elements([(rational, linear)])
+        new.get_element("Temperature").typedef.max = 120
+        new.remove_elements([new.get_element("Factor")])
+        new.add_elements(
+            read_elements(
+                """/begin CHARACTERISTIC NewGain "" VALUE 0x1100 RL.VALUE_UBYTE 0
+                    CM.LINEAR -10 500
+                /end CHARACTERISTIC"""
+            )
+        )
+        new.get_element("NewGain").resolve_references(new.get_reference_dict())
+        return new
+
+    def test_patch(self):
+        old = read_a2l(A2L_PATH).project.modules[0]
+        new = self.create_new_module()
+        patch = create_patch(diff_modules(old, new), new)
+        self.assertEqual(
+            ["remove", "add", "replace", "replace"],
+            [operation.op for operation in patch],
+        )
+
+        output = Path("a2l_patch.jsonl")
+        write_patch(patch, output)
+        temperature = old.get_element("Temperature")
+        apply_patch(old, read_patch(output))
+
+        self.assertTrue(diff_modules(old, new).is_empty())
+        self.assertIs(temperature, old.get_element("Temperature"))
+        self.assertIs(
+            old.get_element("CM.LINEAR"),
+            old.get_element("NewGain").typedef.compu_method,
+        )
+        linear = old.get_element("CM.RAT_FUNC")
+        self.assertEqual([3, 0], linear.coeffs)
+        self.assertIs(linear, old.get_element("EngineSpeedAxis").compu_method)
+        axis = old.get_element("TorqueMap").typedef.axis_descriptions[1]
+        self.assertIs(linear, axis.compu_method)
+
+    def test_patch_unnamed(self):
+        old = read_a2l(A2L_PATH).project.modules[0]
+        new = read_a2l(A2L_PATH).project.modules[0]
+        new.mod_common[0].description = "changed"
+        patch = create_patch(diff_modules(old, new), new)
+        self.assertEqual(
+            [("replace", "mod_common", "#0")],
+            [(operation.op, operation.kind, operation.name) for operation in patch],
+        )
+        mod_common = old.mod_common[0]
+        apply_patch(old, patch)
+        self.assertIs(mod_common, old.mod_common[0])
+        self.assertEqual("changed", mod_common.description)
+        self.assertTrue(diff_modules(old, new).is_empty())
+
+    def tearDownClass() -> None:
+        Path("a2l_patch.jsonl").unlink(missing_ok=True)
@@ -0,0 +1,200 @@
+from pathlib import Path
+import struct
+import unittest
+
+from intelhex import IntelHex
+
+from pya2ltools.image.image import MemoryImage, merge_segments
+from pya2ltools.image.binary import read_binary
+from pya2ltools.image.elf import read_elf
+from pya2ltools.image.intel_hex import parse_intel_hex, read_intel_hex
+from pya2ltools.image.reader import (
+    BINARY,
+    ELF,
+    INTEL_HEX,
+    SRECORD,
+    detect_format,
+    read_image,
+)
+from pya2ltools.image.srecord import parse_srecord
+from pya2ltools.image.writer import write_image
+
+
+class TestMemoryImage(unittest.TestCase):
+    def test_read(self):
+        image = MemoryImage([(0x2000, bytearray(b"\x05\x06")), (0x1000, b"abcd")])
+        self.assertEqual(0x1000, image.segments[0][0])
+        self.assertEqual(b"bc", image.read(0x1001, 2))
+        self.assertIsInstance(image.read(0x2000, 1), memoryview)
+        self.assertTrue(image.contains(0x2000, 2))
+        self.assertFalse(image.contains(0x1003, 2))
+        with self.assertRaises(ValueError):
+            image.read(0x0FFF, 1)
+
+    def test_merge_segments(self):
+        segments = merge_segments(
+            [
+                (0x10, bytearray(b"cd")),
+                (0x0, bytearray(b"ab")),
+                (0x2, bytearray(b"xyz")),
+                (0x12, bytearray(b"e")),
+            ]
+        )
+        self.assertEqual([(0x0, b"abxyz"), (0x10, b"cde")], segments)
+
+
+class TestIntelHex(unittest.TestCase):
+    def test_read_intel_hex(self):
+        ih = IntelHex()
+        ih.puts(0x1000, bytes(range(256)) * 4)
+        ih.puts(0x8001_0000 - 8, bytes(range(16)))
+        ih.puts(0x2000, b"\x01\x02")
+        output = Path("image.hex")
+        ih.write_hex_file(str(output))
+
+        image = read_intel_hex(output)
+        self.assertEqual(
+            [(0x1000, 1024), (0x2000, 2), (0x8001_0000 - 8, 16)],
+            [(start, len(data)) for start, data in image.segments],
+        )
+        for start, end in ih.segments():
+            self.assertEqual(
+                ih.tobinstr(start=start, size=end - start),
+                image.read(start, end - start),
+            )
+
+    def test_empty(self):
+        self.assertEqual([], parse_intel_hex(":00000001FF\n"))
+        self.assertEqual([], parse_intel_hex(""))
+
+    def test_invalid(self):
+        for line in [":0100000001FF", "0100000001FE", ":0200000001FE"]:
+            with self.assertRaises(ValueError, msg=line):
+                parse_intel_hex(line)
+
+    def tearDownClass() -> None:
+        Path("image.hex").unlink(missing_ok=True)
+
+
+def srecord(record_type: int, address: int, data: bytes) -> str:
+    address_length = {0: 2, 1: 2, 2: 3, 3: 4, 5: 2, 7: 4, 8: 3, 9: 2}[record_type]
+    record = bytes([address_length + len(data) + 1])
+    record += address.to_bytes(address_length, "big") + data
+    return f"S{record_type}{record.hex().upper()}{0xFF - sum(record) & 0xFF:02X}\n"
+
+
+class TestSRecord(unittest.TestCase):
+    def test_parse_srecord(self):
+        text = (
+            srecord(0, 0, b"header")
+            + srecord(1, 0x1000, b"abcd")
+            + srecord(1, 0x1004, b"ef")
+            + srecord(2, 0x12_0000, b"\x01\x02")
+            + srecord(3, 0x8000_0000, b"\xff")
+            + srecord(5, 4, b"")
+            + srecord(9, 0, b"")
+        )
+        self.assertEqual(
+            [(0x1000, b"abcdef"), (0x12_0000, b"\x01\x02"), (0x8000_0000, b"\xff")],
+            parse_srecord(text),
+        )
+
+    def test_invalid(self):
+        valid = srecord(1, 0x1000, b"ab")
+        for text in [valid[:-3] + "00", valid.replace("S1", "S4"), "S1", "X" + valid]:
+            with self.assertRaises(ValueError, msg=text):
+                parse_srecord(text)
+
+
+def elf_file(data: bytes, address: int, load_address: int, memory_size: int) -> bytes:
+    """An ARM executable with a single loadable segment."""
+    header = b"\x7fELF\x01\x01\x01" + bytes(9)
+    header += struct.pack("<HHIIIIIHHHHHH", 2, 40, 1, 0, 52, 0, 0, 52, 32, 1, 40, 0, 0)
+    program_header = struct.pack(
+        "<IIIIIIII", 1, 84, address, load_address, len(data), memory_size, 6, 4
+    )
+    return header + program_header + data
+
+
+class TestElf(unittest.TestCase):
+    def test_read_elf(self):
+        output = Path("image.elf")
+        output.write_bytes(elf_file(b"\x01\x02\x03\x04", 0x2000_0000, 0x8000, 8))
+        image = read_elf(output)
+        self.assertEqual(b"\x02\x03", image.read(0x2000_0001, 2))
+        self.assertEqual(b"\x00" * 4, image.read(0x2000_0004, 4))
+        # the zero filled memory continues the file content
+        self.assertEqual(1, len(image.segments))
+        self.assertEqual(b"\x03\x04\x00\x00", image.read(0x2000_0002, 4))
+        self.assertFalse(image.contains(0x2000_0008))
+        self.assertEqual(b"\x01", read_elf(output, physical=True).read(0x8000, 1))
+
+        self.assertEqual(ELF, detect_format(output))
+        output.rename("image.dat")
+        self.assertEqual(ELF, detect_format(Path("image.dat")))
+        self.assertEqual(b"\x04", read_image(Path("image.dat")).read(0x2000_0003, 1))
+
+    def tearDownClass() -> None:
+        for name in ["image.elf", "image.dat"]:
+            Path(name).unlink(missing_ok=True)
+
+
+class TestReadImage(unittest.TestCase):
+    def test_binary(self):
+        output = Path("image.bin")
+        output.write_bytes(bytes(range(16)))
+        image = read_binary(output, 0x8000)
+        self.assertEqual(b"\x04\x05", image.read(0x8004, 2))
+        self.assertFalse(image.contains(0x8010))
+        Path("image.empty").write_bytes(b"")
+        self.assertEqual(0, read_binary(Path("image.empty")).size)
+
+    def test_detect_format(self):
+        Path("image.dat").write_text(srecord(1, 0x10, b"ab"))
+        self.assertEqual(SRECORD, detect_format(Path("image.dat")))
+        self.assertEqual(b"ab", read_image(Path("image.dat")).read(0x10, 2))
+        Path("image.dat").write_text(":00000001FF\n")
+        self.assertEqual(INTEL_HEX, detect_format(Path("image.dat")))
+        Path("image.dat").write_bytes(b"\x00")
+        self.assertEqual(BINARY, detect_format(Path("image.dat")))
+        self.assertEqual(SRECORD, detect_format(Path("image.s37")))
+
+    def tearDownClass() -> None:
+        for name in ["image.bin", "image.dat", "image.empty"]:
+            Path(name).unlink(missing_ok=True)
+
+
+class TestWriteImage(unittest.TestCase):
+    def setUp(self):
+        self.image = MemoryImage(
+            [(0xFFF0, bytearray(range(100))), (0x2_0000, bytearray(b"\x01\x02"))]
+        )
+
+    def test_intel_hex(self):
+        write_image(self.image, Path("written.hex"))
+        ih = IntelHex(str(Path("written.hex")))
+        self.assertEqual(bytes(range(100)), ih.tobinstr(start=0xFFF0, size=100))
+        image = read_image(Path("written.hex"))
+        self.assertEqual(
+            [(0xFFF0, bytes(range(100))), (0x2_0000, b"\x01\x02")],
+            [(start, bytes(data)) for start, data in image.segments],
+        )
+
+    def test_srecord(self):
+        for suffix in [".s28", ".s37"]:
+            write_image(self.image, Path("written" + suffix))
+            image = read_image(Path("written" + suffix))
+            self.assertEqual(
+                [(0xFFF0, bytes(range(100))), (0x2_0000, b"\x01\x02")],
+                [(start, bytes(data)) for start, data in image.segments],
+            )
+        with self.assertRaises(ValueError):
+            write_image(self.image, Path("written.s19"))
+
+    def test_binary(self):
+        write_image(MemoryImage([(0, b"ab"), (4, b"c")]), Path("written.bin"))
+        self.assertEqual(b"ab\xff\xffc", Path("written.bin").read_bytes())
+
+    def tearDownClass() -> None:
+        for suffix in [".hex", ".s19", ".s28", ".s37", ".bin"]:
+            Path("written" + suffix).unlink(missing_ok=True)